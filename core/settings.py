@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.1/ref/settings/
 """
 import os
+import sys
+from importlib.util import find_spec
 from pathlib import Path
 
 import dj_database_url
@@ -27,6 +29,8 @@ SECRET_KEY = os.environ.get("DJANGO_SECRET_KEY", "django-insecure-tzr8rmhc9d9y!1
 # SECURITY WARNING: don't run with debug turned on in production!
 DEBUG = os.environ.get("DJANGO_DEBUG", "") != "False"
 
+TESTING = sys.argv[1:2] == ["test"]
+
 ALLOWED_HOSTS = [
     "127.0.0.1",
     "task-forge.onrender.com",
@@ -46,24 +50,53 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
-    "debug_toolbar",
     "crispy_forms",
     "crispy_bootstrap4",
     "forge",
 ]
 
 MIDDLEWARE = [
+    "forge.middleware.QueryInstrumentationMiddleware",
+    "forge.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "forge.middleware.RoleMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The toolbar only helps under runserver, keep it out of production requests
+if DEBUG and find_spec("debug_toolbar") is not None:
+    INSTALLED_APPS.append("debug_toolbar")
+    MIDDLEWARE.insert(3, "debug_toolbar.middleware.DebugToolbarMiddleware")
+
+# Views over their declared query budget raise instead of logging a warning
+QUERY_BUDGET_RAISE = TESTING or os.environ.get("QUERY_BUDGET_RAISE", "") == "True"
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        "forge.queries": {
+            "handlers": ["console"],
+            "level": os.environ.get(
+                "QUERY_LOG_LEVEL", "WARNING" if TESTING else "INFO"
+            ),
+        },
+        "forge.jobs": {
+            "handlers": ["console"],
+            "level": "CRITICAL" if TESTING else "INFO",
+        },
+    },
+}
+
 ROOT_URLCONF = "core.urls"
 
 TEMPLATES = [
@@ -77,6 +110,8 @@ TEMPLATES = [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
+                "forge.context_processors.role",
+                "forge.context_processors.fragment_cache",
             ],
             "libraries": {
                 "custom_tags": "forge.templatetags.custom_filters"
@@ -85,6 +120,20 @@ TEMPLATES = [
     },
 ]
 
+# Parse every template once per process in production. Django 4.1 caches in
+# DEBUG as well, but reloads changed files there, so the default stays.
+if not DEBUG:
+    TEMPLATES[0]["APP_DIRS"] = False
+    TEMPLATES[0]["OPTIONS"]["loaders"] = [
+        (
+            "django.template.loaders.cached.Loader",
+            [
+                "django.template.loaders.filesystem.Loader",
+                "django.template.loaders.app_directories.Loader",
+            ],
+        ),
+    ]
+
 CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap4"
 
 CRISPY_TEMPLATE_PACK = "bootstrap4"
@@ -102,8 +151,93 @@ DATABASES = {
     }
 }
 
-db_from_env = dj_database_url.config(conn_max_age=500)
+# Seconds a connection is reused, 0 closes it after every request. Under ASGI
+# each request runs in its own thread, gunicorn.conf.py defaults it to 0 there.
+DB_CONN_MAX_AGE = int(os.environ.get("DB_CONN_MAX_AGE", 500))
+
+db_from_env = dj_database_url.config(
+    conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True
+)
 DATABASES["default"].update(db_from_env)
+# Persistent connections are pinged before reuse, so a failover doesn't
+# surface as errors on the first request of every worker
+DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+if DATABASES["default"]["ENGINE"] == "django.db.backends.postgresql":
+    db_options = DATABASES["default"].setdefault("OPTIONS", {})
+    db_options.setdefault(
+        "connect_timeout", int(os.environ.get("DB_CONNECT_TIMEOUT", 5))
+    )
+    # TCP keepalives notice a dead server instead of hanging on it
+    db_options.setdefault("keepalives", 1)
+    db_options.setdefault("keepalives_idle", 30)
+    # Milliseconds before PostgreSQL cancels a statement, gunicorn.conf.py sets
+    # it for web workers while management commands run without a limit. It is
+    # a connection setting: every statement on a persistent connection gets it,
+    # not just one request. Added to any options from DATABASE_URL.
+    statement_timeout = int(os.environ.get("DB_STATEMENT_TIMEOUT", 0))
+    if statement_timeout:
+        db_options["options"] = (
+            f"{db_options.get('options', '')} -c statement_timeout={statement_timeout}"
+        ).strip()
+    # PgBouncer in transaction mode pools the connections instead of Django,
+    # server-side cursors don't survive its transaction switching
+    if os.environ.get("DB_PGBOUNCER", "") == "True":
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
+
+# Read replicas, comma separated database URLs. Views marked read_from_replica
+# (the list pages and the dashboard) read from them, everything else and the
+# reads of a user who wrote in the last REPLICA_STICKY_SECONDS use the primary.
+DATABASE_REPLICAS = []
+for number, url in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_URLS", "").split(",")), start=1
+):
+    alias = f"replica_{number}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        **dj_database_url.parse(
+            url.strip(), conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=True
+        ),
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["forge.routers.ReplicaRouter"]
+REPLICA_STICKY_SECONDS = int(os.environ.get("REPLICA_STICKY_SECONDS", 10))
+
+# Cache
+# https://docs.djangoproject.com/en/4.1/topics/cache/
+
+# Without Redis every process has its own cache, which bump() in one worker
+# cannot invalidate for the others.
+SHARED_CACHE = bool(os.environ.get("REDIS_URL"))
+
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+            "KEY_PREFIX": "forge",
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "OPTIONS": {"MAX_ENTRIES": 10000},
+        }
+    }
+
+# Seconds a cached detail page object or fragment lives. Page and fragment caching
+# is off (0) unless the cache is shared: cached entries are keyed on versions that
+# writes bump, so they are never served stale as long as all workers see the bumps.
+DETAIL_CACHE_TIMEOUT = int(
+    os.environ.get("DETAIL_CACHE_TIMEOUT", 300 if SHARED_CACHE else 0)
+)
+# Seconds a sidebar, search form or list table fragment lives
+FRAGMENT_CACHE_TIMEOUT = int(
+    os.environ.get("FRAGMENT_CACHE_TIMEOUT", 600 if SHARED_CACHE else 0)
+)
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators
@@ -126,6 +260,14 @@ AUTH_PASSWORD_VALIDATORS = [
 
 AUTH_USER_MODEL = "forge.Worker"
 
+AUTHENTICATION_BACKENDS = ["forge.roles.RoleModelBackend"]
+
+# Seconds a resolved role stays cached; 0 resolves it on every request. Off unless
+# the cache is shared, or a demoted user would keep their role in other workers.
+ROLE_CACHE_TIMEOUT = int(
+    os.environ.get("ROLE_CACHE_TIMEOUT", 300 if SHARED_CACHE else 0)
+)
+
 LOGOUT_REDIRECT_URL = "forge:welcome"
 LOGIN_REDIRECT_URL = "forge:task-list"
 LOGIN_URL = "forge:welcome"
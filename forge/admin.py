@@ -1,7 +1,19 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
 
-from forge.models import Worker, Position, TaskType, Project
+from forge import bulk
+from forge.models import (
+    Worker,
+    Position,
+    TaskType,
+    Project,
+    Task,
+    Job,
+    Notification,
+    LeaderboardEntry,
+    AssignmentEvent,
+    ProjectSnapshot,
+)
 
 
 # Register your models here.
@@ -61,7 +73,15 @@ class WorkerAdmin(UserAdmin):
 
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
-    list_display = ("name", "manager", "is_completed", "start_date", "deadline")
+    list_display = (
+        "name",
+        "manager",
+        "is_completed",
+        "tasks_done",
+        "tasks_total",
+        "start_date",
+        "deadline",
+    )
     list_filter = ("manager", "is_completed")
     search_fields = ("name", "description")
     date_hierarchy = "start_date"
@@ -69,6 +89,42 @@ class ProjectAdmin(admin.ModelAdmin):
         ("General info", {"fields": ("name", "description", "manager")}),
         ("Dates", {"fields": ("start_date", "deadline", "is_completed")}),
     )
+    actions = ("complete_with_tasks",)
+
+    @admin.action(description="Mark completed together with their tasks")
+    def complete_with_tasks(self, request, queryset) -> None:
+        completed = bulk.complete_projects(
+            queryset.values_list("pk", flat=True), cascade=True
+        )
+        self.message_user(request, f"{completed} task(s) completed.")
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "title",
+        "project",
+        "tag",
+        "priority",
+        "deadline",
+        "is_completed",
+        "worker_count",
+    )
+    list_filter = ("is_completed", "priority", "tag")
+    list_select_related = ("project", "tag")
+    search_fields = ("title",)
+    raw_id_fields = ("project",)
+    actions = ("mark_completed", "mark_urgent")
+
+    @admin.action(description="Mark selected tasks completed")
+    def mark_completed(self, request, queryset) -> None:
+        completed = bulk.complete_tasks(queryset.values_list("pk", flat=True))
+        self.message_user(request, f"{completed} task(s) completed.")
+
+    @admin.action(description="Set priority to Urgent")
+    def mark_urgent(self, request, queryset) -> None:
+        updated = bulk.set_priority(queryset.values_list("pk", flat=True), "1")
+        self.message_user(request, f"{updated} task(s) updated.")
 
 
 @admin.register(Position)
@@ -79,3 +135,53 @@ class PositionAdmin(admin.ModelAdmin):
 @admin.register(TaskType)
 class TaskTypeAdmin(admin.ModelAdmin):
     list_display = ("name",)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "run_at", "attempts", "locked_by", "finished_at")
+    list_filter = ("status", "name")
+    readonly_fields = ("created_at", "finished_at", "last_error")
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ("message", "worker", "kind", "created_at", "read_at")
+    list_filter = ("kind",)
+    list_select_related = ("worker__position",)
+    raw_id_fields = ("worker", "task", "project")
+
+
+@admin.register(LeaderboardEntry)
+class LeaderboardEntryAdmin(admin.ModelAdmin):
+    list_display = (
+        "__str__",
+        "tasks_done",
+        "done_7d",
+        "done_30d",
+        "tasks_open",
+        "tasks_overdue",
+    )
+    list_select_related = ("team", "worker__position")
+    raw_id_fields = ("team", "worker")
+
+
+@admin.register(AssignmentEvent)
+class AssignmentEventAdmin(admin.ModelAdmin):
+    list_display = ("kind", "task_id", "worker_id", "created_at")
+    list_filter = ("kind", "month")
+    date_hierarchy = "created_at"
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_change_permission(self, request, obj=None) -> bool:
+        return False
+
+
+@admin.register(ProjectSnapshot)
+class ProjectSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("project", "day", "tasks_total", "tasks_done", "tasks_overdue")
+    list_select_related = ("project",)
+    date_hierarchy = "day"
+    raw_id_fields = ("project",)
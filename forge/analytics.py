@@ -0,0 +1,236 @@
+# Burndown, velocity and cycle-time reports. Counting is done with grouped SQL
+# aggregates; cycle-time rollups fetch one duration per task and summarize
+# them with NumPy when it is installed, with the statistics module otherwise.
+# Reports are cached for the rest of the day, keyed on their arguments.
+# ProjectSnapshot rows give projects a history: the "snapshot_projects" job
+# stores each project's counts for today, `manage.py snapshot_projects
+# --days N` rebuilds past days from the task timestamps.
+import datetime
+import hashlib
+import statistics
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Callable, Iterable, Optional, Sequence
+
+from django.core.cache import cache
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Q, QuerySet
+from django.db.models.functions import TruncWeek
+from django.utils import timezone
+
+from forge.jobs import job
+from forge.models import AssignmentEvent, ProjectSnapshot, Task
+
+try:
+    import numpy as np
+except ImportError:  # Optional, summaries fall back to the statistics module
+    np = None
+
+CACHE_PREFIX = "forge:analytics"
+CACHE_TIMEOUT = 24 * 60 * 60
+SNAPSHOT_FIELDS = ("tasks_total", "tasks_done", "tasks_overdue")
+
+
+def cached_daily(func: Callable) -> Callable:
+    """Cache ``func``'s result per arguments until the day changes."""
+
+    @wraps(func)
+    def wrapper(*args, **kwargs) -> Any:
+        arguments = repr((args, sorted(kwargs.items()))).encode()
+        key = (
+            f"{CACHE_PREFIX}:{func.__name__}:{timezone.localdate()}:"
+            f"{hashlib.md5(arguments).hexdigest()}"
+        )
+        result = cache.get(key)
+        if result is None:
+            result = func(*args, **kwargs)
+            cache.set(key, result, timeout=CACHE_TIMEOUT)
+        return result
+
+    wrapper.uncached = func
+    return wrapper
+
+
+def _day_start(day: datetime.date) -> datetime.datetime:
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time.min))
+
+
+def take_snapshots(day: Optional[datetime.date] = None) -> int:
+    """Store the task counts every project had at the end of ``day``.
+
+    Counts come from the task timestamps, so past days can be rebuilt too.
+    Tasks from before ``created_at`` existed count from the start, completed
+    ones without ``completed_at`` as done throughout.
+    """
+    day = day or timezone.localdate()
+    end = _day_start(day + datetime.timedelta(days=1))
+    done = Q(completed_at__lt=end) | Q(is_completed=True, completed_at__isnull=True)
+    rows = (
+        Task.objects.filter(project__isnull=False)
+        .filter(Q(created_at__lt=end) | Q(created_at__isnull=True))
+        .exclude(project__completed_at__lt=_day_start(day))
+        .values("project_id")
+        .annotate(
+            tasks_total=Count("pk"),
+            tasks_done=Count("pk", filter=done),
+            tasks_overdue=Count("pk", filter=~done & Q(deadline__lt=day)),
+        )
+        .order_by()
+    )
+    snapshots = [ProjectSnapshot(day=day, **row) for row in rows]
+    ProjectSnapshot.objects.bulk_create(
+        snapshots,
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=["project", "day"],
+        update_fields=SNAPSHOT_FIELDS,
+    )
+    return len(snapshots)
+
+
+@job("snapshot_projects")
+def snapshot_projects() -> None:
+    today = timezone.localdate()
+    # Yesterday again, for what changed after its last run
+    take_snapshots(today - datetime.timedelta(days=1))
+    take_snapshots(today)
+
+
+@cached_daily
+def burndown(
+    project_id: int,
+    start: Optional[datetime.date] = None,
+    end: Optional[datetime.date] = None,
+) -> list[dict[str, Any]]:
+    """Daily total, done, remaining and overdue task counts of a project."""
+    snapshots = ProjectSnapshot.objects.filter(project_id=project_id)
+    if start is not None:
+        snapshots = snapshots.filter(day__gte=start)
+    if end is not None:
+        snapshots = snapshots.filter(day__lte=end)
+    return [
+        {**row, "tasks_remaining": row["tasks_total"] - row["tasks_done"]}
+        for row in snapshots.order_by("day").values("day", *SNAPSHOT_FIELDS)
+    ]
+
+
+@cached_daily
+def velocity(
+    weeks: int = 12, team_ids: Optional[Iterable[int]] = None
+) -> dict[int, list[int]]:
+    """Tasks completed per team and week, oldest week first.
+
+    A task counts for the teams of the workers assigned when it was completed.
+    """
+    today = timezone.localdate()
+    first_week = today - datetime.timedelta(days=today.weekday(), weeks=weeks - 1)
+    completions = AssignmentEvent.objects.between(_day_start(first_week)).filter(
+        kind=AssignmentEvent.COMPLETED, worker__team__isnull=False
+    )
+    if team_ids is not None:
+        completions = completions.filter(worker__team_id__in=list(team_ids))
+    rows = (
+        completions.annotate(week=TruncWeek("created_at"))
+        .values_list("worker__team_id", "week")
+        .annotate(done=Count("task_id", distinct=True))
+        .order_by()
+    )
+    result = defaultdict(lambda: [0] * weeks)
+    for team_id, week, done in rows:
+        index = (timezone.localdate(week) - first_week).days // 7
+        if 0 <= index < weeks:
+            result[team_id][index] += done
+    return dict(result)
+
+
+def _percentile(values: Sequence[float], percent: float) -> float:
+    # Linear interpolation between the closest ranks, as numpy.percentile
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * percent / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(hours: Sequence[float]) -> dict[str, Optional[float]]:
+    """Count, mean, median and 90th percentile of durations in hours."""
+    if not len(hours):
+        return {"count": 0, "mean": None, "median": None, "p90": None}
+    if np is not None:
+        values = np.asarray(hours, dtype=float)
+        mean, median = values.mean(), np.median(values)
+        p90 = np.percentile(values, 90)
+    else:
+        mean, median = statistics.fmean(hours), statistics.median(hours)
+        p90 = _percentile(hours, 90)
+    return {
+        "count": len(hours),
+        "mean": float(mean),
+        "median": float(median),
+        "p90": float(p90),
+    }
+
+
+def _durations(
+    start: datetime.date, end: datetime.date, *fields: str, **filters: Any
+) -> QuerySet:
+    """``fields`` plus creation-to-completion time of tasks done in ``[start, end]``."""
+    return (
+        Task.objects.filter(
+            completed_at__gte=_day_start(start),
+            completed_at__lt=_day_start(end + datetime.timedelta(days=1)),
+            created_at__isnull=False,
+            **filters,
+        )
+        .annotate(
+            duration=ExpressionWrapper(
+                F("completed_at") - F("created_at"), output_field=DurationField()
+            )
+        )
+        .values_list(*fields, "duration")
+    )
+
+
+@cached_daily
+def cycle_times(
+    start: datetime.date, end: datetime.date, project_id: Optional[int] = None
+) -> dict[str, Optional[float]]:
+    """Creation-to-completion time of the tasks completed within ``[start, end]``."""
+    filters = {} if project_id is None else {"project_id": project_id}
+    return summarize(
+        [
+            duration.total_seconds() / 3600
+            for (duration,) in _durations(start, end, **filters)
+        ]
+    )
+
+
+@cached_daily
+def team_cycle_times(
+    start: datetime.date, end: datetime.date
+) -> dict[int, dict[str, Optional[float]]]:
+    """``cycle_times`` per team of the tasks' assignees."""
+    # One row per task and team, however many of its members are assigned
+    rows = (
+        _durations(start, end, "pk", "workers__team_id", workers__team__isnull=False)
+        .distinct()
+        .order_by()
+    )
+    if np is not None:
+        teams, seconds = (
+            np.array(
+                [(team_id, duration.total_seconds()) for _, team_id, duration in rows]
+            )
+            .reshape(-1, 2)
+            .T
+        )
+        order = np.argsort(teams, kind="stable")
+        teams, hours = teams[order].astype(int), seconds[order] / 3600
+        keys, starts = np.unique(teams, return_index=True)
+        return {
+            int(team_id): summarize(group)
+            for team_id, group in zip(keys, np.split(hours, starts[1:]))
+        }
+    grouped = defaultdict(list)
+    for _, team_id, duration in rows:
+        grouped[team_id].append(duration.total_seconds() / 3600)
+    return {team_id: summarize(hours) for team_id, hours in grouped.items()}
@@ -0,0 +1,108 @@
+# Set-based task operations: each runs a fixed number of statements however
+# many rows it touches. QuerySet.update()/bulk_create() skip model signals,
+# so the custom signals from forge.signals report what changed instead, or
+# the cache versions are bumped directly where no signal fits.
+import datetime
+from typing import Iterable
+
+from django.db import transaction
+from django.utils import timezone
+
+from forge import leaderboard
+from forge.cache import bump
+from forge.models import Project, Task, TaskAssignment
+from forge.signals import assignments_changed, tasks_completed
+
+
+def complete_tasks(task_ids: Iterable[int]) -> int:
+    with transaction.atomic():
+        completed = list(
+            Task.objects.select_for_update()
+            .filter(pk__in=list(task_ids), is_completed=False)
+            .values_list("pk", flat=True)
+        )
+        if not completed:
+            return 0
+        Task.objects.filter(pk__in=completed).update(
+            is_completed=True, completed_at=timezone.now()
+        )
+        tasks_completed.send(sender=Task, task_ids=completed)
+    return len(completed)
+
+
+def set_priority(task_ids: Iterable[int], priority: str) -> int:
+    task_ids = list(task_ids)
+    updated = Task.objects.filter(pk__in=task_ids).update(priority=priority)
+    bump(Task, task_ids)
+    return updated
+
+
+def set_deadline(task_ids: Iterable[int], deadline: datetime.date) -> int:
+    task_ids = list(task_ids)
+    updated = Task.objects.filter(pk__in=task_ids).update(deadline=deadline)
+    bump(Task, task_ids)
+    # Moves tasks in or out of overdue
+    leaderboard.refresh_tasks(task_ids)
+    return updated
+
+
+def assign_workers(task_ids: Iterable[int], worker_ids: Iterable[int]) -> int:
+    task_ids, worker_ids = list(task_ids), list(worker_ids)
+    with transaction.atomic():
+        existing = set(
+            TaskAssignment.objects.filter(
+                task_id__in=task_ids, assignee_id__in=worker_ids
+            ).values_list("task_id", "assignee_id")
+        )
+        added = [
+            (task_id, worker_id)
+            for task_id in task_ids
+            for worker_id in worker_ids
+            if (task_id, worker_id) not in existing
+        ]
+        TaskAssignment.objects.bulk_create(
+            TaskAssignment(task_id=task_id, assignee_id=worker_id)
+            for task_id, worker_id in added
+        )
+        if added:
+            assignments_changed.send(sender=TaskAssignment, added=added, removed=[])
+    return len(added)
+
+
+def unassign_workers(task_ids: Iterable[int], worker_ids: Iterable[int]) -> int:
+    with transaction.atomic():
+        assignments = TaskAssignment.objects.filter(
+            task_id__in=list(task_ids), assignee_id__in=list(worker_ids)
+        )
+        removed = list(assignments.values_list("task_id", "assignee_id"))
+        if not removed:
+            return 0
+        # The per-row post_delete receivers skip queryset deletes,
+        # assignments_changed covers them at once
+        assignments.delete()
+        assignments_changed.send(sender=TaskAssignment, added=[], removed=removed)
+    return len(removed)
+
+
+def complete_projects(project_ids: Iterable[int], cascade: bool = False) -> int:
+    """Mark projects completed, optionally completing their open tasks too.
+
+    Returns the number of tasks completed by the cascade.
+    """
+    project_ids = list(project_ids)
+    with transaction.atomic():
+        Project.objects.filter(pk__in=project_ids, is_completed=False).update(
+            is_completed=True, completed_at=timezone.now()
+        )
+        bump(Project, project_ids)
+        if not cascade:
+            return 0
+        return complete_tasks(
+            Task.objects.filter(
+                project_id__in=project_ids, is_completed=False
+            ).values_list("pk", flat=True)
+        )
+
+
+def complete_project(project_id: int, cascade: bool = False) -> int:
+    return complete_projects([project_id], cascade)
@@ -0,0 +1,129 @@
+# Versioned cache keys. Every model has a table version and a version per
+# object; signals in forge.signals bump them on writes, so a cached entry is
+# never read again once anything it was built from has changed.
+import time
+from functools import partial
+from typing import Any, Iterable, Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Model
+from django.http import Http404
+
+VERSION_PREFIX = "forge:version"
+DETAIL_PREFIX = "forge:detail"
+
+
+def version_key(model: Type[Model], pk: Any = None) -> str:
+    return f"{VERSION_PREFIX}:{model._meta.label_lower}:{'*' if pk is None else pk}"
+
+
+def _fresh_version() -> int:
+    # Unique starting point, so an evicted version never reverts to a value
+    # older entries were stored under.
+    return time.time_ns()
+
+
+def _version_keys(
+    obj_model: Type[Model], pk: Any, depends_on: Iterable[Type[Model]]
+) -> list[str]:
+    return [version_key(obj_model, pk), *(version_key(model) for model in depends_on)]
+
+
+def get_version(
+    obj_model: Type[Model], pk: Any, depends_on: Iterable[Type[Model]] = ()
+) -> str:
+    """Combined version of one object and the tables it is rendered from."""
+    keys = _version_keys(obj_model, pk, depends_on)
+    versions = cache.get_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        versions.update(missing)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+async def aget_version(
+    obj_model: Type[Model], pk: Any, depends_on: Iterable[Type[Model]] = ()
+) -> str:
+    keys = _version_keys(obj_model, pk, depends_on)
+    versions = await cache.aget_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in versions}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        versions.update(missing)
+    return ".".join(str(versions[key]) for key in keys)
+
+
+def _incr_versions(keys: list[str]) -> None:
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _fresh_version(), timeout=None)
+
+
+def bump(model: Type[Model], pks: Optional[Iterable[Any]] = None) -> None:
+    """Invalidate the table version of ``model`` and of the given objects.
+
+    Inside a transaction the versions are bumped again on commit, so a reader
+    that cached the pre-commit rows in between is invalidated as well.
+    """
+    keys = [version_key(model), *(version_key(model, pk) for pk in pks or ())]
+    _incr_versions(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(partial(_incr_versions, keys))
+
+
+class CachedDetailMixin:
+    """Cache a DetailView's object, prefetched relations included.
+
+    ``cache_depends_on`` lists the models the page renders besides the object
+    itself. The combined version is exposed as ``cache_version`` so templates
+    can key ``{% cache %}`` fragments on it. Nothing is cached while
+    ``DETAIL_CACHE_TIMEOUT`` is 0.
+    """
+
+    cache_depends_on: tuple[Type[Model], ...] = ()
+
+    def get_cache_key(self, pk: Any) -> str:
+        return (
+            f"{DETAIL_PREFIX}:{self.model._meta.label_lower}:{pk}:{self.cache_version}"
+        )
+
+    def get_object(self, queryset: Any = None) -> Model:
+        if not settings.DETAIL_CACHE_TIMEOUT:
+            self.cache_version = None
+            return super().get_object(queryset)
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        self.cache_version = get_version(self.model, pk, self.cache_depends_on)
+        obj = cache.get(self.get_cache_key(pk))
+        if obj is None:
+            obj = super().get_object(queryset)
+            cache.set(self.get_cache_key(pk), obj, settings.DETAIL_CACHE_TIMEOUT)
+        return obj
+
+    async def aget_object(self) -> Model:
+        pk = self.kwargs.get(self.pk_url_kwarg)
+        if not settings.DETAIL_CACHE_TIMEOUT:
+            self.cache_version = None
+            return await self._aget_uncached(pk)
+        self.cache_version = await aget_version(self.model, pk, self.cache_depends_on)
+        obj = await cache.aget(self.get_cache_key(pk))
+        if obj is None:
+            obj = await self._aget_uncached(pk)
+            await cache.aset(self.get_cache_key(pk), obj, settings.DETAIL_CACHE_TIMEOUT)
+        return obj
+
+    async def _aget_uncached(self, pk: Any) -> Model:
+        try:
+            return await self.get_queryset().aget(pk=pk)
+        except self.model.DoesNotExist:
+            raise Http404(f"No {self.model._meta.verbose_name} found matching the query")
+
+    def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        context["cache_version"] = self.cache_version
+        context["detail_cache_timeout"] = settings.DETAIL_CACHE_TIMEOUT
+        return context
@@ -0,0 +1,14 @@
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest
+
+from forge.roles import get_role
+
+
+def role(request: HttpRequest) -> dict[str, Any]:
+    return {"role": get_role(request)}
+
+
+def fragment_cache(request: HttpRequest) -> dict[str, Any]:
+    return {"fragment_cache_timeout": settings.FRAGMENT_CACHE_TIMEOUT}
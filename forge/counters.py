@@ -0,0 +1,91 @@
+# Denormalized counters: Task.worker_count and Project.tasks_total/tasks_done.
+# forge.signals keeps them current with F() updates, one statement per distinct
+# delta however many rows change; repair_counters() recomputes them from the
+# assignments and tasks and fixes whatever drifted.
+from collections import Counter, defaultdict
+from typing import Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from forge.models import Project, Task, TaskAssignment
+
+
+def _count(queryset, group_by: str, **filters) -> Coalesce:
+    subquery = (
+        queryset.filter(**{group_by: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(group_by)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(subquery), Value(0), output_field=IntegerField())
+
+
+def _adjust(model: type, field: str, deltas: Counter) -> None:
+    by_delta = defaultdict(list)
+    for pk, delta in deltas.items():
+        if pk is not None and delta:
+            by_delta[delta].append(pk)
+    for delta, pks in by_delta.items():
+        model.objects.filter(pk__in=pks).update(
+            **{field: Greatest(F(field) + delta, 0)}
+        )
+
+
+def adjust_worker_counts(deltas: Counter) -> None:
+    """Apply ``{task_id: delta}`` to Task.worker_count."""
+    _adjust(Task, "worker_count", deltas)
+
+
+def recount_workers(task_ids: Iterable[int]) -> None:
+    Task.objects.filter(pk__in=list(task_ids)).update(
+        worker_count=_count(TaskAssignment.objects, "task")
+    )
+
+
+def adjust_project_counts(
+    total: Optional[Counter] = None, done: Optional[Counter] = None
+) -> None:
+    """Apply ``{project_id: delta}`` to Project.tasks_total and tasks_done."""
+    _adjust(Project, "tasks_total", total or Counter())
+    _adjust(Project, "tasks_done", done or Counter())
+
+
+def count_projects(task_ids: Iterable[int]) -> Counter:
+    """Number of the given tasks per project."""
+    return Counter(
+        dict(
+            Task.objects.filter(pk__in=list(task_ids), project__isnull=False)
+            .values_list("project_id")
+            .annotate(count=Count("pk"))
+            .order_by()
+        )
+    )
+
+
+def repair_counters() -> dict[str, int]:
+    """Recompute every counter, returning how many rows had drifted per model."""
+    worker_count = _count(TaskAssignment.objects, "task")
+    tasks_total = _count(Task.objects, "project")
+    tasks_done = _count(Task.objects, "project", is_completed=True)
+    with transaction.atomic():
+        drifted_tasks = (
+            Task.objects.annotate(actual=worker_count)
+            .exclude(worker_count=F("actual"))
+            .count()
+        )
+        if drifted_tasks:
+            Task.objects.update(worker_count=worker_count)
+
+        drifted_projects = (
+            Project.objects.annotate(actual_total=tasks_total, actual_done=tasks_done)
+            .filter(
+                ~Q(tasks_total=F("actual_total")) | ~Q(tasks_done=F("actual_done"))
+            )
+            .count()
+        )
+        if drifted_projects:
+            Project.objects.update(tasks_total=tasks_total, tasks_done=tasks_done)
+    return {"tasks": drifted_tasks, "projects": drifted_projects}
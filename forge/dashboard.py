@@ -0,0 +1,74 @@
+from typing import Tuple
+
+from asgiref.sync import sync_to_async
+from django.db.models import F, Count, Q
+
+from forge.leaderboard import top_teams
+from forge.models import DashboardStats, Task, Team, Worker
+
+STATS_PK = 1
+
+
+def get_dashboard_stats() -> DashboardStats:
+    """Return the materialized home page counters, building them on first use."""
+    stats = DashboardStats.objects.filter(pk=STATS_PK).first()
+    if stats is None:
+        stats = rebuild_dashboard_stats()
+    return stats
+
+
+async def aget_dashboard_stats() -> DashboardStats:
+    stats = await DashboardStats.objects.filter(pk=STATS_PK).afirst()
+    if stats is None:
+        stats = await sync_to_async(rebuild_dashboard_stats)()
+    return stats
+
+
+def rebuild_dashboard_stats() -> DashboardStats:
+    """Recompute every counter from scratch, used for reconciliation."""
+    workers = Worker.objects.aggregate(
+        num_users=Count("pk"),
+        num_workers=Count("pk", filter=Q(status__gt=0)),
+    )
+    tasks = Task.objects.aggregate(
+        tasks_overall=Count("pk"),
+        tasks_done=Count("pk", filter=Q(is_completed=True)),
+    )
+    max_tasks_done, best_team = get_best_team()
+
+    stats, _ = DashboardStats.objects.update_or_create(
+        pk=STATS_PK,
+        defaults={
+            **workers,
+            **tasks,
+            "teams": Team.objects.count(),
+            "best_team": best_team,
+            "max_tasks_done": max_tasks_done,
+        },
+    )
+    return stats
+
+
+def adjust_dashboard_stats(**deltas: int) -> None:
+    """Apply counter deltas in a single UPDATE.
+
+    Nothing is written while the row does not exist yet, the next read
+    builds it from scratch anyway.
+    """
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if changes:
+        DashboardStats.objects.filter(pk=STATS_PK).update(**changes)
+
+
+def refresh_best_team() -> None:
+    max_tasks_done, best_team = get_best_team()
+    DashboardStats.objects.filter(pk=STATS_PK).update(
+        best_team=best_team, max_tasks_done=max_tasks_done
+    )
+
+
+def get_best_team() -> Tuple[int, str] | Tuple[int, None]:
+    best = top_teams(1)
+    if not best:
+        return 0, None
+    return best[0].tasks_done, best[0].team.name
@@ -0,0 +1,80 @@
+import csv
+import json
+from typing import Any, Iterable, Iterator
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+
+EXPORT_CHUNK_SIZE = 2000
+
+CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+class Echo:
+    """File-like object handing ``csv.writer`` output straight back."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def stream_csv(header: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def stream_ndjson(header: list[str], rows: Iterable[tuple]) -> Iterator[str]:
+    for row in rows:
+        yield json.dumps(dict(zip(header, row)), cls=DjangoJSONEncoder) + "\n"
+
+
+STREAMERS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
+
+
+class ExportMixin:
+    """Stream a list view's queryset as CSV or NDJSON in constant memory.
+
+    Rows come from ``values_list(...).iterator()``, so no model instances are
+    built. ``export_columns`` maps column names to lookups. Under ASGI the rows
+    are fetched before the response is returned: Django 4.1's ASGIHandler
+    iterates the body on the event loop, where the database can't be used.
+    """
+
+    export_columns: dict[str, str] = {}
+    export_filename = "export"
+
+    def get_export_queryset(self) -> QuerySet:
+        return self.get_queryset()
+
+    def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Any:
+        export_format = request.GET.get("format", "csv")
+        if export_format not in STREAMERS:
+            export_format = "csv"
+
+        header = list(self.export_columns)
+        rows = (
+            self.get_export_queryset()
+            .prefetch_related(None)
+            .values_list(*self.export_columns.values())
+        )
+        if isinstance(request, ASGIRequest):
+            rows = list(rows)
+        else:
+            rows = rows.iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        response = StreamingHttpResponse(
+            STREAMERS[export_format](header, rows),
+            content_type=CONTENT_TYPES[export_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="{self.export_filename}.{export_format}"'
+        )
+        return response
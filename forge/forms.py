@@ -1,18 +1,63 @@
 import datetime
+from typing import Any
 
 from django import forms
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
 from django.contrib.auth.forms import UserCreationForm
 from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.urls import reverse
+
 from .models import Worker, Position, Team, Project, TaskType, Task
+from .search import get_search_backend
+
+
+class WorkerAutocompleteWidget(forms.SelectMultiple):
+    """Multiple select holding only the selected workers.
+
+    ``js/worker_autocomplete.js`` adds a search box that appends options from
+    the ``worker-autocomplete`` endpoint, so the page never lists every worker.
+    """
+
+    class Media:
+        js = ("js/worker_autocomplete.js",)
+
+    def __init__(self, hired_only: bool = False, attrs: dict = None) -> None:
+        super().__init__(attrs)
+        self.hired_only = hired_only
+
+    def get_context(self, name: str, value: Any, attrs: dict) -> dict:
+        url = reverse("forge:worker-autocomplete")
+        attrs = {
+            **(attrs or {}),
+            "data-autocomplete-url": f"{url}?hired=1" if self.hired_only else url,
+        }
+        return super().get_context(name, value, attrs)
+
+    def optgroups(self, name: str, value: list, attrs: dict = None) -> list:
+        pks = [pk for pk in value if str(pk).isdigit()]
+        # choices is the field's ModelChoiceIterator, query just the selection
+        workers = self.choices.queryset.filter(pk__in=pks) if pks else []
+        return [
+            (None, [self.create_option(name, worker.pk, str(worker), True, i)], i)
+            for i, worker in enumerate(workers)
+        ]
+
+
+class WorkerMultipleChoiceField(forms.ModelMultipleChoiceField):
+    """Workers picked by autocomplete, validated with one ``pk__in`` query."""
+
+    def __init__(self, queryset: QuerySet, hired_only: bool = False, **kwargs) -> None:
+        kwargs.setdefault("widget", WorkerAutocompleteWidget(hired_only=hired_only))
+        super().__init__(queryset, **kwargs)
 
 
 class ProjectForm(forms.ModelForm):
     name = forms.CharField(max_length=255)
     description = forms.CharField(widget=forms.Textarea(attrs={"rows": 3}))
     manager = forms.ModelChoiceField(
-        queryset=Worker.objects.filter(position__name="ProjectManager"),
+        queryset=Worker.objects.filter(position__name="ProjectManager").for_labels(),
         widget=forms.Select(attrs={"class": "form-select"}),
     )
     start_date = forms.DateField(widget=forms.DateInput(attrs={"type": "date"}))
@@ -60,7 +105,7 @@ class WorkerHireForm(forms.ModelForm):
     )
 
     team = forms.ModelChoiceField(
-        queryset=Team.objects.all(),
+        queryset=Team.objects.only("name"),
         widget=forms.Select(attrs={"class": "form-select"}),
         required=False,
     )
@@ -114,7 +159,8 @@ class WorkerRegisterForm(UserCreationForm):
     )
 
     team = forms.ModelChoiceField(
-        queryset=Team.objects.all(), widget=forms.Select(attrs={"class": "form-select"})
+        queryset=Team.objects.only("name"),
+        widget=forms.Select(attrs={"class": "form-select"}),
     )
 
     class Meta:
@@ -147,6 +193,11 @@ class WorkerSearchForm(forms.Form):
         ),
     )
 
+    def search(self, queryset: QuerySet) -> QuerySet:
+        if not self.is_valid():
+            return queryset
+        return get_search_backend().search(queryset, self.cleaned_data["name"])
+
 
 class TaskSearchForm(forms.Form):
     title = forms.CharField(
@@ -160,11 +211,16 @@ class TaskSearchForm(forms.Form):
         ),
     )
 
+    def search(self, queryset: QuerySet) -> QuerySet:
+        if not self.is_valid():
+            return queryset
+        return get_search_backend().search(queryset, self.cleaned_data["title"])
+
 
 class TaskForm(forms.ModelForm):
-    workers = forms.ModelMultipleChoiceField(
-        queryset=Worker.objects.prefetch_related("tasks__tag").filter(status__gt=0),
-        widget=forms.CheckboxSelectMultiple,
+    workers = WorkerMultipleChoiceField(
+        queryset=Worker.objects.filter(status__gt=0).for_labels(),
+        hired_only=True,
         required=False,
     )
 
@@ -177,7 +233,7 @@ class TaskForm(forms.ModelForm):
     )
 
     project = forms.ModelChoiceField(
-        queryset=Project.objects.all(),
+        queryset=Project.objects.only("name"),
         empty_label=None,
         required=True,
     )
@@ -197,16 +253,15 @@ class TaskForm(forms.ModelForm):
 
 
 class TeamForm(forms.ModelForm):
-    members = forms.ModelMultipleChoiceField(
-        queryset=Worker.objects.all(),
-        widget=forms.CheckboxSelectMultiple,
+    members = WorkerMultipleChoiceField(
+        queryset=Worker.objects.for_labels(),
         required=False,
     )
 
     project_manager = forms.ModelChoiceField(
-        queryset=Worker.objects.select_related("position").filter(
+        queryset=Worker.objects.filter(
             position__name__icontains="ProjectManager"
-        ),
+        ).for_labels(),
         required=True,
         empty_label=None,
         label="Project Manager",
@@ -215,3 +270,45 @@ class TeamForm(forms.ModelForm):
     class Meta:
         model = Team
         fields = ["name", "project_manager", "members"]
+
+
+class TaskBulkActionForm(forms.Form):
+    COMPLETE = "complete"
+    PRIORITY = "priority"
+    DEADLINE = "deadline"
+    ASSIGN = "assign"
+    UNASSIGN = "unassign"
+    ACTION_CHOICES = (
+        (COMPLETE, "Mark completed"),
+        (PRIORITY, "Change priority"),
+        (DEADLINE, "Change deadline"),
+        (ASSIGN, "Add workers"),
+        (UNASSIGN, "Remove workers"),
+    )
+
+    action = forms.ChoiceField(choices=ACTION_CHOICES)
+    tasks = forms.ModelMultipleChoiceField(queryset=Task.objects.only("pk"))
+    priority = forms.ChoiceField(choices=Task.PRIORITY_CHOICES, required=False)
+    deadline = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date"}),
+        validators=[MinValueValidator(limit_value=datetime.date.today)],
+    )
+    workers = WorkerMultipleChoiceField(
+        queryset=Worker.objects.filter(status__gt=0).for_labels(),
+        hired_only=True,
+        required=False,
+    )
+
+    def clean(self) -> dict:
+        cleaned_data = super().clean()
+        action = cleaned_data.get("action")
+        required = {
+            self.PRIORITY: "priority",
+            self.DEADLINE: "deadline",
+            self.ASSIGN: "workers",
+            self.UNASSIGN: "workers",
+        }.get(action)
+        if required and not cleaned_data.get(required):
+            raise ValidationError(f"Choose {required} for this action.")
+        return cleaned_data
@@ -0,0 +1,106 @@
+# Append-only assignment history. forge.signals records an AssignmentEvent for
+# every assignment, unassignment, completion and reopening, one bulk_create per
+# batch of changes. Rows are never updated. Timelines and throughput reports
+# are range scans over (worker|task, created_at), bounded on the month column,
+# instead of reconstructing past state from TaskAssignment.
+import datetime
+from collections import Counter
+from typing import Iterable, Optional
+
+from django.db.models import Count, QuerySet
+from django.utils import timezone
+
+from forge.models import AssignmentEvent, TaskAssignment, month_start
+
+
+def event(
+    kind: int, task_id: int, worker_id: int, at: datetime.datetime
+) -> AssignmentEvent:
+    """An unsaved event, with ``month`` filled in for bulk_create()."""
+    return AssignmentEvent(
+        task_id=task_id,
+        worker_id=worker_id,
+        kind=kind,
+        created_at=at,
+        month=month_start(at),
+    )
+
+
+def record(
+    kind: int,
+    pairs: Iterable[tuple[int, int]],
+    at: Optional[datetime.datetime] = None,
+) -> int:
+    """Record ``kind`` for each ``(task_id, worker_id)`` pair."""
+    at = at or timezone.now()
+    events = [event(kind, task_id, worker_id, at) for task_id, worker_id in pairs]
+    AssignmentEvent.objects.bulk_create(events, batch_size=500)
+    return len(events)
+
+
+def record_tasks(
+    kind: int, task_ids: Iterable[int], at: Optional[datetime.datetime] = None
+) -> int:
+    """Record ``kind`` for every worker currently assigned to the given tasks."""
+    return record(
+        kind,
+        TaskAssignment.objects.filter(task_id__in=list(task_ids)).values_list(
+            "task_id", "assignee_id"
+        ),
+        at,
+    )
+
+
+def timeline(
+    worker_id: Optional[int] = None,
+    task_id: Optional[int] = None,
+    start: Optional[datetime.datetime] = None,
+    end: Optional[datetime.datetime] = None,
+) -> QuerySet:
+    """Events of a worker and/or a task within ``[start, end)``, oldest first."""
+    events = AssignmentEvent.objects.between(start, end)
+    if worker_id is not None:
+        events = events.filter(worker_id=worker_id)
+    if task_id is not None:
+        events = events.filter(task_id=task_id)
+    return events.order_by("created_at", "pk")
+
+
+def assignment_spans(
+    task_id: int,
+) -> list[tuple[int, datetime.datetime, Optional[datetime.datetime]]]:
+    """Who worked on a task when: ``(worker_id, assigned, unassigned)`` periods.
+
+    Periods still open end in None.
+    """
+    spans, started = [], {}
+    events = timeline(task_id=task_id).filter(
+        kind__in=(AssignmentEvent.ASSIGNED, AssignmentEvent.UNASSIGNED)
+    )
+    for worker_id, kind, at in events.values_list("worker_id", "kind", "created_at"):
+        if kind == AssignmentEvent.ASSIGNED:
+            started.setdefault(worker_id, at)
+        elif worker_id in started:
+            spans.append((worker_id, started.pop(worker_id), at))
+    spans.extend((worker_id, at, None) for worker_id, at in started.items())
+    return spans
+
+
+def throughput(
+    start: datetime.datetime,
+    end: datetime.datetime,
+    worker_ids: Optional[Iterable[int]] = None,
+) -> Counter:
+    """Distinct tasks each worker completed within ``[start, end)``."""
+    completions = AssignmentEvent.objects.between(start, end).filter(
+        kind=AssignmentEvent.COMPLETED
+    )
+    if worker_ids is not None:
+        completions = completions.filter(worker_id__in=list(worker_ids))
+    return Counter(
+        dict(
+            completions.values_list("worker_id")
+            .annotate(count=Count("task_id", distinct=True))
+            .order_by()
+        )
+    )
@@ -0,0 +1,210 @@
+# DB-backed job queue. Jobs are rows in forge_job, claimed by any number of
+# `manage.py run_jobs` processes: with SELECT ... FOR UPDATE SKIP LOCKED where
+# the database has it (PostgreSQL), otherwise with a single conditional UPDATE
+# that stamps the claimed rows, which SQLite's database-wide write lock makes
+# atomic. Either way a job is handed to exactly one worker.
+import datetime
+import logging
+import traceback
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, QuerySet
+from django.utils import timezone
+
+from forge.models import Job, Notification, Project, Task, TaskAssignment
+
+logger = logging.getLogger("forge.jobs")
+
+JOBS: dict[str, Callable] = {}
+
+NOTIFICATION_BATCH_SIZE = 2000
+REMINDER_DAYS = 1
+# Seconds between runs of each periodic job, overridable via PERIODIC_JOBS
+DEFAULT_PERIODIC_JOBS = {
+    "sweep_overdue": 60 * 60,
+    "deadline_reminders": 60 * 60,
+    "recompute_leaderboard": 60 * 60,
+    "snapshot_projects": 60 * 60,
+}
+# A job locked for longer than this is assumed to belong to a dead worker
+LOCK_TIMEOUT = datetime.timedelta(minutes=15)
+
+
+def job(name: str) -> Callable:
+    """Register a function as the handler of jobs called ``name``."""
+
+    def decorator(func: Callable) -> Callable:
+        JOBS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(
+    name: str, run_at: Optional[datetime.datetime] = None, **payload: Any
+) -> Job:
+    if name not in JOBS:
+        raise KeyError(f"Unknown job {name!r}")
+    return Job.objects.create(
+        name=name, payload=payload, run_at=run_at or timezone.now()
+    )
+
+
+def schedule_periodic(now: Optional[datetime.datetime] = None) -> None:
+    """Enqueue the current slot of every periodic job that has none yet."""
+    now = now or timezone.now()
+    periodic = getattr(settings, "PERIODIC_JOBS", DEFAULT_PERIODIC_JOBS)
+    jobs = [
+        Job(name=name, key=f"{name}:{int(now.timestamp()) // interval}", run_at=now)
+        for name, interval in periodic.items()
+    ]
+    # The unique key makes concurrent schedulers race harmlessly
+    Job.objects.bulk_create(jobs, ignore_conflicts=True)
+
+
+def release_stale_jobs() -> int:
+    return Job.objects.filter(
+        status=Job.RUNNING, locked_at__lt=timezone.now() - LOCK_TIMEOUT
+    ).update(status=Job.QUEUED, locked_by="", locked_at=None)
+
+
+def claim_jobs(worker_id: str, limit: int = 10) -> list[Job]:
+    now = timezone.now()
+    due = Job.objects.filter(status=Job.QUEUED, run_at__lte=now).order_by("run_at")
+    claim = {
+        "status": Job.RUNNING,
+        "locked_by": worker_id,
+        "locked_at": now,
+        "attempts": F("attempts") + 1,
+    }
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(
+                due.select_for_update(skip_locked=True).values_list("pk", flat=True)[
+                    :limit
+                ]
+            )
+            Job.objects.filter(pk__in=ids).update(**claim)
+            return list(Job.objects.filter(pk__in=ids).order_by("run_at"))
+
+        # One UPDATE ... WHERE id IN (SELECT ... LIMIT n) statement
+        Job.objects.filter(pk__in=due.values("pk")[:limit]).update(**claim)
+        return list(
+            Job.objects.filter(
+                status=Job.RUNNING, locked_by=worker_id, locked_at=now
+            ).order_by("run_at")
+        )
+
+
+def run_job(job: Job) -> bool:
+    """Run a claimed job, requeueing it with a backoff if it fails."""
+    try:
+        JOBS[job.name](**job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()
+        logger.exception("Job %s #%s failed", job.name, job.pk)
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_at = timezone.now() + datetime.timedelta(minutes=2**job.attempts)
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+        succeeded = False
+    else:
+        job.status = Job.DONE
+        job.finished_at = timezone.now()
+        succeeded = True
+    job.locked_by, job.locked_at = "", None
+    job.save(
+        update_fields=[
+            "status",
+            "run_at",
+            "last_error",
+            "locked_by",
+            "locked_at",
+            "finished_at",
+        ]
+    )
+    return succeeded
+
+
+def run_pending(worker_id: str, limit: int = 10) -> int:
+    jobs = claim_jobs(worker_id, limit)
+    for claimed in jobs:
+        run_job(claimed)
+    return len(jobs)
+
+
+def _notify(notifications: Iterable[Notification]) -> None:
+    # Already existing notifications are skipped by the unique constraints
+    batch = []
+    for notification in notifications:
+        batch.append(notification)
+        if len(batch) == NOTIFICATION_BATCH_SIZE:
+            Notification.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+def _task_notifications(
+    tasks: QuerySet, kind: str, message: str
+) -> Iterator[Notification]:
+    assignments = (
+        TaskAssignment.objects.filter(task__in=tasks)
+        .values_list("task_id", "assignee_id", "task__title", "task__deadline")
+        .iterator(chunk_size=NOTIFICATION_BATCH_SIZE)
+    )
+    for task_id, worker_id, title, deadline in assignments:
+        yield Notification(
+            worker_id=worker_id,
+            kind=kind,
+            task_id=task_id,
+            message=message.format(title=title, deadline=deadline)[:255],
+        )
+
+
+@job("sweep_overdue")
+def sweep_overdue() -> None:
+    """Notify assignees of overdue tasks and managers of overdue projects."""
+    today = timezone.localdate()
+    tasks = Task.objects.filter(
+        is_completed=False, deadline__lt=today, project__is_completed=False
+    )
+    _notify(
+        _task_notifications(
+            tasks, Notification.TASK_OVERDUE, "{title} was due on {deadline}"
+        )
+    )
+    projects = (
+        Project.objects.filter(is_completed=False, deadline__lt=today)
+        .values_list("pk", "manager_id", "name", "deadline")
+        .iterator(chunk_size=NOTIFICATION_BATCH_SIZE)
+    )
+    _notify(
+        Notification(
+            worker_id=manager_id,
+            kind=Notification.PROJECT_OVERDUE,
+            project_id=project_id,
+            message=f"Project {name} was due on {deadline}"[:255],
+        )
+        for project_id, manager_id, name, deadline in projects
+    )
+
+
+@job("deadline_reminders")
+def deadline_reminders() -> None:
+    today = timezone.localdate()
+    tasks = Task.objects.filter(
+        is_completed=False,
+        deadline__gte=today,
+        deadline__lte=today + datetime.timedelta(days=REMINDER_DAYS),
+        project__is_completed=False,
+    )
+    _notify(
+        _task_notifications(
+            tasks, Notification.DEADLINE_SOON, "{title} is due on {deadline}"
+        )
+    )
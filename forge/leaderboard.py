@@ -0,0 +1,173 @@
+# Team and worker leaderboard: done/open/overdue task counts per subject, plus
+# completions over rolling windows. A team's counts are the distinct tasks of
+# the workers whose team it is. Completing tasks moves them from open to done
+# with a few F() UPDATEs; other changes (assignments, team moves, reopened or
+# rescheduled tasks) recompute just the affected rows. The periodic
+# "recompute_leaderboard" job rebuilds every row, which is what moves old
+# completions out of the windows and open tasks past their deadline into
+# overdue.
+import datetime
+from collections import defaultdict
+from typing import Any, Iterable, Optional
+
+from django.db import transaction
+from django.db.models import Count, F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from forge.jobs import job
+from forge.models import LeaderboardEntry, TaskAssignment, Worker
+
+# Completion window fields and their length in days
+WINDOWS = {"done_7d": 7, "done_30d": 30}
+COUNT_FIELDS = ("tasks_done", *WINDOWS, "tasks_open", "tasks_overdue")
+# Grouping of TaskAssignment rows and the LeaderboardEntry column per subject
+SUBJECTS = {"worker": "assignee_id", "team": "assignee__team_id"}
+
+
+def _aggregates() -> dict[str, Count]:
+    now, today = timezone.now(), timezone.localdate()
+    done, pending = Q(task__is_completed=True), Q(task__is_completed=False)
+    aggregates = {
+        "tasks_done": Count("task", filter=done, distinct=True),
+        "tasks_open": Count("task", filter=pending, distinct=True),
+        "tasks_overdue": Count(
+            "task", filter=pending & Q(task__deadline__lt=today), distinct=True
+        ),
+    }
+    for field, days in WINDOWS.items():
+        since = now - datetime.timedelta(days=days)
+        aggregates[field] = Count(
+            "task", filter=done & Q(task__completed_at__gte=since), distinct=True
+        )
+    return aggregates
+
+
+def _refresh(subject: str, ids: Optional[Iterable[int]] = None) -> None:
+    """Recompute the rows of the given teams or workers, or of all of them."""
+    group_by = SUBJECTS[subject]
+    assignments = TaskAssignment.objects.filter(**{f"{group_by}__isnull": False})
+    entries = LeaderboardEntry.objects.filter(**{f"{subject}__isnull": False})
+    if ids is not None:
+        ids = {pk for pk in ids if pk is not None}
+        if not ids:
+            return
+        assignments = assignments.filter(**{f"{group_by}__in": ids})
+        entries = entries.filter(**{f"{subject}_id__in": ids})
+
+    counts = {
+        row.pop(group_by): row
+        for row in assignments.values(group_by).annotate(**_aggregates())
+    }
+    with transaction.atomic():
+        existing = {getattr(entry, f"{subject}_id"): entry for entry in entries}
+        changed, created = [], []
+        for pk, values in counts.items():
+            entry = existing.pop(pk, None)
+            if entry is None:
+                created.append(LeaderboardEntry(**{f"{subject}_id": pk}, **values))
+            elif any(getattr(entry, field) != values[field] for field in values):
+                for field, value in values.items():
+                    setattr(entry, field, value)
+                changed.append(entry)
+        LeaderboardEntry.objects.bulk_create(created, batch_size=500)
+        LeaderboardEntry.objects.bulk_update(changed, COUNT_FIELDS, batch_size=500)
+        # Subjects left without any task
+        if existing:
+            LeaderboardEntry.objects.filter(
+                pk__in=[entry.pk for entry in existing.values()]
+            ).delete()
+
+
+def refresh_workers(worker_ids: Iterable[int]) -> None:
+    worker_ids = set(worker_ids)
+    _refresh("worker", worker_ids)
+    _refresh(
+        "team",
+        Worker.objects.filter(pk__in=worker_ids).values_list("team_id", flat=True),
+    )
+
+
+def refresh_teams(team_ids: Iterable[int]) -> None:
+    _refresh("team", team_ids)
+
+
+def refresh_tasks(task_ids: Iterable[int]) -> None:
+    """Recompute the rows of everyone assigned to the given tasks."""
+    refresh_workers(
+        TaskAssignment.objects.filter(task_id__in=list(task_ids)).values_list(
+            "assignee_id", flat=True
+        )
+    )
+
+
+@job("recompute_leaderboard")
+def recompute_leaderboard() -> None:
+    _refresh("worker")
+    _refresh("team")
+
+
+def record_completions(task_ids: Iterable[int]) -> None:
+    """Move just-completed tasks from open to done on their subjects' rows.
+
+    Subjects sharing the same deltas are updated with one statement. Rows
+    that don't exist yet are computed from scratch instead.
+    """
+    today = timezone.localdate()
+    assignments = TaskAssignment.objects.filter(task_id__in=list(task_ids)).values_list(
+        "task_id", "assignee_id", "assignee__team_id", "task__deadline"
+    )
+    tasks = {"worker": defaultdict(set), "team": defaultdict(set)}
+    overdue = set()
+    for task_id, worker_id, team_id, deadline in assignments:
+        tasks["worker"][worker_id].add(task_id)
+        if team_id is not None:
+            tasks["team"][team_id].add(task_id)
+        if deadline < today:
+            overdue.add(task_id)
+
+    for subject, subject_tasks in tasks.items():
+        groups = defaultdict(list)
+        for pk, task_set in subject_tasks.items():
+            groups[len(task_set), len(task_set & overdue)].append(pk)
+        missing = []
+        for (done, done_overdue), ids in groups.items():
+            changes: dict[str, Any] = {
+                field: F(field) + done for field in ("tasks_done", *WINDOWS)
+            }
+            # Clamped: a row may predate its tasks turning overdue or open
+            changes["tasks_open"] = Greatest(F("tasks_open") - done, 0)
+            if done_overdue:
+                changes["tasks_overdue"] = Greatest(F("tasks_overdue") - done_overdue, 0)
+            updated = LeaderboardEntry.objects.filter(
+                **{f"{subject}_id__in": ids}
+            ).update(**changes)
+            if updated < len(ids):
+                missing.extend(ids)
+        if missing:
+            _refresh(subject, missing)
+
+
+def top_teams(limit: int = 5, order_by: str = "tasks_done") -> list[LeaderboardEntry]:
+    return list(
+        LeaderboardEntry.objects.teams().order_by(f"-{order_by}", "team__name")[:limit]
+    )
+
+
+def top_workers(limit: int = 5, order_by: str = "tasks_done") -> list[LeaderboardEntry]:
+    return list(
+        LeaderboardEntry.objects.workers().order_by(f"-{order_by}", "worker__username")[
+            :limit
+        ]
+    )
+
+
+async def atop_workers(
+    limit: int = 5, order_by: str = "tasks_done"
+) -> list[LeaderboardEntry]:
+    return [
+        entry
+        async for entry in LeaderboardEntry.objects.workers().order_by(
+            f"-{order_by}", "worker__username"
+        )[:limit]
+    ]
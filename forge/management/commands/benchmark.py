@@ -0,0 +1,193 @@
+import datetime
+import json
+import logging
+import time
+import tracemalloc
+from io import StringIO
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, setup_test_environment
+from django.urls import URLPattern, reverse
+
+from forge import urls as forge_urls
+from forge.models import Position, Project, Task, Team, Worker
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000, 1_000_000]
+
+# Model providing the <pk> of each detail route
+ROUTE_MODELS = {
+    "task": Task,
+    "edit-task": Task,
+    "worker": Worker,
+    "team": Team,
+    "project": Project,
+}
+
+# State-changing routes are not benchmarked
+SKIPPED_ROUTES = {"complete-task", "complete-project", "task-bulk"}
+
+# Extra GET variants of the hot list pages
+EXTRA_CASES = [
+    ("task-list", {"sort": "deadline"}),
+    ("task-list", {"sort": "-deadline"}),
+    ("task-list", {"sort": "tag__name"}),
+    ("task-list", {"title": "report"}),
+    ("worker-list", {"name": "kov"}),
+]
+
+
+def fetch(client: Client, url: str) -> Any:
+    response = client.get(url)
+    # Streaming exports run their queries while the body is read
+    if response.streaming:
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[round((len(ordered) - 1) * fraction)]
+
+
+class Command(BaseCommand):
+    help = (
+        "Hit every forge route through the test client and report p50/p95 "
+        "latency, query count and peak memory, optionally per generated scale."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--scale",
+            type=int,
+            action="append",
+            help="Dataset size in tasks (repeatable). Needs --generate, "
+            f"defaults to {DEFAULT_SCALES} when --generate is passed.",
+        )
+        parser.add_argument(
+            "--generate",
+            action="store_true",
+            help="FLUSH the database and generate each scale with generate_data. "
+            "Only run this against a scratch database.",
+        )
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--output", help="Write the results as JSON here.")
+        parser.add_argument("--label", default="", help="e.g. the commit hash.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["scale"] and not options["generate"]:
+            raise CommandError("--scale only makes sense together with --generate.")
+
+        try:
+            setup_test_environment()
+        except RuntimeError:
+            pass  # already inside a test run
+        logging.getLogger("forge.queries").setLevel(logging.WARNING)
+
+        results = {
+            "label": options["label"],
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "scales": {},
+        }
+        scales = (options["scale"] or DEFAULT_SCALES) if options["generate"] else [None]
+        for scale in scales:
+            if scale is not None:
+                self.stdout.write(f"Generating scale {scale}...")
+                call_command("flush", interactive=False, verbosity=0)
+                call_command("generate_data", scale=scale, stdout=StringIO())
+            key = str(scale or Task.objects.count())
+            results["scales"][key] = self.run_scale(options["iterations"])
+            self.report(key, results["scales"][key])
+
+        if options["output"]:
+            with open(options["output"], "w") as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Saved to {options['output']}"))
+
+    def get_cases(self) -> list[tuple[str, str]]:
+        cases = []
+        for pattern in forge_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or pattern.name in SKIPPED_ROUTES:
+                continue
+            kwargs = {}
+            if "pk" in pattern.pattern.converters:
+                model = next(
+                    model
+                    for prefix, model in ROUTE_MODELS.items()
+                    if pattern.name.startswith(prefix)
+                )
+                pk = model.objects.order_by("pk").values_list("pk", flat=True).first()
+                if pk is None:
+                    continue
+                kwargs["pk"] = pk
+            url = reverse(f"forge:{pattern.name}", kwargs=kwargs)
+            cases.append((f"forge:{pattern.name}", url))
+
+        for name, params in EXTRA_CASES:
+            query = "&".join(f"{key}={value}" for key, value in params.items())
+            url = f"{reverse(f'forge:{name}')}?{query}"
+            cases.append((f"forge:{name}?{query}", url))
+        return cases
+
+    def get_user(self) -> Worker:
+        position, _ = Position.objects.get_or_create(name="ProjectManager")
+        user, created = get_user_model().objects.get_or_create(
+            username="bench-admin",
+            defaults={
+                "email": "bench-admin@example.com",
+                "is_superuser": True,
+                "is_staff": True,
+                "position": position,
+                "status": Worker.IN_TEAM,
+            },
+        )
+        return user
+
+    def run_scale(self, iterations: int) -> dict:
+        client = Client()
+        client.force_login(self.get_user())
+        results = {}
+        for name, url in self.get_cases():
+            fetch(client, url)  # warm up caches and connections
+
+            timings, queries = [], 0
+            for _ in range(iterations):
+                with CaptureQueriesContext(connection) as captured:
+                    start = time.perf_counter()
+                    response = fetch(client, url)
+                    timings.append((time.perf_counter() - start) * 1000)
+                queries = len(captured)
+
+            tracemalloc.start()
+            fetch(client, url)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            results[name] = {
+                "url": url,
+                "status": response.status_code,
+                "p50_ms": round(percentile(timings, 0.5), 2),
+                "p95_ms": round(percentile(timings, 0.95), 2),
+                "queries": queries,
+                "peak_kb": round(peak / 1024, 1),
+            }
+        return results
+
+    def report(self, scale: str, results: dict) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Scale {scale}"))
+        self.stdout.write(
+            f"{'route':<45}{'status':>7}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'queries':>9}{'peak KB':>10}"
+        )
+        for name, row in results.items():
+            self.stdout.write(
+                f"{name:<45}{row['status']:>7}{row['p50_ms']:>10}{row['p95_ms']:>10}"
+                f"{row['queries']:>9}{row['peak_kb']:>10}"
+            )
@@ -0,0 +1,65 @@
+import json
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare two benchmark JSON files and fail on latency or query-count "
+        "regressions."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument("baseline")
+        parser.add_argument("candidate")
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Allowed relative p50 slowdown before a route counts as "
+            "regressed (default 0.2 = 20%%).",
+        )
+        parser.add_argument(
+            "--min-ms",
+            type=float,
+            default=1.0,
+            help="Ignore latency changes smaller than this many milliseconds.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        with open(options["baseline"]) as f:
+            baseline = json.load(f)
+        with open(options["candidate"]) as f:
+            candidate = json.load(f)
+
+        regressions = []
+        for scale, routes in candidate["scales"].items():
+            before_routes = baseline["scales"].get(scale)
+            if before_routes is None:
+                self.stdout.write(f"Scale {scale} missing from the baseline, skipped.")
+                continue
+            self.stdout.write(self.style.MIGRATE_HEADING(f"Scale {scale}"))
+            for name, after in routes.items():
+                before = before_routes.get(name)
+                if before is None:
+                    continue
+                delta = after["p50_ms"] - before["p50_ms"]
+                ratio = delta / before["p50_ms"] if before["p50_ms"] else 0
+                slower = delta > options["min_ms"] and ratio > options["threshold"]
+                more_queries = after["queries"] > before["queries"]
+                line = (
+                    f"{name:<45}{before['p50_ms']:>9} -> {after['p50_ms']:<9}"
+                    f"({ratio:+.0%}) queries {before['queries']} -> {after['queries']}"
+                )
+                if slower or more_queries:
+                    regressions.append(f"{scale} {name}")
+                    self.stdout.write(self.style.ERROR(line))
+                else:
+                    self.stdout.write(line)
+
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} regression(s): " + ", ".join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS("No regressions."))
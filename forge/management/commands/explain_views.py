@@ -0,0 +1,137 @@
+import re
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.base import SessionBase
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Model, QuerySet
+from django.test import RequestFactory
+from django.urls import reverse
+
+from forge.models import Project, Task, Team, Worker
+from forge.views import (
+    ProjectDetailView,
+    ProjectListView,
+    TaskDetailView,
+    TaskListView,
+    TeamDetailView,
+    TeamListView,
+    WorkerDetailView,
+    WorkerListView,
+)
+
+# (url name, view class, model looked up for the detail pk, GET params)
+VIEW_CASES = [
+    ("forge:task-list", TaskListView, None, {}),
+    ("forge:task-list", TaskListView, None, {"sort": "deadline"}),
+    ("forge:task-list", TaskListView, None, {"title": "report"}),
+    ("forge:task-detail", TaskDetailView, Task, {}),
+    ("forge:worker-list", WorkerListView, None, {}),
+    ("forge:worker-list", WorkerListView, None, {"name": "john"}),
+    ("forge:worker-detail", WorkerDetailView, Worker, {}),
+    ("forge:team-list", TeamListView, None, {}),
+    ("forge:team-detail", TeamDetailView, Team, {}),
+    ("forge:project-list", ProjectListView, None, {}),
+    ("forge:project-detail", ProjectDetailView, Project, {}),
+]
+
+SEQ_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (?:TABLE )?(?!.*\b(?:USING|VIRTUAL TABLE)\b)(\S+)"),
+    "postgresql": re.compile(r"Seq Scan on (\S+)"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Run EXPLAIN on every list/detail view queryset and flag sequential "
+        "scans, so missing indexes show up before production does."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--user",
+            help="Username to resolve permission-dependent querysets as "
+            "(defaults to the first superuser).",
+        )
+        parser.add_argument(
+            "--fail-on-seq-scan",
+            action="store_true",
+            help="Exit with an error when any view plan contains a sequential scan.",
+        )
+        parser.add_argument(
+            "--ignore",
+            action="append",
+            default=[],
+            help="Table allowed to be scanned sequentially (repeatable).",
+        )
+        parser.add_argument(
+            "--verbose-plans", action="store_true", help="Print every full plan."
+        )
+
+    def get_user(self, username: str | None) -> Worker:
+        users = get_user_model().objects.select_related("position", "team")
+        user = (
+            users.filter(username=username).first()
+            if username
+            else users.filter(is_superuser=True).first()
+        )
+        if user is None:
+            raise CommandError("No user to run the views as, pass --user.")
+        return user
+
+    def build_queryset(
+        self, user: Worker, url_name: str, view_class: Any, model: Model, params: dict
+    ) -> QuerySet | None:
+        kwargs = {}
+        if model is not None:
+            pk = model.objects.values_list("pk", flat=True).first()
+            if pk is None:
+                return None
+            kwargs["pk"] = pk
+
+        request = RequestFactory().get(reverse(url_name, kwargs=kwargs), params)
+        request.user = user
+        request.session = SessionBase()
+
+        view = view_class()
+        view.setup(request, **kwargs)
+        queryset = view.get_queryset()
+        return queryset.filter(pk=kwargs["pk"]) if kwargs else queryset
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(
+                f"EXPLAIN parsing is not supported on {connection.vendor}."
+            )
+
+        user = self.get_user(options["user"])
+        ignored = set(options["ignore"])
+        flagged = 0
+
+        for url_name, view_class, model, params in VIEW_CASES:
+            label = url_name + (f" {params}" if params else "")
+            queryset = self.build_queryset(user, url_name, view_class, model, params)
+            if queryset is None:
+                self.stdout.write(f"{label}: skipped, no {model.__name__} rows")
+                continue
+
+            plan = queryset.explain()
+            scans = [
+                table.strip('"')
+                for table in pattern.findall(plan)
+                if table.strip('"') not in ignored
+            ]
+            if scans:
+                flagged += 1
+                self.stdout.write(
+                    self.style.WARNING(f"{label}: sequential scan on {', '.join(scans)}")
+                )
+            else:
+                self.stdout.write(self.style.SUCCESS(f"{label}: ok"))
+            if options["verbose_plans"] or scans:
+                self.stdout.write(f"    {plan}".replace("\n", "\n    "))
+
+        if flagged and options["fail_on_seq_scan"]:
+            raise CommandError(f"{flagged} view plan(s) contain sequential scans.")
@@ -0,0 +1,229 @@
+import datetime
+import random
+import secrets
+from itertools import islice
+from typing import Any, Iterable, Iterator
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from forge import history
+from forge.models import (
+    AssignmentEvent,
+    Position,
+    Project,
+    Task,
+    TaskAssignment,
+    TaskType,
+    Team,
+    Worker,
+)
+
+FIRST_NAMES = ["Anna", "Bohdan", "Daria", "Ivan", "Kateryna", "Mykola", "Olena", "Taras"]
+LAST_NAMES = ["Bondar", "Kovalenko", "Melnyk", "Shevchenko", "Tkachenko", "Tsybulko"]
+POSITIONS = ["Developer", "QA", "Designer", "DevOps", "Analyst"]
+TASK_TYPES = ["Bug", "Feature", "Refactoring", "QA", "Research"]
+WORDS = [
+    "login", "report", "invoice", "dashboard", "search", "export", "cache",
+    "payment", "profile", "migration", "api", "billing", "email", "upload",
+]
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-generate a synthetic dataset (positions, teams, workers, projects, "
+        "tasks and assignments) for benchmarking."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--scale",
+            type=int,
+            help="Number of tasks; every other count is derived from it "
+            "unless passed explicitly.",
+        )
+        parser.add_argument("--tasks", type=int)
+        parser.add_argument("--workers", type=int)
+        parser.add_argument("--teams", type=int)
+        parser.add_argument("--projects", type=int)
+        parser.add_argument("--assignments-per-task", type=int, default=2)
+        parser.add_argument("--completed-ratio", type=float, default=0.4)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        scale = options["scale"] or options["tasks"] or 1000
+        counts = {
+            "tasks": options["tasks"] or scale,
+            "workers": options["workers"] or max(scale // 10, 10),
+            "teams": options["teams"] or max(scale // 1000, 2),
+            "projects": options["projects"] or max(scale // 100, 2),
+        }
+        self.random = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.run_id = secrets.token_hex(3)
+        self.today = datetime.date.today()
+
+        with transaction.atomic():
+            positions = self.create_positions()
+            tags = [TaskType.objects.get_or_create(name=name)[0] for name in TASK_TYPES]
+            managers = self.create_workers(
+                counts["teams"] + counts["projects"], [positions["ProjectManager"]]
+            )
+            teams = self.create_teams(counts["teams"], managers)
+            workers = self.create_workers(
+                counts["workers"],
+                [positions[name] for name in POSITIONS],
+                teams=teams,
+            )
+            projects = self.create_projects(counts["projects"], managers)
+            self.create_tasks(
+                counts["tasks"],
+                tags,
+                projects,
+                workers,
+                options["assignments_per_task"],
+                options["completed_ratio"],
+            )
+
+        call_command("repair_counters", stdout=self.stdout)
+        # The dashboard's best team is read from the leaderboard
+        call_command("recompute_leaderboard", stdout=self.stdout)
+        call_command("rebuild_dashboard_stats", stdout=self.stdout)
+        call_command("rebuild_search_index", stdout=self.stdout)
+        # Burndown history over the span of the generated completions
+        call_command("snapshot_projects", days=60, stdout=self.stdout)
+        self.stdout.write(
+            self.style.SUCCESS(
+                "Generated " + ", ".join(f"{n} {k}" for k, n in counts.items())
+            )
+        )
+
+    def create_positions(self) -> dict[str, Position]:
+        return {
+            name: Position.objects.get_or_create(name=name)[0]
+            for name in ["ProjectManager", *POSITIONS]
+        }
+
+    def create_workers(
+        self, count: int, positions: list[Position], teams: list[Team] = None
+    ) -> list[Worker]:
+        created = []
+        prefix = f"bench-{self.run_id}-{positions[0].name.lower()}"
+
+        def build() -> Iterator[Worker]:
+            for i in range(count):
+                team = self.random.choice(teams) if teams else None
+                yield Worker(
+                    username=f"{prefix}-{i}",
+                    email=f"{prefix}-{i}@example.com",
+                    password="!",  # unusable password
+                    first_name=self.random.choice(FIRST_NAMES),
+                    last_name=self.random.choice(LAST_NAMES),
+                    about=" ".join(self.random.sample(WORDS, 4)),
+                    salary=self.random.randrange(500, 5000, 50),
+                    hire_date=self.today - datetime.timedelta(days=i % 900),
+                    position=self.random.choice(positions),
+                    status=Worker.IN_TEAM if team else Worker.FREE_AGENT,
+                    team=team,
+                )
+
+        for batch in batched(build(), self.batch_size):
+            created.extend(Worker.objects.bulk_create(batch))
+
+        if teams:
+            memberships = (
+                Team.members.through(team_id=worker.team_id, worker_id=worker.pk)
+                for worker in created
+            )
+            for batch in batched(memberships, self.batch_size):
+                Team.members.through.objects.bulk_create(batch)
+        return created
+
+    def create_teams(self, count: int, managers: list[Worker]) -> list[Team]:
+        return Team.objects.bulk_create(
+            Team(
+                name=f"Team {self.run_id}-{i}",
+                project_manager=managers[i % len(managers)],
+            )
+            for i in range(count)
+        )
+
+    def create_projects(self, count: int, managers: list[Worker]) -> list[Project]:
+        return Project.objects.bulk_create(
+            Project(
+                name=f"Project {self.run_id}-{i}",
+                description=" ".join(self.random.sample(WORDS, 6)),
+                manager=managers[i % len(managers)],
+                start_date=self.today,
+                deadline=self.today + datetime.timedelta(days=30 + i % 300),
+            )
+            for i in range(count)
+        )
+
+    def create_tasks(
+        self,
+        count: int,
+        tags: list[TaskType],
+        projects: list[Project],
+        workers: list[Worker],
+        assignments_per_task: int,
+        completed_ratio: float,
+    ) -> None:
+        now = timezone.now()
+
+        def build() -> Iterator[Task]:
+            for i in range(count):
+                is_completed = self.random.random() < completed_ratio
+                completed_at = (
+                    now - datetime.timedelta(hours=self.random.randint(1, 24 * 60))
+                    if is_completed
+                    else None
+                )
+                yield Task(
+                    title=" ".join(self.random.sample(WORDS, 3)).capitalize(),
+                    description=" ".join(self.random.sample(WORDS, 8)),
+                    deadline=self.today
+                    + datetime.timedelta(days=self.random.randint(-30, 90)),
+                    is_completed=is_completed,
+                    created_at=(completed_at or now)
+                    - datetime.timedelta(hours=self.random.randint(1, 24 * 14)),
+                    completed_at=completed_at,
+                    priority=self.random.choice(Task.PRIORITY_CHOICES)[0],
+                    tag=self.random.choice(tags),
+                    project=self.random.choice(projects),
+                )
+
+        per_task = min(assignments_per_task, len(workers))
+        for batch in batched(build(), self.batch_size):
+            tasks = Task.objects.bulk_create(batch)
+            assignments = TaskAssignment.objects.bulk_create(
+                TaskAssignment(task=task, assignee=assignee)
+                for task in tasks
+                for assignee in self.random.sample(workers, per_task)
+            )
+            AssignmentEvent.objects.bulk_create(
+                self.build_events(assignments), batch_size=self.batch_size
+            )
+
+    def build_events(
+        self, assignments: list[TaskAssignment]
+    ) -> Iterator[AssignmentEvent]:
+        """Assigned when the task was created, then completed."""
+        for assignment in assignments:
+            task, worker_id = assignment.task, assignment.assignee_id
+            yield history.event(
+                AssignmentEvent.ASSIGNED, task.pk, worker_id, task.created_at
+            )
+            if task.completed_at:
+                yield history.event(
+                    AssignmentEvent.COMPLETED, task.pk, worker_id, task.completed_at
+                )
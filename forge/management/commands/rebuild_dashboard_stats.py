@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from forge.dashboard import rebuild_dashboard_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized home page counters from scratch."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = rebuild_dashboard_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Dashboard rebuilt: {stats.num_users} users, "
+                f"{stats.tasks_overall} tasks, {stats.teams} teams."
+            )
+        )
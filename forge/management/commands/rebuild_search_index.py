@@ -0,0 +1,15 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from forge.search import SEARCH_FIELDS, get_search_backend
+
+
+class Command(BaseCommand):
+    help = "Repopulate the full-text search index, e.g. after bulk imports."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        backend = get_search_backend()
+        for model in SEARCH_FIELDS:
+            backend.rebuild(model)
+            self.stdout.write(f"Rebuilt search index for {model._meta.label}.")
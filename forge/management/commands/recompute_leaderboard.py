@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from forge.leaderboard import recompute_leaderboard
+from forge.models import LeaderboardEntry
+
+
+class Command(BaseCommand):
+    help = "Recompute every team and worker leaderboard row from scratch."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        recompute_leaderboard()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Leaderboard rebuilt: {LeaderboardEntry.objects.count()} entries."
+            )
+        )
@@ -0,0 +1,18 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from forge.counters import repair_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute Task.worker_count and the Project task counters."
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        drifted = repair_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Counters repaired: {drifted['tasks']} task(s), "
+                f"{drifted['projects']} project(s) had drifted."
+            )
+        )
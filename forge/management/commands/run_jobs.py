@@ -0,0 +1,51 @@
+import os
+import socket
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from forge.jobs import release_stale_jobs, run_pending, schedule_periodic
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs and schedule the periodic ones. Start as many "
+        "of these processes as needed, a job is only ever claimed by one of them."
+    )
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Drain the due jobs and exit."
+        )
+        parser.add_argument("--batch", type=int, default=10)
+        parser.add_argument(
+            "--sleep", type=float, default=5.0, help="Seconds to wait when idle."
+        )
+        parser.add_argument(
+            "--no-schedule",
+            action="store_true",
+            help="Only run jobs, leave scheduling to another process.",
+        )
+        parser.add_argument(
+            "--worker-id", default=f"{socket.gethostname()}:{os.getpid()}"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        worker_id = options["worker_id"]
+        self.stdout.write(f"Job worker {worker_id} started.")
+        processed = 0
+        try:
+            while True:
+                if not options["no_schedule"]:
+                    schedule_periodic()
+                release_stale_jobs()
+                count = run_pending(worker_id, options["batch"])
+                processed += count
+                if not count:
+                    if options["once"]:
+                        break
+                    time.sleep(options["sleep"])
+        except KeyboardInterrupt:
+            pass
+        self.stdout.write(self.style.SUCCESS(f"Processed {processed} job(s)."))
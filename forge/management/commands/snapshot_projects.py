@@ -0,0 +1,30 @@
+import datetime
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from forge.analytics import take_snapshots
+
+
+class Command(BaseCommand):
+    help = "Store today's project task counts, and rebuild those of past days."
+
+    def add_arguments(self, parser: Any) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=1,
+            help="Number of days up to today to (re)build snapshots for.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        today = timezone.localdate()
+        days = max(options["days"], 1)
+        stored = sum(
+            take_snapshots(today - datetime.timedelta(days=offset))
+            for offset in range(days)
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Stored {stored} snapshot(s) over {days} day(s).")
+        )
@@ -0,0 +1,316 @@
+import json
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, ContextManager, Iterator, Optional
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject
+
+from forge.roles import resolve_role
+from forge.routers import ReplicaState, replica_state
+
+logger = logging.getLogger("forge.queries")
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def query_budget(limit: int) -> Callable:
+    """Declare the maximum number of queries a function view may run."""
+
+    def decorator(view_func: Callable) -> Callable:
+        view_func.query_budget = limit
+        return view_func
+
+    return decorator
+
+
+def read_from_replica(view_func: Callable) -> Callable:
+    """Let a read-only function view query the read replicas."""
+    view_func.read_from_replica = True
+    return view_func
+
+
+class StreamingBody:
+    """Body of a streaming response, read with ``context()`` entered.
+
+    A streaming body is read after the middleware returned, so per-request
+    state has to be set up again around every chunk. ``on_close`` runs once,
+    at the end of the body or when the response is closed before that. Errors
+    it raises at the end reach the reader, ``HttpResponse.close()`` would
+    swallow them.
+    """
+
+    def __init__(
+        self,
+        content: Iterator[bytes],
+        context: Callable[[], ContextManager],
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.content = iter(content)
+        self.context = context
+        self.on_close = on_close
+
+    def __iter__(self) -> "StreamingBody":
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            with self.context():
+                return next(self.content)
+        except StopIteration:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        on_close, self.on_close = self.on_close, None
+        if on_close is not None:
+            on_close()
+
+
+class QueryRecorder:
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.slowest_duration = 0.0
+        self.slowest_sql = None
+
+    def __call__(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: dict
+    ) -> Any:
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.count += 1
+            self.duration += elapsed
+            if elapsed >= self.slowest_duration:
+                self.slowest_duration = elapsed
+                self.slowest_sql = sql
+
+
+class QueryInstrumentationMiddleware:
+    """Record query count, DB time and the slowest statement of every request.
+
+    The numbers go out as a ``Server-Timing`` header and a JSON log line on the
+    ``forge.queries`` logger. Views declare a ``query_budget`` (class attribute
+    or :func:`query_budget`), going over it logs a warning, or raises
+    :class:`QueryBudgetExceeded` when ``QUERY_BUDGET_RAISE`` is on, as it is
+    under ``manage.py test``.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        recorder = QueryRecorder()
+        request.query_budget = None
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            self.install(stack, recorder)
+            response = self.get_response(request)
+        return self.finish(request, response, recorder, start)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        recorder = QueryRecorder()
+        request.query_budget = None
+        start = time.perf_counter()
+        # Connections are per thread: the wrappers go onto the connections of
+        # the thread-sensitive executor every async ORM call of the request runs in.
+        stack = ExitStack()
+        await sync_to_async(self.install)(stack, recorder)
+        try:
+            response = await self.get_response(request)
+        finally:
+            await sync_to_async(stack.close)()
+        return self.finish(request, response, recorder, start)
+
+    def install(self, stack: ExitStack, recorder: QueryRecorder) -> None:
+        for alias in connections:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        recorder: QueryRecorder,
+        start: float,
+    ) -> HttpResponse:
+        if response.streaming:
+            # Exports query while the body is read, on the thread reading it.
+            # Headers are sent before that, so there is no Server-Timing.
+            @contextmanager
+            def recording() -> Iterator[None]:
+                with ExitStack() as stack:
+                    self.install(stack, recorder)
+                    yield
+
+            response.streaming_content = StreamingBody(
+                response.streaming_content,
+                recording,
+                lambda: self.report(
+                    request, response, recorder, time.perf_counter() - start
+                ),
+            )
+            return response
+
+        total = time.perf_counter() - start
+        response["Server-Timing"] = (
+            f'db;dur={recorder.duration * 1000:.1f};desc="{recorder.count} queries", '
+            f"total;dur={total * 1000:.1f}"
+        )
+        self.report(request, response, recorder, total)
+        return response
+
+    def report(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        recorder: QueryRecorder,
+        total: float,
+    ) -> None:
+        match = getattr(request, "resolver_match", None)
+        view_name = match.view_name if match else None
+        logger.info(
+            json.dumps(
+                {
+                    "view": view_name,
+                    "path": request.path,
+                    "status": response.status_code,
+                    "queries": recorder.count,
+                    "db_ms": round(recorder.duration * 1000, 2),
+                    "total_ms": round(total * 1000, 2),
+                    "slowest_ms": round(recorder.slowest_duration * 1000, 2),
+                    "slowest_sql": (recorder.slowest_sql or "")[:500],
+                }
+            )
+        )
+
+        budget = request.query_budget
+        if budget is not None and recorder.count > budget:
+            message = (
+                f"{view_name} ran {recorder.count} queries, budget is {budget}. "
+                f"Slowest: {recorder.slowest_sql}"
+            )
+            if getattr(settings, "QUERY_BUDGET_RAISE", False):
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+
+    def process_view(
+        self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any
+    ) -> None:
+        view_class = getattr(view_func, "view_class", None)
+        request.query_budget = getattr(
+            view_class, "query_budget", getattr(view_func, "query_budget", None)
+        )
+
+
+class RoleMiddleware:
+    """Attach the user's :class:`~forge.roles.Role` as ``request.role``.
+
+    Resolved lazily, once per request, so anonymous pages never pay for it.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        # Returns the coroutine of an async get_response as is
+        request.role = SimpleLazyObject(lambda: resolve_role(request.user))
+        return self.get_response(request)
+
+
+class ReplicaRoutingMiddleware:
+    """Route the reads of views marked ``read_from_replica`` to a replica.
+
+    A request that may have written (any unsafe method) sets a cookie that keeps
+    the user's reads on the primary for ``REPLICA_STICKY_SECONDS``, long enough
+    for the replicas to catch up, so users always see their own writes.
+    """
+
+    sync_capable = True
+    async_capable = True
+    cookie_name = "forge_primary"
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        token = self.start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            replica_state.reset(token)
+        return self.finish(request, response)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        # sync_to_async copies the context, the ORM calls in worker threads see
+        # the same state object
+        token = self.start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            replica_state.reset(token)
+        return self.finish(request, response)
+
+    def start(self, request: HttpRequest) -> Any:
+        request.replica_state = ReplicaState(sticky=self.cookie_name in request.COOKIES)
+        return replica_state.set(request.replica_state)
+
+    def finish(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        if response.streaming:
+            # The body is read after the state was reset above
+            @contextmanager
+            def routing() -> Iterator[None]:
+                token = replica_state.set(request.replica_state)
+                try:
+                    yield
+                finally:
+                    replica_state.reset(token)
+
+            response.streaming_content = StreamingBody(
+                response.streaming_content, routing
+            )
+        if request.method not in ("GET", "HEAD", "OPTIONS", "TRACE"):
+            response.set_cookie(
+                self.cookie_name,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(
+        self, request: HttpRequest, view_func: Callable, view_args: Any, view_kwargs: Any
+    ) -> None:
+        view_class = getattr(view_func, "view_class", None)
+        request.replica_state.use_replica = getattr(
+            view_class,
+            "read_from_replica",
+            getattr(view_func, "read_from_replica", False),
+        )
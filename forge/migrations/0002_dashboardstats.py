@@ -0,0 +1,39 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DashboardStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("num_users", models.PositiveIntegerField(default=0)),
+                ("num_workers", models.PositiveIntegerField(default=0)),
+                ("tasks_overall", models.PositiveIntegerField(default=0)),
+                ("tasks_done", models.PositiveIntegerField(default=0)),
+                ("teams", models.PositiveIntegerField(default=0)),
+                ("best_team", models.CharField(blank=True, max_length=110, null=True)),
+                ("max_tasks_done", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "verbose_name": "dashboard stats",
+                "verbose_name_plural": "dashboard stats",
+            },
+        ),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+# Kept in step with forge.search.SEARCH_FIELDS and PostgresSearchBackend.vector.
+SEARCH_FIELDS = {
+    "Task": ("title", "description"),
+    "Worker": ("first_name", "last_name", "username", "email", "about"),
+}
+
+
+def create_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for model_name, fields in SEARCH_FIELDS.items():
+        model = apps.get_model("forge", model_name)
+        table = model._meta.db_table
+        if vendor == "sqlite":
+            columns = ", ".join(fields)
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE {table}_fts USING fts5("
+                f"{columns}, tokenize='unicode61', prefix='2 3')"
+            )
+            schema_editor.execute(
+                f"INSERT INTO {table}_fts (rowid, {columns}) "
+                f"SELECT id, {columns} FROM {table}"
+            )
+        elif vendor == "postgresql":
+            from django.contrib.postgres.indexes import GinIndex
+            from django.contrib.postgres.search import SearchVector
+
+            vector = SearchVector(fields[0], weight="A", config="simple") + (
+                SearchVector(*fields[1:], weight="B", config="simple")
+            )
+            schema_editor.add_index(
+                model, GinIndex(vector, name=f"{table}_search_gin")
+            )
+
+
+def drop_search_indexes(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for model_name in SEARCH_FIELDS:
+        table = apps.get_model("forge", model_name)._meta.db_table
+        if vendor == "sqlite":
+            schema_editor.execute(f"DROP TABLE IF EXISTS {table}_fts")
+        elif vendor == "postgresql":
+            schema_editor.execute(f"DROP INDEX IF EXISTS {table}_search_gin")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("forge", "0002_dashboardstats"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
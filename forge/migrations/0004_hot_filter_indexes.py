@@ -0,0 +1,61 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0003_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["manager", "is_completed"], name="project_manager_done_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                fields=["is_completed", "project"], name="task_completed_project_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["priority", "id"], name="task_priority_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["title", "id"], name="task_title_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(
+                condition=models.Q(("is_completed", False)),
+                fields=["priority", "id"],
+                name="task_open_priority_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="taskassignment",
+            index=models.Index(
+                fields=["assignee", "task"], name="assignment_assignee_task_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(fields=["status"], name="worker_status_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="worker",
+            index=models.Index(
+                fields=["position", "team"], name="worker_position_team_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:06
+
+from django.db import migrations
+import forge.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0004_hot_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterModelManagers(
+            name="worker",
+            managers=[
+                ("objects", forge.models.WorkerManager()),
+            ],
+        ),
+    ]
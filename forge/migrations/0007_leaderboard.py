@@ -0,0 +1,85 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0006_jobs_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="task",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name="LeaderboardEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("tasks_done", models.PositiveIntegerField(default=0)),
+                ("done_7d", models.PositiveIntegerField(default=0)),
+                ("done_30d", models.PositiveIntegerField(default=0)),
+                ("tasks_open", models.PositiveIntegerField(default=0)),
+                ("tasks_overdue", models.PositiveIntegerField(default=0)),
+                (
+                    "team",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="forge.team",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.OneToOneField(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "leaderboard entries",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(fields=["-tasks_done"], name="leaderboard_done_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(fields=["-done_7d"], name="leaderboard_done_7d_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="leaderboardentry",
+            index=models.Index(fields=["-done_30d"], name="leaderboard_done_30d_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="leaderboardentry",
+            constraint=models.CheckConstraint(
+                check=models.Q(
+                    models.Q(("team__isnull", False), ("worker__isnull", True)),
+                    models.Q(("team__isnull", True), ("worker__isnull", False)),
+                    _connector="OR",
+                ),
+                name="leaderboard_team_xor_worker",
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 4.1.7 on 2026-10-18 17:58
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(model, group_by, **filters):
+    subquery = (
+        model.objects.filter(**{group_by: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(group_by)
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return Coalesce(Subquery(subquery), Value(0), output_field=IntegerField())
+
+
+def fill_counters(apps, schema_editor):
+    Task = apps.get_model("forge", "Task")
+    Project = apps.get_model("forge", "Project")
+    TaskAssignment = apps.get_model("forge", "TaskAssignment")
+    Task.objects.update(worker_count=_count(TaskAssignment, "task"))
+    Project.objects.update(
+        tasks_total=_count(Task, "project"),
+        tasks_done=_count(Task, "project", is_completed=True),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0007_leaderboard"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="tasks_done",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="tasks_total",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="task",
+            name="worker_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
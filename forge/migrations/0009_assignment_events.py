@@ -0,0 +1,110 @@
+# Generated by Django 4.1.7 on 2026-10-18 18:08
+
+import datetime
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.utils import timezone
+
+
+def backfill_events(apps, schema_editor):
+    """Start the history from the current assignments and completions."""
+    TaskAssignment = apps.get_model("forge", "TaskAssignment")
+    AssignmentEvent = apps.get_model("forge", "AssignmentEvent")
+
+    def event(kind, assignment, at):
+        return AssignmentEvent(
+            task_id=assignment.task_id,
+            worker_id=assignment.assignee_id,
+            kind=kind,
+            created_at=at,
+            month=timezone.localdate(at).replace(day=1),
+        )
+
+    events = []
+    assignments = TaskAssignment.objects.select_related("task").only(
+        "task_id", "assignee_id", "assigned_date", "task__completed_at"
+    )
+    for assignment in assignments.iterator(chunk_size=2000):
+        assigned_at = timezone.make_aware(
+            datetime.datetime.combine(assignment.assigned_date, datetime.time.min)
+        )
+        events.append(event(1, assignment, assigned_at))
+        if assignment.task.completed_at is not None:
+            events.append(event(3, assignment, assignment.task.completed_at))
+        if len(events) >= 2000:
+            AssignmentEvent.objects.bulk_create(events)
+            events = []
+    AssignmentEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0008_task_project_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AssignmentEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "Assigned"),
+                            (2, "Unassigned"),
+                            (3, "Completed"),
+                            (4, "Reopened"),
+                        ]
+                    ),
+                ),
+                ("created_at", models.DateTimeField(default=django.utils.timezone.now)),
+                ("month", models.DateField(editable=False)),
+                (
+                    "task",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to="forge.task",
+                    ),
+                ),
+                (
+                    "worker",
+                    models.ForeignKey(
+                        db_constraint=False,
+                        db_index=False,
+                        on_delete=django.db.models.deletion.DO_NOTHING,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="assignmentevent",
+            index=models.Index(fields=["worker", "created_at"], name="event_worker_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="assignmentevent",
+            index=models.Index(fields=["task", "created_at"], name="event_task_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="assignmentevent",
+            index=models.Index(fields=["month", "kind"], name="event_month_kind_idx"),
+        ),
+        migrations.RunPython(backfill_events, migrations.RunPython.noop),
+    ]
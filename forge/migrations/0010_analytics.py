@@ -0,0 +1,85 @@
+# Generated by Django 4.1.7 on 2026-10-18 18:13
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db.models import Min, OuterRef, Subquery
+
+
+def fill_created_at(apps, schema_editor):
+    Task = apps.get_model("forge", "Task")
+    AssignmentEvent = apps.get_model("forge", "AssignmentEvent")
+    first_assigned = (
+        AssignmentEvent.objects.filter(task_id=OuterRef("pk"))
+        .order_by()
+        .values("task_id")
+        .annotate(first=Min("created_at"))
+        .values("first")
+    )
+    Task.objects.update(created_at=Subquery(first_assigned))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("forge", "0009_assignment_events"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProjectSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("tasks_total", models.PositiveIntegerField(default=0)),
+                ("tasks_done", models.PositiveIntegerField(default=0)),
+                ("tasks_overdue", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="completed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        # Existing tasks get the time of their first assignment, if they have one
+        migrations.AddField(
+            model_name="task",
+            name="created_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(fill_created_at, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="task",
+            name="created_at",
+            field=models.DateTimeField(
+                blank=True, default=django.utils.timezone.now, editable=False, null=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["completed_at"], name="task_completed_at_idx"),
+        ),
+        migrations.AddField(
+            model_name="projectsnapshot",
+            name="project",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="snapshots",
+                to="forge.project",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="projectsnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("project", "day"), name="unique_project_snapshot_day"
+            ),
+        ),
+    ]
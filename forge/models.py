@@ -5,9 +5,11 @@ import datetime
 from django.contrib.auth.base_user import BaseUserManager
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager as AuthUserManager
 from django.db import models
+from django.db.models import Count, Q
 from django.urls import reverse
+from django.utils import timezone
 
 
 class UserManager(BaseUserManager):
@@ -28,6 +30,67 @@ class UserManager(BaseUserManager):
         return self.create_user(email, password, **extra_fields)
 
 
+class WorkerQuerySet(models.QuerySet):
+    def for_labels(self) -> WorkerQuerySet:
+        """Only the columns ``Worker.__str__`` renders, for choice fields."""
+        return self.select_related("position").only(*WORKER_LABEL_FIELDS)
+
+    def with_task_stats(self) -> WorkerQuerySet:
+        """Annotate done/open/overdue task counts in one grouped query."""
+        open_tasks = Q(tasks__is_completed=False)
+        return self.annotate(
+            tasks_done=Count(
+                "tasks", filter=Q(tasks__is_completed=True), distinct=True
+            ),
+            tasks_open=Count("tasks", filter=open_tasks, distinct=True),
+            tasks_overdue=Count(
+                "tasks",
+                filter=open_tasks & Q(tasks__deadline__lt=timezone.localdate()),
+                distinct=True,
+            ),
+        )
+
+
+WORKER_LABEL_FIELDS = ("username", "first_name", "last_name", "email", "position__name")
+
+
+class WorkerManager(AuthUserManager.from_queryset(WorkerQuerySet)):
+    pass
+
+
+class CounterFieldsMixin:
+    """Leave ``counter_fields`` out of saves of existing rows.
+
+    They are only ever changed with F() updates, a full save of an instance
+    loaded before such an update would write the stale value back.
+    """
+
+    counter_fields: tuple[str, ...] = ()
+
+    def save(self, *args, **kwargs) -> None:
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class CompletedAtMixin:
+    """Stamp ``completed_at`` when ``is_completed`` is set, clear it when not."""
+
+    def save(self, *args, **kwargs) -> None:
+        if not self.is_completed:
+            self.completed_at = None
+        elif self.completed_at is None:
+            self.completed_at = timezone.now()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "is_completed" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "completed_at"}
+        super().save(*args, **kwargs)
+
+
 class TaskType(models.Model):
     name = models.CharField(max_length=255)
 
@@ -35,7 +98,7 @@ class TaskType(models.Model):
         return self.name
 
 
-class Task(models.Model):
+class Task(CompletedAtMixin, CounterFieldsMixin, models.Model):
     PRIORITY_CHOICES = (
         ("1", "Urgent"),
         ("2", "High"),
@@ -48,10 +111,17 @@ class Task(models.Model):
         validators=[MinValueValidator(limit_value=datetime.date.today)]
     )
     is_completed = models.BooleanField(default=False)
+    # Null for tasks created before it was recorded
+    created_at = models.DateTimeField(
+        default=timezone.now, null=True, blank=True, editable=False
+    )
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
     priority = models.CharField(max_length=1, choices=PRIORITY_CHOICES, blank=False)
     workers = models.ManyToManyField(
         "Worker", related_name="tasks", through="TaskAssignment"
     )
+    # Maintained by forge.signals, repaired by `manage.py repair_counters`
+    worker_count = models.PositiveIntegerField(default=0, editable=False)
     tag = models.ForeignKey(
         TaskType,
         on_delete=models.CASCADE,
@@ -65,8 +135,24 @@ class Task(models.Model):
         blank=True,
     )
 
+    counter_fields = ("worker_count",)
+
     class Meta:
         ordering = ["priority"]
+        indexes = [
+            models.Index(
+                fields=["is_completed", "project"], name="task_completed_project_idx"
+            ),
+            models.Index(fields=["priority", "id"], name="task_priority_idx"),
+            models.Index(fields=["deadline", "id"], name="task_deadline_idx"),
+            models.Index(fields=["title", "id"], name="task_title_idx"),
+            models.Index(fields=["completed_at"], name="task_completed_at_idx"),
+            models.Index(
+                fields=["priority", "id"],
+                condition=models.Q(is_completed=False),
+                name="task_open_priority_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.title
@@ -80,6 +166,11 @@ class TaskAssignment(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["assignee", "task"], name="assignment_assignee_task_idx"),
+        ]
+
     def __str__(self) -> str:
         return (
             f"{self.assignee.username} assigned "
@@ -120,9 +211,15 @@ class Worker(AbstractUser):
         related_name="assignees",
     )
 
+    objects = WorkerManager()
+
     class Meta:
         verbose_name = "worker"
         verbose_name_plural = "workers"
+        indexes = [
+            models.Index(fields=["status"], name="worker_status_idx"),
+            models.Index(fields=["position", "team"], name="worker_position_team_idx"),
+        ]
 
     def get_absolute_url(self) -> str:
         return reverse("forge:worker-detail", kwargs={"pk": self.pk})
@@ -157,19 +254,25 @@ class Team(models.Model):
         super().clean()
 
 
-class Project(models.Model):
+class Project(CompletedAtMixin, CounterFieldsMixin, models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField()
     manager = models.ForeignKey(
         Worker, on_delete=models.CASCADE, related_name="projects"
     )
     is_completed = models.BooleanField(default=False)
+    completed_at = models.DateTimeField(null=True, blank=True, editable=False)
     start_date = models.DateField(
         validators=[MinValueValidator(limit_value=datetime.date.today)]
     )
     deadline = models.DateField(
         validators=[MinValueValidator(limit_value=datetime.date.today)]
     )
+    # Maintained by forge.signals, repaired by `manage.py repair_counters`
+    tasks_total = models.PositiveIntegerField(default=0, editable=False)
+    tasks_done = models.PositiveIntegerField(default=0, editable=False)
+
+    counter_fields = ("tasks_total", "tasks_done")
 
     class Meta:
         constraints = [
@@ -178,11 +281,271 @@ class Project(models.Model):
                 name="unique_project_and_manager",
             )
         ]
+        indexes = [
+            models.Index(
+                fields=["manager", "is_completed"], name="project_manager_done_idx"
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
+    @property
+    def progress(self) -> int:
+        """Percentage of the project's tasks that are completed."""
+        if not self.tasks_total:
+            return 0
+        return round(100 * self.tasks_done / self.tasks_total)
+
     def clean(self) -> None:
         if self.manager.position.name != "ProjectManager":
             raise ValidationError("Manager must have position of ProjectManager.")
         super().clean()
+
+
+class ProjectSnapshot(models.Model):
+    """A project's task counts at the end of a day, taken by forge.analytics."""
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="snapshots"
+    )
+    day = models.DateField()
+    tasks_total = models.PositiveIntegerField(default=0)
+    tasks_done = models.PositiveIntegerField(default=0)
+    tasks_overdue = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["project", "day"], name="unique_project_snapshot_day"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.project_id} on {self.day}: {self.tasks_done}/{self.tasks_total}"
+
+    @property
+    def tasks_remaining(self) -> int:
+        return self.tasks_total - self.tasks_done
+
+
+class DashboardStats(models.Model):
+    num_users = models.PositiveIntegerField(default=0)
+    num_workers = models.PositiveIntegerField(default=0)
+    tasks_overall = models.PositiveIntegerField(default=0)
+    tasks_done = models.PositiveIntegerField(default=0)
+    teams = models.PositiveIntegerField(default=0)
+    best_team = models.CharField(max_length=110, blank=True, null=True)
+    max_tasks_done = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "dashboard stats"
+        verbose_name_plural = "dashboard stats"
+
+    def __str__(self) -> str:
+        return f"Dashboard stats ({self.updated_at})"
+
+
+class LeaderboardEntryQuerySet(models.QuerySet):
+    def teams(self) -> LeaderboardEntryQuerySet:
+        return self.filter(team__isnull=False).select_related("team")
+
+    def workers(self) -> LeaderboardEntryQuerySet:
+        return self.filter(worker__isnull=False).select_related("worker")
+
+
+class LeaderboardEntry(models.Model):
+    """Task counts of one team or one worker, maintained by forge.leaderboard."""
+
+    team = models.OneToOneField(
+        Team, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    worker = models.OneToOneField(
+        Worker, on_delete=models.CASCADE, null=True, blank=True, related_name="+"
+    )
+    tasks_done = models.PositiveIntegerField(default=0)
+    # Tasks completed within the last 7 and 30 days
+    done_7d = models.PositiveIntegerField(default=0)
+    done_30d = models.PositiveIntegerField(default=0)
+    tasks_open = models.PositiveIntegerField(default=0)
+    tasks_overdue = models.PositiveIntegerField(default=0)
+
+    objects = LeaderboardEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "leaderboard entries"
+        constraints = [
+            models.CheckConstraint(
+                check=Q(team__isnull=False, worker__isnull=True)
+                | Q(team__isnull=True, worker__isnull=False),
+                name="leaderboard_team_xor_worker",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["-tasks_done"], name="leaderboard_done_idx"),
+            models.Index(fields=["-done_7d"], name="leaderboard_done_7d_idx"),
+            models.Index(fields=["-done_30d"], name="leaderboard_done_30d_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.team or self.worker}: {self.tasks_done} done"
+
+
+class Job(models.Model):
+    QUEUED = 0
+    RUNNING = 1
+    DONE = 2
+    FAILED = 3
+    STATUS_CHOICES = (
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    )
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Set for scheduled runs, so concurrent schedulers enqueue a slot once
+    key = models.CharField(max_length=150, unique=True, null=True, blank=True)
+    status = models.PositiveSmallIntegerField(choices=STATUS_CHOICES, default=QUEUED)
+    run_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_at"], name="job_status_run_at_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class Notification(models.Model):
+    DEADLINE_SOON = "deadline_soon"
+    TASK_OVERDUE = "task_overdue"
+    PROJECT_OVERDUE = "project_overdue"
+    KIND_CHOICES = (
+        (DEADLINE_SOON, "Deadline soon"),
+        (TASK_OVERDUE, "Task overdue"),
+        (PROJECT_OVERDUE, "Project overdue"),
+    )
+
+    worker = models.ForeignKey(
+        Worker, on_delete=models.CASCADE, related_name="notifications"
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True)
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, null=True, blank=True
+    )
+    message = models.CharField(max_length=255)
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        constraints = [
+            # One notification of a kind per object, so sweeps can re-run
+            models.UniqueConstraint(
+                fields=["worker", "kind", "task"],
+                condition=Q(task__isnull=False),
+                name="unique_task_notification",
+            ),
+            models.UniqueConstraint(
+                fields=["worker", "kind", "project"],
+                condition=Q(project__isnull=False),
+                name="unique_project_notification",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["worker", "read_at"], name="notification_unread_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return self.message
+
+
+def month_start(moment: datetime.datetime) -> datetime.date:
+    """First day of the local month of ``moment``, AssignmentEvent.month."""
+    return timezone.localdate(moment).replace(day=1)
+
+
+class AssignmentEventQuerySet(models.QuerySet):
+    def between(
+        self,
+        start: datetime.datetime | None = None,
+        end: datetime.datetime | None = None,
+    ) -> AssignmentEventQuerySet:
+        """Events in ``[start, end)``.
+
+        Also bounded on ``month``, so only the matching months are scanned.
+        """
+        queryset = self
+        if start is not None:
+            queryset = queryset.filter(
+                month__gte=month_start(start), created_at__gte=start
+            )
+        if end is not None:
+            queryset = queryset.filter(month__lte=month_start(end), created_at__lt=end)
+        return queryset
+
+
+class AssignmentEvent(models.Model):
+    """Append-only assignment history, written by forge.history."""
+
+    ASSIGNED = 1
+    UNASSIGNED = 2
+    COMPLETED = 3
+    REOPENED = 4
+    KIND_CHOICES = (
+        (ASSIGNED, "Assigned"),
+        (UNASSIGNED, "Unassigned"),
+        (COMPLETED, "Completed"),
+        (REOPENED, "Reopened"),
+    )
+
+    # No foreign key constraints: the history outlives deleted tasks and workers
+    task = models.ForeignKey(
+        Task,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    worker = models.ForeignKey(
+        Worker,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        db_index=False,
+        related_name="+",
+    )
+    kind = models.PositiveSmallIntegerField(choices=KIND_CHOICES)
+    created_at = models.DateTimeField(default=timezone.now)
+    # Partition key: rows of a month can be scanned, archived or dropped together
+    month = models.DateField(editable=False)
+
+    objects = AssignmentEventQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["worker", "created_at"], name="event_worker_idx"),
+            models.Index(fields=["task", "created_at"], name="event_task_idx"),
+            models.Index(fields=["month", "kind"], name="event_month_kind_idx"),
+        ]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.get_kind_display()}: task {self.task_id}, "
+            f"worker {self.worker_id} at {self.created_at}"
+        )
+
+    def save(self, *args, **kwargs) -> None:
+        self.month = month_start(self.created_at)
+        super().save(*args, **kwargs)
@@ -0,0 +1,180 @@
+import hashlib
+import math
+from typing import Any, Iterator
+
+from django.core import signing
+from django.core.cache import cache
+from django.db.models import F, Q, QuerySet
+from django.http import Http404
+from django.utils.functional import cached_property
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class KeysetPage:
+    def __init__(
+        self,
+        object_list: list,
+        paginator: "KeysetPaginator",
+        number: int,
+        next_cursor: str | None,
+        previous_cursor: str | None,
+    ) -> None:
+        self.object_list = object_list
+        self.paginator = paginator
+        self.number = number
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self) -> str:
+        return f"<Keyset page {self.number}>"
+
+    def __len__(self) -> int:
+        return len(self.object_list)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.object_list)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """Seek paginator keyed on the queryset's first ordering column plus ``pk``.
+
+    Pages are addressed by signed, opaque cursors instead of OFFSET, so deep
+    pages cost the same as the first one. The total is only an approximation
+    served from the cache, the exact COUNT(*) never runs per request.
+    """
+
+    is_keyset = True
+    cursor_salt = "forge.pagination.cursor"
+    count_cache_timeout = 300
+
+    def __init__(
+        self, object_list: QuerySet, per_page: int, ordering: str = None, **kwargs
+    ) -> None:
+        self.object_list = object_list
+        self.per_page = int(per_page)
+        self.field, self.descending = self._resolve_ordering(object_list, ordering)
+
+    @staticmethod
+    def _resolve_ordering(queryset: QuerySet, ordering: str = None) -> tuple[str, bool]:
+        if ordering is None:
+            order_by = queryset.query.order_by or queryset.model._meta.ordering
+            ordering = order_by[0] if order_by else "pk"
+        if not isinstance(ordering, str):
+            return "pk", False
+        descending = ordering.startswith("-")
+        field = ordering.lstrip("-")
+        return ("pk" if field == "id" else field), descending
+
+    @property
+    def signature(self) -> str:
+        return ("-" if self.descending else "") + self.field
+
+    def _ordered(self, reverse: bool = False) -> QuerySet:
+        descending = self.descending != reverse
+        keys = [self.field, "pk"] if self.field != "pk" else ["pk"]
+        order = [F(key).desc() if descending else F(key).asc() for key in keys]
+        queryset = self.object_list.order_by(*order)
+        if self.field != "pk":
+            queryset = queryset.annotate(keyset_value=F(self.field))
+        return queryset
+
+    def _seek(self, queryset: QuerySet, value: Any, pk: int, reverse: bool) -> QuerySet:
+        lookup = "lt" if self.descending != reverse else "gt"
+        if self.field == "pk":
+            return queryset.filter(**{f"pk__{lookup}": pk})
+        return queryset.filter(
+            Q(**{f"{self.field}__{lookup}": value})
+            | Q(**{self.field: value, f"pk__{lookup}": pk})
+        )
+
+    def _encode(self, obj: Any, number: int, direction: str) -> str:
+        value = getattr(obj, "keyset_value", None)
+        if value is not None and not isinstance(value, (int, float, str, bool)):
+            value = str(value)
+        return signing.dumps(
+            {"o": self.signature, "v": value, "pk": obj.pk, "n": number, "d": direction},
+            salt=self.cursor_salt,
+            compress=True,
+        )
+
+    def decode(self, cursor: str) -> dict:
+        try:
+            return signing.loads(cursor, salt=self.cursor_salt)
+        except signing.BadSignature:
+            raise InvalidCursor("Invalid pagination cursor.")
+
+    def page(self, cursor: str | None = None) -> KeysetPage:
+        state = self.decode(cursor) if cursor else None
+        if state is not None and state.get("o") != self.signature:
+            state = None  # the sort changed under the cursor, restart from the top
+
+        reverse = state is not None and state["d"] == "p"
+        queryset = self._ordered(reverse=reverse)
+        if state is not None:
+            queryset = self._seek(queryset, state["v"], state["pk"], reverse)
+
+        rows = list(queryset[: self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if reverse:
+            rows.reverse()
+
+        number = 1 if state is None else state["n"] + (-1 if reverse else 1)
+        number = max(number, 1)
+        has_next = has_more if not reverse else True
+        has_previous = (has_more if reverse else state is not None) and number > 1
+
+        return KeysetPage(
+            rows,
+            self,
+            number,
+            self._encode(rows[-1], number, "n") if rows and has_next else None,
+            self._encode(rows[0], number, "p") if rows and has_previous else None,
+        )
+
+    @cached_property
+    def count(self) -> int:
+        """Total number of rows, cached per distinct query."""
+        sql, params = self.object_list.query.sql_with_params()
+        digest = hashlib.md5(f"{sql}{params}".encode()).hexdigest()
+        key = f"forge:keyset-count:{digest}"
+        total = cache.get(key)
+        if total is None:
+            total = self.object_list.count()
+            cache.set(key, total, self.count_cache_timeout)
+        return total
+
+    @property
+    def num_pages(self) -> int:
+        return max(math.ceil(self.count / self.per_page), 1)
+
+
+class KeysetPaginationMixin:
+    """Swap a ``ListView``'s OFFSET pagination for :class:`KeysetPaginator`."""
+
+    paginator_class = KeysetPaginator
+    cursor_kwarg = "cursor"
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple:
+        paginator = self.get_paginator(queryset, page_size)
+        cursor = self.request.GET.get(self.cursor_kwarg)
+        try:
+            page = paginator.page(cursor)
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return paginator, page, page.object_list, page.has_other_pages()
@@ -0,0 +1,83 @@
+from typing import Any, Iterable, NamedTuple, Optional
+
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.http import HttpRequest
+
+from forge.models import Worker
+
+MANAGER_POSITION = "ProjectManager"
+ROLE_CACHE_PREFIX = "forge:role"
+
+
+class Role(NamedTuple):
+    user_id: Optional[int] = None
+    is_manager: bool = False
+    is_admin: bool = False
+
+    @property
+    def is_manager_or_admin(self) -> bool:
+        return self.is_manager or self.is_admin
+
+
+ANONYMOUS_ROLE = Role()
+
+
+def role_cache_key(user_id: int) -> str:
+    return f"{ROLE_CACHE_PREFIX}:{user_id}"
+
+
+def resolve_role(user: Any) -> Role:
+    """Compute the role flags of ``user``, cached per user id if enabled.
+
+    Only reads ``user.position`` when the cache misses, which costs nothing
+    for users loaded by :class:`RoleModelBackend`.
+    """
+    if user is None or not user.is_authenticated:
+        return ANONYMOUS_ROLE
+
+    timeout = getattr(settings, "ROLE_CACHE_TIMEOUT", 0)
+    key = role_cache_key(user.pk)
+    if timeout:
+        cached = cache.get(key)
+        if cached is not None:
+            return Role(*cached)
+
+    position = user.position
+    role = Role(
+        user_id=user.pk,
+        is_manager=position is not None and position.name == MANAGER_POSITION,
+        is_admin=user.is_superuser,
+    )
+    if timeout:
+        cache.set(key, tuple(role), timeout)
+    return role
+
+
+def get_role(request: HttpRequest) -> Role:
+    """Return the role attached by ``RoleMiddleware``, resolving it if absent."""
+    role = getattr(request, "role", None)
+    if role is None:
+        role = request.role = resolve_role(getattr(request, "user", None))
+    return role
+
+
+def invalidate_roles(user_ids: Iterable[int]) -> None:
+    cache.delete_many([role_cache_key(user_id) for user_id in user_ids])
+
+
+def user_is_manager_or_admin(user: Any) -> bool:
+    return resolve_role(user).is_manager_or_admin
+
+
+class RoleModelBackend(ModelBackend):
+    """Load the session user together with the relations templates read."""
+
+    def get_user(self, user_id: Any) -> Optional[Worker]:
+        user = (
+            Worker.objects.select_related("position", "team")
+            .filter(pk=user_id)
+            .first()
+        )
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,53 @@
+import random
+from contextvars import ContextVar
+from typing import Any, Optional, Type
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Model
+
+
+class ReplicaState:
+    """Per-request routing state, set up by ``ReplicaRoutingMiddleware``."""
+
+    def __init__(self, sticky: bool = False) -> None:
+        self.use_replica = False
+        # The user wrote recently and must read their own writes
+        self.sticky = sticky
+
+
+replica_state: ContextVar[Optional[ReplicaState]] = ContextVar(
+    "replica_state", default=None
+)
+
+
+class ReplicaRouter:
+    """Send reads of views marked ``read_from_replica`` to a replica.
+
+    Everything else, writes, reads inside a transaction and reads by users
+    inside their sticky-after-write window, goes to the primary.
+    """
+
+    def db_for_read(self, model: Type[Model], **hints: Any) -> Optional[str]:
+        replicas = getattr(settings, "DATABASE_REPLICAS", [])
+        state = replica_state.get()
+        if (
+            not replicas
+            or state is None
+            or not state.use_replica
+            or state.sticky
+            or model._meta.app_label == "sessions"
+            or connections["default"].in_atomic_block
+        ):
+            return "default"
+        return random.choice(replicas)
+
+    def db_for_write(self, model: Type[Model], **hints: Any) -> str:
+        return "default"
+
+    def allow_relation(self, obj1: Model, obj2: Model, **hints: Any) -> bool:
+        # Replicas mirror the primary, objects from any of them may relate
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        return db == "default"
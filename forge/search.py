@@ -0,0 +1,164 @@
+import re
+from functools import reduce
+from operator import and_, or_
+from typing import Any
+
+from django.db import connection
+from django.db.models import FloatField, Model, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from forge.models import Task, Worker
+
+SEARCH_FIELDS = {
+    Task: ("title", "description"),
+    Worker: ("first_name", "last_name", "username", "email", "about"),
+}
+
+TOKEN_RE = re.compile(r"\w+")
+MAX_TOKENS = 8
+
+
+def tokenize(query: str) -> list[str]:
+    return TOKEN_RE.findall((query or "").lower())[:MAX_TOKENS]
+
+
+class SearchBackend:
+    """Ranked prefix search over the columns listed in ``SEARCH_FIELDS``.
+
+    ``search`` annotates matches with ``search_rank`` and orders by it, an
+    explicit ``order_by`` afterwards still wins.
+    """
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        raise NotImplementedError
+
+    def update(self, instance: Model) -> None:
+        pass
+
+    def remove(self, instance: Model) -> None:
+        pass
+
+    def rebuild(self, model: type[Model]) -> None:
+        pass
+
+
+class ContainsSearchBackend(SearchBackend):
+    """Fallback for databases without a full-text engine."""
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        fields = SEARCH_FIELDS[queryset.model]
+        condition = reduce(
+            and_,
+            (
+                reduce(or_, (Q(**{f"{field}__icontains": token}) for field in fields))
+                for token in tokens
+            ),
+        )
+        return queryset.filter(condition).annotate(
+            search_rank=Value(1.0, output_field=FloatField())
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """``SearchVector`` matches served by the GIN indexes from migration 0003."""
+
+    config = "simple"
+
+    def vector(self, model: type[Model]) -> Any:
+        from django.contrib.postgres.search import SearchVector
+
+        fields = SEARCH_FIELDS[model]
+        return SearchVector(fields[0], weight="A", config=self.config) + SearchVector(
+            *fields[1:], weight="B", config=self.config
+        )
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        search_query = SearchQuery(
+            " & ".join(f"{token}:*" for token in tokens),
+            search_type="raw",
+            config=self.config,
+        )
+        vector = self.vector(queryset.model)
+        return (
+            queryset.annotate(search_document=vector)
+            .filter(search_document=search_query)
+            .annotate(search_rank=SearchRank(vector, search_query))
+            .order_by("-search_rank")
+        )
+
+
+class SqliteSearchBackend(SearchBackend):
+    """FTS5 shadow tables (``<table>_fts``) kept in sync by ``forge.signals``."""
+
+    @staticmethod
+    def fts_table(model: type[Model]) -> str:
+        return f"{model._meta.db_table}_fts"
+
+    def search(self, queryset: QuerySet, query: str) -> QuerySet:
+        tokens = tokenize(query)
+        if not tokens:
+            return queryset
+        match = " ".join(f'"{token}"*' for token in tokens)
+        table = queryset.model._meta.db_table
+        fts = self.fts_table(queryset.model)
+        fields = SEARCH_FIELDS[queryset.model]
+        weights = ", ".join(["10.0"] + ["1.0"] * (len(fields) - 1))
+        # Joined once: MATCH filters the join and bm25() reads the matched row,
+        # so ranking and keyset ordering don't re-run the query per row
+        return (
+            queryset.extra(
+                tables=[fts],
+                where=[f"{fts} MATCH %s", f'{fts}.rowid = "{table}"."id"'],
+                params=[match],
+            )
+            .annotate(
+                search_rank=RawSQL(
+                    f"-bm25({fts}, {weights})", [], output_field=FloatField()
+                )
+            )
+            .order_by("-search_rank")
+        )
+
+    def update(self, instance: Model) -> None:
+        fields = SEARCH_FIELDS[type(instance)]
+        fts = self.fts_table(type(instance))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {fts} WHERE rowid = %s", [instance.pk])
+            cursor.execute(
+                f"INSERT INTO {fts} (rowid, {', '.join(fields)}) "
+                f"VALUES (%s, {', '.join(['%s'] * len(fields))})",
+                [instance.pk, *(getattr(instance, field) for field in fields)],
+            )
+
+    def remove(self, instance: Model) -> None:
+        fts = self.fts_table(type(instance))
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {fts} WHERE rowid = %s", [instance.pk])
+
+    def rebuild(self, model: type[Model]) -> None:
+        columns = ", ".join(SEARCH_FIELDS[model])
+        fts = self.fts_table(model)
+        with connection.cursor() as cursor:
+            cursor.execute(f"DELETE FROM {fts}")
+            cursor.execute(
+                f"INSERT INTO {fts} (rowid, {columns}) "
+                f"SELECT id, {columns} FROM {model._meta.db_table}"
+            )
+
+
+BACKENDS = {
+    "postgresql": PostgresSearchBackend,
+    "sqlite": SqliteSearchBackend,
+}
+
+
+def get_search_backend() -> SearchBackend:
+    return BACKENDS.get(connection.vendor, ContainsSearchBackend)()
@@ -0,0 +1,423 @@
+import threading
+from collections import Counter
+from typing import Any, Iterable
+
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_save,
+    pre_delete,
+    pre_save,
+)
+from django.db.models import QuerySet
+from django.dispatch import Signal, receiver
+
+from forge.cache import bump
+from forge.counters import (
+    adjust_project_counts,
+    adjust_worker_counts,
+    count_projects,
+    recount_workers,
+)
+from forge import history, leaderboard
+from forge.dashboard import adjust_dashboard_stats, refresh_best_team
+from forge.models import (
+    AssignmentEvent,
+    Position,
+    Project,
+    Task,
+    TaskAssignment,
+    Team,
+    Worker,
+)
+from forge.roles import invalidate_roles
+from forge.search import SEARCH_FIELDS, get_search_backend
+
+# Sent by forge.bulk, whose QuerySet.update()/bulk_create() skip model signals.
+# tasks_completed: task_ids that just flipped to completed.
+# assignments_changed: added/removed lists of (task_id, worker_id) pairs.
+tasks_completed = Signal()
+assignments_changed = Signal()
+
+
+_pending = threading.local()
+
+
+def _schedule_best_team_refresh() -> None:
+    transaction.on_commit(refresh_best_team)
+
+
+def _refresh_pending_workers() -> None:
+    worker_ids, _pending.worker_ids = getattr(_pending, "worker_ids", set()), set()
+    if worker_ids:
+        leaderboard.refresh_workers(worker_ids)
+
+
+def _schedule_worker_refresh(worker_ids: Iterable[int]) -> None:
+    # Assignment receivers fire once per row. The ids are collected and the
+    # first callback to run at commit refreshes them all, the others find the
+    # set empty. Ids left over from a rollback are just refreshed once more.
+    if not hasattr(_pending, "worker_ids"):
+        _pending.worker_ids = set()
+    _pending.worker_ids.update(worker_ids)
+    transaction.on_commit(_refresh_pending_workers)
+    _schedule_best_team_refresh()
+
+
+def _deleted_in_batch(origin: Any) -> bool:
+    # Deletes through Task.workers.remove()/clear() and forge.bulk come from a
+    # TaskAssignment queryset. m2m_changed or assignments_changed report those
+    # rows at once, so the per-row post_delete receivers skip them.
+    return isinstance(origin, QuerySet) and origin.model is TaskAssignment
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender: Any, instance: Task, **kwargs) -> None:
+    instance._previous_state = (
+        Task.objects.filter(pk=instance.pk)
+        .values("is_completed", "deadline", "project_id")
+        .first()
+        if instance.pk
+        else None
+    )
+
+
+@receiver(post_save, sender=Task)
+def task_saved(sender: Any, instance: Task, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_previous_state", None)
+    if created:
+        adjust_dashboard_stats(tasks_overall=1, tasks_done=int(instance.is_completed))
+    elif previous:
+        completed = previous["is_completed"] != instance.is_completed
+        if completed:
+            adjust_dashboard_stats(tasks_done=1 if instance.is_completed else -1)
+        # record_completions() takes the overdue count from the new deadline,
+        # so a moved deadline recomputes the rows, which covers completion too
+        if previous["deadline"] != instance.deadline or (
+            completed and not instance.is_completed
+        ):
+            leaderboard.refresh_tasks([instance.pk])
+        elif completed:
+            leaderboard.record_completions([instance.pk])
+    _schedule_best_team_refresh()
+
+
+@receiver(post_delete, sender=Task)
+def task_deleted(sender: Any, instance: Task, **kwargs) -> None:
+    adjust_dashboard_stats(tasks_overall=-1, tasks_done=-int(instance.is_completed))
+    _schedule_best_team_refresh()
+
+
+@receiver(post_save, sender=TaskAssignment)
+@receiver(post_delete, sender=TaskAssignment)
+def assignment_changed(
+    sender: Any, instance: TaskAssignment, origin: Any = None, **kwargs
+) -> None:
+    if _deleted_in_batch(origin):
+        return
+    _schedule_worker_refresh([instance.assignee_id])
+
+
+@receiver(assignments_changed)
+def bulk_assignments_changed(
+    sender: Any, added: list, removed: list, **kwargs
+) -> None:
+    _schedule_worker_refresh(worker_id for _, worker_id in added + removed)
+
+
+@receiver(tasks_completed)
+def bulk_tasks_completed(sender: Any, task_ids: list[int], **kwargs) -> None:
+    adjust_dashboard_stats(tasks_done=len(task_ids))
+    leaderboard.record_completions(task_ids)
+    _schedule_best_team_refresh()
+
+
+@receiver(m2m_changed, sender=Task.workers.through)
+def task_workers_changed(
+    sender: Any, instance: Any, action: str, pk_set: Any, **kwargs
+) -> None:
+    if action == "pre_clear" and isinstance(instance, Task):
+        # The cleared workers are gone by post_clear
+        instance._cleared_worker_ids = list(
+            instance.workers.values_list("pk", flat=True)
+        )
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not isinstance(instance, Task):
+        worker_ids = [instance.pk]
+    elif action == "post_clear":
+        worker_ids = getattr(instance, "_cleared_worker_ids", [])
+    else:
+        worker_ids = pk_set
+    _schedule_worker_refresh(worker_ids)
+
+
+@receiver(pre_save, sender=Worker)
+def remember_worker_state(sender: Any, instance: Worker, **kwargs) -> None:
+    update_fields = kwargs.get("update_fields")
+    if not instance.pk or (
+        update_fields is not None and not {"status", "team"} & set(update_fields)
+    ):
+        instance._previous_state = None
+        return
+    instance._previous_state = (
+        Worker.objects.filter(pk=instance.pk).values("status", "team_id").first()
+    )
+
+
+@receiver(post_save, sender=Worker)
+def worker_saved(sender: Any, instance: Worker, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_previous_state", None)
+    if created:
+        adjust_dashboard_stats(num_users=1, num_workers=int(int(instance.status) > 0))
+        return
+    if previous is None:
+        return
+    was_hired, is_hired = previous["status"] > 0, int(instance.status) > 0
+    if was_hired != is_hired:
+        adjust_dashboard_stats(num_workers=1 if is_hired else -1)
+    if previous["team_id"] != instance.team_id:
+        leaderboard.refresh_teams([previous["team_id"], instance.team_id])
+        _schedule_best_team_refresh()
+
+
+@receiver(post_delete, sender=Worker)
+def worker_deleted(sender: Any, instance: Worker, **kwargs) -> None:
+    adjust_dashboard_stats(num_users=-1, num_workers=-int(int(instance.status) > 0))
+    leaderboard.refresh_teams([instance.team_id])
+
+
+@receiver(post_save, sender=Team)
+def team_saved(sender: Any, instance: Team, created: bool, **kwargs) -> None:
+    if created:
+        adjust_dashboard_stats(teams=1)
+    _schedule_best_team_refresh()
+
+
+@receiver(post_delete, sender=Team)
+def team_deleted(sender: Any, instance: Team, **kwargs) -> None:
+    adjust_dashboard_stats(teams=-1)
+    _schedule_best_team_refresh()
+
+
+@receiver(post_save, sender=Task)
+def count_saved_task(sender: Any, instance: Task, created: bool, **kwargs) -> None:
+    previous = getattr(instance, "_previous_state", None)
+    total, done = Counter(), Counter()
+    if previous:
+        total[previous["project_id"]] -= 1
+        done[previous["project_id"]] -= previous["is_completed"]
+    if created or previous:
+        total[instance.project_id] += 1
+        done[instance.project_id] += instance.is_completed
+    adjust_project_counts(total, done)
+
+
+@receiver(post_delete, sender=Task)
+def count_deleted_task(sender: Any, instance: Task, **kwargs) -> None:
+    adjust_project_counts(
+        Counter({instance.project_id: -1}),
+        Counter({instance.project_id: -int(instance.is_completed)}),
+    )
+
+
+@receiver(tasks_completed)
+def count_completed_tasks(sender: Any, task_ids: list[int], **kwargs) -> None:
+    adjust_project_counts(done=count_projects(task_ids))
+
+
+@receiver(post_save, sender=TaskAssignment)
+def count_saved_assignment(
+    sender: Any, instance: TaskAssignment, created: bool, **kwargs
+) -> None:
+    if created:
+        adjust_worker_counts(Counter({instance.task_id: 1}))
+
+
+@receiver(post_delete, sender=TaskAssignment)
+def count_deleted_assignment(
+    sender: Any, instance: TaskAssignment, origin: Any = None, **kwargs
+) -> None:
+    if _deleted_in_batch(origin):
+        return
+    adjust_worker_counts(Counter({instance.task_id: -1}))
+
+
+@receiver(assignments_changed)
+def count_changed_assignments(
+    sender: Any, added: list, removed: list, **kwargs
+) -> None:
+    deltas = Counter(task_id for task_id, _ in added)
+    deltas.subtract(task_id for task_id, _ in removed)
+    adjust_worker_counts(deltas)
+
+
+@receiver(m2m_changed, sender=Task.workers.through)
+def count_task_workers(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Any, **kwargs
+) -> None:
+    # Forward, instance is a Task and pk_set holds workers, reverse the other
+    # way round. Only added pks are exact, removed tasks are recounted.
+    if action == "pre_clear" and reverse:
+        instance._cleared_task_ids = list(instance.tasks.values_list("pk", flat=True))
+    elif action == "post_add":
+        adjust_worker_counts(
+            Counter(pk_set) if reverse else Counter({instance.pk: len(pk_set)})
+        )
+    elif action in ("post_remove", "post_clear"):
+        if not reverse:
+            recount_workers([instance.pk])
+        elif action == "post_remove":
+            recount_workers(pk_set)
+        else:
+            recount_workers(getattr(instance, "_cleared_task_ids", []))
+
+
+@receiver(post_save, sender=Task)
+def log_task_completion(sender: Any, instance: Task, **kwargs) -> None:
+    previous = getattr(instance, "_previous_state", None)
+    if previous and previous["is_completed"] != instance.is_completed:
+        history.record_tasks(
+            AssignmentEvent.COMPLETED
+            if instance.is_completed
+            else AssignmentEvent.REOPENED,
+            [instance.pk],
+            instance.completed_at,
+        )
+
+
+@receiver(tasks_completed)
+def log_completed_tasks(sender: Any, task_ids: list[int], **kwargs) -> None:
+    history.record_tasks(AssignmentEvent.COMPLETED, task_ids)
+
+
+@receiver(post_save, sender=TaskAssignment)
+def log_saved_assignment(
+    sender: Any, instance: TaskAssignment, created: bool, **kwargs
+) -> None:
+    if created:
+        history.record(
+            AssignmentEvent.ASSIGNED, [(instance.task_id, instance.assignee_id)]
+        )
+
+
+@receiver(post_delete, sender=TaskAssignment)
+def log_deleted_assignment(
+    sender: Any, instance: TaskAssignment, origin: Any = None, **kwargs
+) -> None:
+    if _deleted_in_batch(origin):
+        return
+    history.record(
+        AssignmentEvent.UNASSIGNED, [(instance.task_id, instance.assignee_id)]
+    )
+
+
+@receiver(assignments_changed)
+def log_changed_assignments(
+    sender: Any, added: list, removed: list, **kwargs
+) -> None:
+    history.record(AssignmentEvent.ASSIGNED, added)
+    history.record(AssignmentEvent.UNASSIGNED, removed)
+
+
+@receiver(m2m_changed, sender=Task.workers.through)
+def log_task_workers(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: Any, **kwargs
+) -> None:
+    if action in ("pre_remove", "pre_clear"):
+        assignments = TaskAssignment.objects.filter(
+            **{"assignee_id" if reverse else "task_id": instance.pk}
+        )
+        if action == "pre_remove":
+            assignments = assignments.filter(
+                **{"task_id__in" if reverse else "assignee_id__in": pk_set}
+            )
+        instance._removed_assignments = list(
+            assignments.values_list("task_id", "assignee_id")
+        )
+    elif action in ("post_remove", "post_clear"):
+        history.record(
+            AssignmentEvent.UNASSIGNED, getattr(instance, "_removed_assignments", [])
+        )
+    elif action == "post_add":
+        history.record(
+            AssignmentEvent.ASSIGNED,
+            [(pk, instance.pk) if reverse else (instance.pk, pk) for pk in pk_set],
+        )
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Worker)
+def update_search_index(sender: Any, instance: Any, **kwargs) -> None:
+    update_fields = kwargs.get("update_fields")
+    if update_fields is not None and not set(SEARCH_FIELDS[sender]) & set(
+        update_fields
+    ):
+        return
+    get_search_backend().update(instance)
+
+
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Worker)
+def remove_from_search_index(sender: Any, instance: Any, **kwargs) -> None:
+    get_search_backend().remove(instance)
+
+
+@receiver(post_save, sender=Worker)
+@receiver(post_delete, sender=Worker)
+def forget_worker_role(sender: Any, instance: Worker, **kwargs) -> None:
+    if kwargs.get("update_fields") == frozenset({"last_login"}):
+        return
+    invalidate_roles([instance.pk])
+
+
+@receiver(post_save, sender=Position)
+@receiver(pre_delete, sender=Position)
+def forget_position_roles(sender: Any, instance: Position, **kwargs) -> None:
+    if kwargs.get("created"):
+        return
+    invalidate_roles(instance.worker_set.values_list("pk", flat=True))
+
+
+@receiver(post_save, sender=Task)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Team)
+@receiver(post_save, sender=Worker)
+@receiver(post_save, sender=TaskAssignment)
+@receiver(post_save, sender=Position)
+@receiver(post_delete, sender=Task)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Team)
+@receiver(post_delete, sender=Worker)
+@receiver(post_delete, sender=TaskAssignment)
+@receiver(post_delete, sender=Position)
+def bump_cache_version(sender: Any, instance: Any, **kwargs) -> None:
+    if kwargs.get("update_fields") == frozenset({"last_login"}):
+        return
+    if _deleted_in_batch(kwargs.get("origin")):
+        return
+    bump(sender, [instance.pk])
+
+
+@receiver(m2m_changed, sender=Task.workers.through)
+@receiver(m2m_changed, sender=Team.members.through)
+def bump_relation_cache_versions(
+    sender: Any, instance: Any, action: str, model: Any, pk_set: Any, **kwargs
+) -> None:
+    if not action.startswith("post_"):
+        return
+    bump(sender)
+    bump(type(instance), [instance.pk])
+    bump(model, pk_set)
+
+
+@receiver(tasks_completed)
+def bump_completed_tasks(sender: Any, task_ids: list[int], **kwargs) -> None:
+    bump(Task, task_ids)
+
+
+@receiver(assignments_changed)
+def bump_changed_assignments(sender: Any, added: list, removed: list, **kwargs) -> None:
+    bump(TaskAssignment)
+    bump(Task, {task_id for task_id, _ in added + removed})
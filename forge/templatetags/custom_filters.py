@@ -1,3 +1,5 @@
+from typing import Iterable
+
 from django import template
 from django.core.exceptions import ValidationError
 from django.db.models import QuerySet
@@ -5,10 +7,22 @@ from django.db.models import QuerySet
 register = template.Library()
 
 
+def has_results(queryset: QuerySet) -> bool:
+    """Whether ``queryset`` is evaluated or prefetched, so iterating it is free."""
+    # Django has no public accessor for this
+    return getattr(queryset, "_result_cache", None) is not None
+
+
 @register.filter
-def filter_by_completion(queryset: QuerySet, condition: str) -> QuerySet:
-    if condition == "+":
-        return queryset.filter(is_completed=True)
-    if condition == "-":
-        return queryset.filter(is_completed=False)
-    raise ValidationError("Invalid condition. Must be '+' or '-'.")
+def filter_by_completion(tasks: Iterable, condition: str) -> QuerySet | list:
+    """Keep completed ("+") or uncompleted ("-") tasks.
+
+    Unevaluated querysets are filtered in SQL. Lists and querysets that already
+    hold their rows, such as prefetched ones, are partitioned in Python.
+    """
+    if condition not in ("+", "-"):
+        raise ValidationError("Invalid condition. Must be '+' or '-'.")
+    is_completed = condition == "+"
+    if isinstance(tasks, QuerySet) and not has_results(tasks):
+        return tasks.filter(is_completed=is_completed)
+    return [task for task in tasks if task.is_completed == is_completed]
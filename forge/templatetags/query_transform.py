@@ -15,3 +15,10 @@ def query_transform(request: HttpRequest, **kwargs) -> HttpResponse:
             updated.pop(key, 0)
 
     return updated.urlencode()
+
+
+@register.simple_tag
+def sort_query(request: HttpRequest, field: str) -> str:
+    """Sort by ``field``, toggling to descending when already sorted by it."""
+    sort = f"-{field}" if request.GET.get("sort") == field else field
+    return query_transform(request, sort=sort, cursor=None)
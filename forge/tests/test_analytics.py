@@ -0,0 +1,131 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from forge import analytics, bulk, history
+from forge.models import (
+    AssignmentEvent,
+    Position,
+    Project,
+    ProjectSnapshot,
+    Task,
+    TaskType,
+    Team,
+)
+
+
+class AnalyticsTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.now = timezone.now()
+        self.today = timezone.localdate()
+        pm = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=pm,
+        )
+        self.team = Team.objects.create(name="Alpha", project_manager=self.manager)
+        self.worker = get_user_model().objects.create_user(
+            username="worker",
+            password="testpass",
+            email="worker@example.com",
+            team=self.team,
+        )
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=self.today,
+            deadline=self.today,
+        )
+        tag = TaskType.objects.create(name="Bug")
+        # Created 10 days ago; done after 2, 4 and 8 days, the last one still open
+        self.tasks = []
+        for done_days_ago in (8, 6, 2, None):
+            task = Task.objects.create(
+                title="Task",
+                description="",
+                deadline=self.today - datetime.timedelta(days=1),
+                priority="3",
+                tag=tag,
+                project=self.project,
+                created_at=self.now - datetime.timedelta(days=10),
+            )
+            task.workers.add(self.worker)
+            if done_days_ago is not None:
+                Task.objects.filter(pk=task.pk).update(
+                    is_completed=True,
+                    completed_at=self.now - datetime.timedelta(days=done_days_ago),
+                )
+            self.tasks.append(task)
+
+    def test_snapshots_rebuild_past_days(self) -> None:
+        call_command("snapshot_projects", days=10, stdout=StringIO())
+        call_command("snapshot_projects", days=10, stdout=StringIO())
+        self.assertEqual(ProjectSnapshot.objects.count(), 10)
+
+        days = analytics.burndown(self.project.pk)
+        self.assertEqual(
+            [day["tasks_remaining"] for day in days],
+            [4, 3, 3, 2, 2, 2, 2, 1, 1, 1],
+        )
+        self.assertEqual(days[-1]["tasks_overdue"], 1)
+
+    def test_completion_timestamps(self) -> None:
+        bulk.complete_project(self.project.pk)
+        self.project.refresh_from_db()
+        self.assertIsNotNone(self.project.completed_at)
+
+        self.project.is_completed = False
+        self.project.save()
+        self.assertIsNone(Project.objects.get(pk=self.project.pk).completed_at)
+
+    def test_cycle_times_and_daily_cache(self) -> None:
+        start = self.today - datetime.timedelta(days=30)
+        with self.assertNumQueries(1):
+            summary = analytics.cycle_times(start, self.today)
+        self.assertEqual(
+            summary, {"count": 3, "mean": 112.0, "median": 96.0, "p90": 172.8}
+        )
+        with self.assertNumQueries(0):
+            analytics.cycle_times(start, self.today)
+
+        by_team = analytics.team_cycle_times(start, self.today)
+        self.assertEqual(by_team, {self.team.pk: summary})
+
+    def test_summaries_without_numpy(self) -> None:
+        with mock.patch.object(analytics, "np", None):
+            summary = analytics.summarize([1.0, 2.0, 3.0, 10.0])
+        self.assertEqual(summary["median"], 2.5)
+        self.assertAlmostEqual(summary["p90"], 7.9)
+
+    def test_velocity_counts_completions_per_week(self) -> None:
+        history.record(
+            AssignmentEvent.COMPLETED,
+            [(self.tasks[0].pk, self.worker.pk)],
+            self.now - datetime.timedelta(weeks=1),
+        )
+        bulk.complete_tasks([self.tasks[3].pk])
+
+        weeks = analytics.velocity(4)[self.team.pk]
+        self.assertEqual(weeks[-2:], [1, 1])
+        self.assertEqual(sum(weeks), 2)
+
+    def test_report_is_for_managers(self) -> None:
+        self.client.force_login(self.worker)
+        self.assertEqual(self.client.get(reverse("forge:report")).status_code, 302)
+
+        analytics.take_snapshots()
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:report"), {"project": self.project.pk})
+        self.assertContains(response, "Burndown")
+        self.assertEqual(response.context["cycle_time"]["count"], 3)
@@ -0,0 +1,73 @@
+import datetime
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from forge.dashboard import get_dashboard_stats
+from forge.models import Position, Project, Task, TaskType, Team
+
+
+class AsyncViewsTest(TestCase):
+    """Drive the async views through the ASGI handler and async middleware."""
+
+    def setUp(self) -> None:
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=Position.objects.create(name="ProjectManager"),
+            status=1,
+        )
+        self.team = Team.objects.create(name="Team", project_manager=self.manager)
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        self.task = Task.objects.create(
+            title="Write report",
+            description="",
+            deadline=datetime.date.today(),
+            priority="2",
+            tag=TaskType.objects.create(name="Bug"),
+            project=self.project,
+        )
+        get_dashboard_stats()
+
+    async def test_anonymous_users_are_redirected_to_login(self) -> None:
+        response = await self.async_client.get(reverse("forge:task-list"))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response["Location"].startswith(reverse("forge:welcome")))
+
+    async def test_async_pages_render_and_report_queries(self) -> None:
+        await sync_to_async(self.async_client.force_login)(self.manager)
+        urls = [
+            reverse("forge:index"),
+            reverse("forge:task-list"),
+            reverse("forge:task-detail", args=[self.task.pk]),
+            reverse("forge:project-detail", args=[self.project.pk]),
+            reverse("forge:team-detail", args=[self.team.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = await self.async_client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertRegex(response["Server-Timing"], r'desc="[1-9]\d* queries"')
+
+    async def test_missing_object_is_a_404(self) -> None:
+        await sync_to_async(self.async_client.force_login)(self.manager)
+        response = await self.async_client.get(reverse("forge:task-detail", args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+    async def test_project_detail_splits_tasks_by_completion(self) -> None:
+        await sync_to_async(self.async_client.force_login)(self.manager)
+        response = await self.async_client.get(
+            reverse("forge:project-detail", args=[self.project.pk])
+        )
+        self.assertEqual(response.context["uncompleted_tasks"], [self.task])
+        self.assertEqual(response.context["completed_tasks"], [])
+        self.assertContains(response, "No completed tasks right now.")
@@ -0,0 +1,91 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from forge.forms import TaskForm
+from forge.models import Position, Project, TaskType
+from forge.views import AUTOCOMPLETE_PAGE_SIZE
+
+URL = reverse("forge:worker-autocomplete")
+
+
+class WorkerAutocompleteTest(TestCase):
+    def setUp(self) -> None:
+        developer = Position.objects.create(name="Developer")
+        self.workers = [
+            get_user_model().objects.create_user(
+                username=f"dev{i:02}",
+                password="testpass",
+                email=f"dev{i:02}@example.com",
+                position=developer,
+                status=0 if i % 5 == 0 else 1,
+            )
+            for i in range(AUTOCOMPLETE_PAGE_SIZE + 5)
+        ]
+        self.client.force_login(self.workers[1])
+
+    def test_pages_follow_the_cursor(self) -> None:
+        first = self.client.get(URL).json()
+        self.assertEqual(len(first["results"]), AUTOCOMPLETE_PAGE_SIZE)
+        self.assertEqual(first["next"], first["results"][-1]["id"])
+
+        second = self.client.get(URL, {"after": first["next"]}).json()
+        self.assertEqual(len(second["results"]), 5)
+        self.assertIsNone(second["next"])
+        ids = [row["id"] for row in first["results"] + second["results"]]
+        self.assertEqual(ids, [worker.pk for worker in self.workers])
+
+    def test_search_and_hired_filter(self) -> None:
+        data = self.client.get(URL, {"q": "dev1", "hired": "1"}).json()
+        self.assertEqual(
+            [row["id"] for row in data["results"]],
+            [worker.pk for worker in self.workers[11:20] if worker.status],
+        )
+
+    def test_requires_login(self) -> None:
+        self.client.logout()
+        self.assertEqual(self.client.get(URL).status_code, 302)
+
+
+class WorkerPickerTest(TestCase):
+    def setUp(self) -> None:
+        self.workers = [
+            get_user_model().objects.create_user(
+                username=f"dev{i}",
+                password="testpass",
+                email=f"dev{i}@example.com",
+                status=1,
+            )
+            for i in range(5)
+        ]
+        manager = self.workers[0]
+        self.data = {
+            "title": "Task",
+            "description": "Description",
+            "deadline": datetime.date.today() + datetime.timedelta(days=1),
+            "priority": "3",
+            "tag": TaskType.objects.create(name="Bug").pk,
+            "project": Project.objects.create(
+                name="Project",
+                description="",
+                manager=manager,
+                start_date=datetime.date.today(),
+                deadline=datetime.date.today(),
+            ).pk,
+        }
+
+    def test_renders_only_selected_workers(self) -> None:
+        form = TaskForm(data={**self.data, "workers": [self.workers[2].pk]})
+        html = str(form["workers"])
+        self.assertIn(f'value="{self.workers[2].pk}" selected', html)
+        self.assertNotIn(f'value="{self.workers[3].pk}"', html)
+        self.assertIn(f'data-autocomplete-url="{URL}?hired=1"', html)
+
+    def test_validation_uses_one_query(self) -> None:
+        pks = [worker.pk for worker in self.workers[1:]]
+        form = TaskForm(data={**self.data, "workers": pks})
+        with self.assertNumQueries(1):
+            workers = form.fields["workers"].clean(pks)
+        self.assertEqual(sorted(worker.pk for worker in workers), pks)
@@ -0,0 +1,35 @@
+import json
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from forge.models import Task, TaskAssignment, Team, Worker
+
+
+class BenchmarkCommandsTest(TestCase):
+    def test_generate_data_bulk_creates_requested_scale(self) -> None:
+        call_command(
+            "generate_data", tasks=50, workers=12, teams=3, projects=4, stdout=StringIO()
+        )
+        self.assertEqual(Task.objects.count(), 50)
+        self.assertEqual(Team.objects.count(), 3)
+        self.assertEqual(TaskAssignment.objects.count(), 100)
+        self.assertEqual(Worker.objects.filter(team__isnull=False).count(), 12)
+
+    def test_benchmark_hits_every_route_and_saves_json(self) -> None:
+        call_command("generate_data", scale=30, stdout=StringIO())
+        with tempfile.NamedTemporaryFile(suffix=".json") as output:
+            call_command(
+                "benchmark", iterations=1, output=output.name, stdout=StringIO()
+            )
+            results = json.load(open(output.name))
+
+        routes = results["scales"]["30"]
+        self.assertIn("forge:task-list", routes)
+        self.assertIn("forge:project-detail", routes)
+        for name, row in routes.items():
+            self.assertIn(row["status"], (200, 302), name)
+        # Session, user and the export rows read from the streamed body
+        self.assertEqual(routes["forge:task-export"]["queries"], 3)
@@ -0,0 +1,108 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from forge import bulk
+from forge.dashboard import get_dashboard_stats
+from forge.models import Position, Project, Task, TaskAssignment, TaskType
+
+
+class BulkOperationsTest(TestCase):
+    def setUp(self) -> None:
+        self.pm = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.pm,
+            status=1,
+        )
+        self.worker = get_user_model().objects.create_user(
+            username="worker",
+            password="testpass",
+            email="worker@example.com",
+            status=1,
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=datetime.date.today(),
+                priority="4",
+                tag=self.tag,
+                project=self.project,
+            )
+            for i in range(5)
+        ]
+        self.ids = [task.pk for task in self.tasks]
+
+    def test_complete_tasks_uses_constant_queries_and_updates_stats(self) -> None:
+        get_dashboard_stats()
+        with self.assertNumQueries(9):
+            self.assertEqual(bulk.complete_tasks(self.ids), 5)
+        self.assertEqual(bulk.complete_tasks(self.ids), 0)
+        self.assertEqual(get_dashboard_stats().tasks_done, 5)
+
+    def test_assign_and_unassign_skip_existing_pairs(self) -> None:
+        self.tasks[0].workers.add(self.worker)
+        self.assertEqual(bulk.assign_workers(self.ids, [self.worker.pk]), 4)
+        self.assertEqual(TaskAssignment.objects.count(), 5)
+        self.assertEqual(bulk.unassign_workers(self.ids[:2], [self.worker.pk]), 2)
+        self.assertEqual(TaskAssignment.objects.count(), 3)
+        # Counted once, by assignments_changed rather than per deleted row
+        bulk.assign_workers(self.ids, [self.worker.pk, self.manager.pk])
+        bulk.unassign_workers(self.ids[:2], [self.worker.pk])
+        self.assertEqual(
+            list(Task.objects.order_by("pk").values_list("worker_count", flat=True)),
+            [1, 1, 2, 2, 2],
+        )
+
+    def test_complete_project_cascades_on_request(self) -> None:
+        self.assertEqual(bulk.complete_project(self.project.pk), 0)
+        self.assertFalse(Task.objects.filter(is_completed=True).exists())
+        self.assertEqual(bulk.complete_project(self.project.pk, cascade=True), 5)
+        self.project.refresh_from_db()
+        self.assertTrue(self.project.is_completed)
+
+    def test_complete_projects_is_one_update_per_table(self) -> None:
+        other = Project.objects.create(
+            name="Other",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        Task.objects.filter(pk__in=self.ids[3:]).update(project=other)
+        ids = [self.project.pk, other.pk]
+        # One project UPDATE and one complete_tasks() run for both projects
+        with self.assertNumQueries(14):
+            self.assertEqual(bulk.complete_projects(ids, cascade=True), 5)
+        self.assertEqual(Project.objects.filter(is_completed=True).count(), 2)
+
+    def test_bulk_view_is_for_managers_only(self) -> None:
+        data = {"action": "priority", "tasks": self.ids[:3], "priority": "1"}
+        self.client.force_login(self.worker)
+        self.client.post(reverse("forge:task-bulk"), data)
+        self.assertFalse(Task.objects.filter(priority="1").exists())
+
+        self.client.force_login(self.manager)
+        response = self.client.post(reverse("forge:task-bulk"), data)
+        self.assertRedirects(response, reverse("forge:task-list"))
+        self.assertEqual(Task.objects.filter(priority="1").count(), 3)
+
+    def test_bulk_view_requires_the_action_argument(self) -> None:
+        self.client.force_login(self.manager)
+        self.client.post(
+            reverse("forge:task-bulk"), {"action": "assign", "tasks": self.ids}
+        )
+        self.assertFalse(TaskAssignment.objects.exists())
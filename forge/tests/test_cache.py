@@ -0,0 +1,139 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from forge import bulk
+from forge.cache import get_version
+from forge.models import Position, Project, Task, TaskType, Team, Worker
+
+
+@override_settings(DETAIL_CACHE_TIMEOUT=300)
+class DetailCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.pm = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.pm,
+            status=1,
+        )
+        self.team = Team.objects.create(name="Team", project_manager=self.manager)
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        self.task = Task.objects.create(
+            title="Write report",
+            description="",
+            deadline=datetime.date.today(),
+            priority="2",
+            tag=TaskType.objects.create(name="Bug"),
+            project=self.project,
+            is_completed=True,
+        )
+        self.task.workers.add(self.manager)
+        self.client.force_login(self.manager)
+
+    def test_repeated_detail_hits_skip_the_object_queries(self) -> None:
+        url = reverse("forge:project-detail", args=[self.project.pk])
+        with self.assertNumQueries(4):
+            self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertContains(response, "Write report")
+
+    @override_settings(DETAIL_CACHE_TIMEOUT=0)
+    def test_nothing_is_cached_without_a_timeout(self) -> None:
+        url = reverse("forge:project-detail", args=[self.project.pk])
+        self.client.get(url)
+        Task.objects.filter(pk=self.task.pk).update(title="Write summary")
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertContains(response, "Write summary")
+
+    def test_saving_a_dependency_invalidates_the_page(self) -> None:
+        url = reverse("forge:project-detail", args=[self.project.pk])
+        self.client.get(url)
+        self.task.title = "Write summary"
+        self.task.save()
+        self.assertContains(self.client.get(url), "Write summary")
+
+    def test_bulk_updates_and_m2m_changes_bump_versions(self) -> None:
+        version = get_version(Task, self.task.pk)
+        bulk.set_priority([self.task.pk], "1")
+        self.assertNotEqual(get_version(Task, self.task.pk), version)
+
+        version = get_version(Team, self.team.pk, (Worker,))
+        self.team.members.add(self.manager)
+        self.assertNotEqual(get_version(Team, self.team.pk, (Worker,)), version)
+
+        url = reverse("forge:team-detail", args=[self.team.pk])
+        self.assertContains(self.client.get(url), "manager@example.com")
+
+
+@override_settings(FRAGMENT_CACHE_TIMEOUT=600)
+class FragmentCacheTest(TestCase):
+    def setUp(self) -> None:
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=Position.objects.create(name="ProjectManager"),
+            status=1,
+        )
+        self.task = Task.objects.create(
+            title="Write report",
+            description="",
+            deadline=datetime.date.today(),
+            priority="2",
+            tag=TaskType.objects.create(name="Bug"),
+            project=Project.objects.create(
+                name="Project",
+                description="",
+                manager=self.manager,
+                start_date=datetime.date.today(),
+                deadline=datetime.date.today(),
+            ),
+        )
+        self.client.force_login(self.manager)
+
+    def test_task_rows_are_rendered_from_the_query(self) -> None:
+        url = reverse("forge:task-list")
+        self.assertContains(self.client.get(url), "Write report")
+        Task.objects.filter(pk=self.task.pk).update(title="Write summary")
+        self.assertContains(self.client.get(url), "Write summary")
+
+    def test_sidebar_is_keyed_on_role(self) -> None:
+        url = reverse("forge:task-list")
+        self.assertContains(self.client.get(url), "Workers</a>")
+        self.manager.position = Position.objects.create(name="Developer")
+        self.manager.save()
+        self.assertNotContains(self.client.get(url), "Workers</a>")
+
+    def test_sidebar_is_shared_by_users_with_the_same_role(self) -> None:
+        other = get_user_model().objects.create_user(
+            username="other",
+            password="testpass",
+            email="other@example.com",
+            position=self.manager.position,
+            status=1,
+        )
+        cache.clear()
+        self.client.get(reverse("forge:task-list"))
+        key = make_template_fragment_key("sidebar", [True, True, True])
+        self.assertIsNotNone(cache.get(key))
+        cache.set(key, "<li>Shared sidebar</li>")
+
+        self.client.force_login(other)
+        response = self.client.get(reverse("forge:project-list"))
+        self.assertContains(response, "<li>Shared sidebar</li>")
+        # Rendered per request, outside the cached block
+        self.assertContains(response, f"{reverse('logout')}?next=/projects/")
@@ -0,0 +1,99 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from forge import bulk
+from forge.models import Position, Project, Task, TaskType
+
+
+class CounterTest(TestCase):
+    def setUp(self) -> None:
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=Position.objects.create(name="ProjectManager"),
+        )
+        self.worker = get_user_model().objects.create_user(
+            username="worker", password="testpass", email="worker@example.com"
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = self.create_project("Project")
+        self.task = self.create_task()
+
+    def create_project(self, name: str) -> Project:
+        return Project.objects.create(
+            name=name,
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+
+    def create_task(self, **kwargs) -> Task:
+        return Task.objects.create(
+            title="Task",
+            description="",
+            deadline=datetime.date.today(),
+            priority="2",
+            tag=self.tag,
+            project=self.project,
+            **kwargs,
+        )
+
+    def assertCounts(self, worker_count: int, total: int, done: int) -> None:
+        self.assertEqual(Task.objects.get(pk=self.task.pk).worker_count, worker_count)
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual((project.tasks_total, project.tasks_done), (total, done))
+
+    def test_assignments_update_worker_count(self) -> None:
+        self.task.workers.add(self.worker, self.manager)
+        self.assertCounts(2, 1, 0)
+        self.manager.tasks.remove(self.task)
+        self.assertCounts(1, 1, 0)
+        bulk.assign_workers([self.task.pk], [self.manager.pk])
+        self.assertCounts(2, 1, 0)
+        bulk.unassign_workers([self.task.pk], [self.worker.pk, self.manager.pk])
+        self.assertCounts(0, 1, 0)
+
+    def test_task_changes_update_project_counts(self) -> None:
+        other = self.create_task(is_completed=True)
+        self.assertCounts(0, 2, 1)
+        bulk.complete_tasks([self.task.pk])
+        self.assertCounts(0, 2, 2)
+
+        other.project = self.create_project("Other")
+        other.save()
+        self.assertCounts(0, 1, 1)
+        self.assertEqual(Project.objects.get(pk=other.project_id).tasks_done, 1)
+
+        Task.objects.get(pk=self.task.pk).delete()
+        project = Project.objects.get(pk=self.project.pk)
+        self.assertEqual((project.tasks_total, project.tasks_done), (0, 0))
+
+    def test_saving_a_stale_instance_keeps_counters(self) -> None:
+        self.task.workers.add(self.worker)
+        self.task.title = "Renamed"
+        self.task.save()
+        self.assertCounts(1, 1, 0)
+
+    def test_repair_command_fixes_drift(self) -> None:
+        self.task.workers.add(self.worker)
+        Task.objects.update(worker_count=5)
+        Project.objects.update(tasks_total=0, tasks_done=3)
+
+        out = StringIO()
+        call_command("repair_counters", stdout=out)
+
+        self.assertIn("1 task(s), 1 project(s)", out.getvalue())
+        self.assertCounts(1, 1, 0)
+
+    def test_task_list_renders_counts_without_loading_workers(self) -> None:
+        self.task.workers.add(self.worker)
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-list"))
+        self.assertContains(response, "<td>1</td>", html=True)
@@ -0,0 +1,90 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from forge.dashboard import get_dashboard_stats
+from forge.models import DashboardStats, Position, Project, Task, TaskType, Team
+
+
+class DashboardStatsTest(TestCase):
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.position,
+            status=1,
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today() + datetime.timedelta(days=7),
+        )
+
+    def create_task(self, **kwargs) -> Task:
+        return Task.objects.create(
+            title="Task",
+            description="",
+            deadline=datetime.date.today(),
+            priority="1",
+            tag=self.tag,
+            project=self.project,
+            **kwargs,
+        )
+
+    def test_stats_are_built_lazily_from_existing_rows(self) -> None:
+        self.create_task(is_completed=True)
+        stats = get_dashboard_stats()
+        self.assertEqual(stats.num_users, 1)
+        self.assertEqual(stats.num_workers, 1)
+        self.assertEqual(stats.tasks_overall, 1)
+        self.assertEqual(stats.tasks_done, 1)
+
+    def test_signals_keep_counters_up_to_date(self) -> None:
+        get_dashboard_stats()
+        task = self.create_task()
+        task.is_completed = True
+        task.save()
+        Team.objects.create(name="Team", project_manager=self.manager)
+        get_user_model().objects.create_user(
+            username="other", password="testpass", email="other@example.com"
+        )
+
+        stats = DashboardStats.objects.get()
+        self.assertEqual(stats.tasks_overall, 1)
+        self.assertEqual(stats.tasks_done, 1)
+        self.assertEqual(stats.teams, 1)
+        self.assertEqual(stats.num_users, 2)
+        self.assertEqual(stats.num_workers, 1)
+
+        task.delete()
+        stats.refresh_from_db()
+        self.assertEqual(stats.tasks_overall, 0)
+        self.assertEqual(stats.tasks_done, 0)
+
+    def test_rebuild_command_reconciles_drift(self) -> None:
+        self.create_task()
+        get_dashboard_stats()
+        DashboardStats.objects.update(tasks_overall=42)
+
+        call_command("rebuild_dashboard_stats", stdout=StringIO())
+
+        self.assertEqual(DashboardStats.objects.get().tasks_overall, 1)
+
+    def test_index_renders_from_single_stats_row(self) -> None:
+        self.create_task()
+        get_dashboard_stats()
+        self.client.force_login(self.manager)
+
+        response = self.client.get(reverse("forge:index"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["tasks_overall"], 1)
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from forge.management.commands.explain_views import SEQ_SCAN_PATTERNS, VIEW_CASES
+
+
+class ExplainViewsCommandTest(TestCase):
+    def setUp(self) -> None:
+        call_command("generate_data", scale=30, stdout=StringIO())
+        get_user_model().objects.create_superuser(
+            username="admin", password="testpass", email="admin@example.com"
+        )
+
+    def explain(self, **options: object) -> list[str]:
+        stdout = StringIO()
+        call_command("explain_views", stdout=stdout, **options)
+        return stdout.getvalue().splitlines()
+
+    def test_reports_every_view_and_the_scanned_tables(self) -> None:
+        lines = [line for line in self.explain() if not line.startswith("    ")]
+        self.assertEqual(len(lines), len(VIEW_CASES))
+        self.assertIn("forge:worker-list: sequential scan on forge_worker", lines)
+        self.assertIn("forge:task-detail: ok", lines)
+
+    def test_fail_on_seq_scan_raises_unless_the_table_is_ignored(self) -> None:
+        with self.assertRaisesMessage(CommandError, "contain sequential scans"):
+            self.explain(fail_on_seq_scan=True)
+
+        tables = {
+            table
+            for line in self.explain()
+            if "sequential scan on " in line
+            for table in line.split("sequential scan on ", 1)[1].split(", ")
+        }
+        lines = self.explain(fail_on_seq_scan=True, ignore=sorted(tables))
+        self.assertTrue(all(line.endswith(": ok") for line in lines))
+
+    def test_sqlite_pattern_reads_old_and_new_plan_output(self) -> None:
+        pattern = SEQ_SCAN_PATTERNS["sqlite"]
+        self.assertEqual(pattern.findall("SCAN TABLE forge_task"), ["forge_task"])
+        self.assertEqual(pattern.findall("SCAN forge_task"), ["forge_task"])
+        self.assertEqual(
+            pattern.findall("SCAN TABLE forge_task USING INDEX forge_task_idx"), []
+        )
@@ -0,0 +1,93 @@
+import csv
+import datetime
+import io
+import json
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from forge.models import Position, Project, Task, TaskType
+
+
+class ExportViewsTest(TestCase):
+    def setUp(self) -> None:
+        self.pm = Position.objects.create(name="ProjectManager")
+        self.developer = Position.objects.create(name="Developer")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.pm,
+        )
+        self.worker = get_user_model().objects.create_user(
+            username="worker",
+            password="testpass",
+            email="worker@example.com",
+            position=self.developer,
+            status=1,
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        for i in range(3):
+            task = Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=datetime.date.today(),
+                priority="1",
+                tag=self.tag,
+                project=self.project,
+            )
+        task.workers.add(self.worker)
+
+    def read_csv(self, response: object) -> list[list[str]]:
+        content = b"".join(response.streaming_content).decode()
+        return list(csv.reader(io.StringIO(content)))
+
+    def test_manager_exports_all_tasks_as_csv(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-export"))
+        rows = self.read_csv(response)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(rows[0][:2], ["id", "title"])
+        self.assertEqual(len(rows), 4)
+
+    def test_task_export_honors_list_permissions_and_filters(self) -> None:
+        self.client.force_login(self.worker)
+        response = self.client.get(reverse("forge:task-export"), {"format": "ndjson"})
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(json.loads(lines[0])["title"], "Task 2")
+
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-export"), {"title": "task 1"})
+        self.assertEqual(len(self.read_csv(response)), 2)
+
+    async def test_exports_are_read_on_the_event_loop_under_asgi(self) -> None:
+        await sync_to_async(self.async_client.force_login)(self.manager)
+        for name in ("forge:task-export", "forge:project-export"):
+            with self.subTest(name=name):
+                response = await self.async_client.get(reverse(name))
+                # Like ASGIHandler, consumed without leaving the event loop
+                rows = self.read_csv(response)
+                self.assertEqual(len(rows), 4 if name == "forge:task-export" else 2)
+
+    def test_assignment_export_is_for_managers_only(self) -> None:
+        self.client.force_login(self.worker)
+        response = self.client.get(reverse("forge:assignment-export"))
+        self.assertEqual(response.status_code, 302)
+
+        self.client.force_login(self.manager)
+        response = self.client.get(
+            reverse("forge:assignment-export"), {"project": self.project.pk}
+        )
+        rows = self.read_csv(response)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[1][5], "worker@example.com")
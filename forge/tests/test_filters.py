@@ -65,3 +65,18 @@ class FilterByCompletionTest(TestCase):
         with self.assertRaises(ValidationError):
             qs = Task.objects.all()
             filter_by_completion(qs, "invalid_condition")
+
+    def test_filter_by_completion_partitions_lists(self) -> None:
+        with self.assertNumQueries(0):
+            completed = filter_by_completion([self.task1, self.task2], "+")
+            uncompleted = filter_by_completion([self.task1, self.task2], "-")
+        self.assertEqual(completed, [self.task1])
+        self.assertEqual(uncompleted, [self.task2])
+
+    def test_filter_by_completion_keeps_prefetched_tasks(self) -> None:
+        project = Project.objects.prefetch_related("tasks").get(pk=self.project.pk)
+        with self.assertNumQueries(0):
+            completed = filter_by_completion(project.tasks.all(), "+")
+            uncompleted = filter_by_completion(project.tasks.all(), "-")
+        self.assertEqual(completed, [self.task1])
+        self.assertEqual(uncompleted, [self.task2])
@@ -0,0 +1,115 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from forge import bulk, history
+from forge.models import AssignmentEvent, Project, Task, TaskAssignment, TaskType
+
+ASSIGNED, UNASSIGNED = AssignmentEvent.ASSIGNED, AssignmentEvent.UNASSIGNED
+COMPLETED, REOPENED = AssignmentEvent.COMPLETED, AssignmentEvent.REOPENED
+
+
+class AssignmentHistoryTest(TestCase):
+    def setUp(self) -> None:
+        today = datetime.date.today()
+        self.alice, self.bob = (
+            get_user_model().objects.create_user(
+                username=name, password="testpass", email=f"{name}@example.com"
+            )
+            for name in ("alice", "bob")
+        )
+        tag = TaskType.objects.create(name="Bug")
+        project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.alice,
+            start_date=today,
+            deadline=today,
+        )
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=today,
+                priority="3",
+                tag=tag,
+                project=project,
+            )
+            for i in range(3)
+        ]
+        self.ids = [task.pk for task in self.tasks]
+
+    def events(self) -> list[tuple[int, int, int]]:
+        return list(
+            AssignmentEvent.objects.order_by("pk").values_list(
+                "kind", "task_id", "worker_id"
+            )
+        )
+
+    def test_form_style_m2m_changes_are_logged_once(self) -> None:
+        task = self.tasks[0]
+        task.workers.set([self.alice, self.bob])
+        task.workers.set([self.bob])
+        self.bob.tasks.clear()
+        alice, bob = self.alice.pk, self.bob.pk
+
+        self.assertEqual(
+            sorted(self.events()[:2]),
+            [(ASSIGNED, task.pk, alice), (ASSIGNED, task.pk, bob)],
+        )
+        self.assertEqual(
+            self.events()[2:], [(UNASSIGNED, task.pk, alice), (UNASSIGNED, task.pk, bob)]
+        )
+
+    def test_bulk_operations_and_completion_are_logged(self) -> None:
+        bulk.assign_workers(self.ids, [self.alice.pk])
+        bulk.unassign_workers(self.ids[2:], [self.alice.pk])
+        bulk.complete_tasks(self.ids[:1])
+        task = self.tasks[0]
+        task.refresh_from_db()
+        task.is_completed = False
+        task.save()
+
+        kinds = [kind for kind, _, _ in self.events()]
+        self.assertEqual(kinds, [ASSIGNED] * 3 + [UNASSIGNED, COMPLETED, REOPENED])
+
+    def test_single_rows_and_deleted_tasks(self) -> None:
+        assignment = TaskAssignment.objects.create(task=self.tasks[1], assignee=self.bob)
+        assignment.delete()
+        self.tasks[1].workers.add(self.alice)
+        self.tasks[1].delete()
+
+        self.assertEqual(
+            [kind for kind, _, _ in self.events()],
+            [ASSIGNED, UNASSIGNED, ASSIGNED, UNASSIGNED],
+        )
+        # The history outlives the task
+        self.assertEqual(len(history.timeline(task_id=self.ids[1])), 4)
+
+    def test_record_is_one_insert(self) -> None:
+        pairs = [(task_id, self.alice.pk) for task_id in self.ids]
+        with self.assertNumQueries(1):
+            self.assertEqual(history.record(ASSIGNED, pairs), 3)
+
+    def test_range_queries(self) -> None:
+        now = timezone.now()
+        month_ago = now - datetime.timedelta(days=40)
+        week_ago = now - datetime.timedelta(days=7)
+        task = self.ids[0]
+        history.record(ASSIGNED, [(task, self.alice.pk)], month_ago)
+        history.record(COMPLETED, [(task, self.alice.pk)], month_ago)
+        history.record(ASSIGNED, [(task, self.bob.pk)], week_ago)
+        history.record(UNASSIGNED, [(task, self.alice.pk)], week_ago)
+        history.record(COMPLETED, [(task, self.bob.pk)] * 2, now)
+
+        self.assertEqual(len(history.timeline(self.alice.pk, start=week_ago)), 1)
+        self.assertEqual(
+            history.throughput(week_ago, now + datetime.timedelta(seconds=1)),
+            {self.bob.pk: 1},
+        )
+        self.assertEqual(
+            history.assignment_spans(task),
+            [(self.alice.pk, month_ago, week_ago), (self.bob.pk, week_ago, None)],
+        )
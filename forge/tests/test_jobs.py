@@ -0,0 +1,96 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.utils import timezone
+
+from forge import jobs
+from forge.models import Job, Notification, Position, Project, Task, TaskType
+
+
+class JobQueueTest(TestCase):
+    def test_jobs_are_claimed_once(self) -> None:
+        for _ in range(3):
+            jobs.enqueue("sweep_overdue")
+        later = timezone.now() + datetime.timedelta(hours=1)
+        jobs.enqueue("sweep_overdue", run_at=later)
+
+        first = jobs.claim_jobs("worker-1", limit=2)
+        second = jobs.claim_jobs("worker-2", limit=5)
+        self.assertEqual(len(first), 2)
+        self.assertEqual(len(second), 1)
+        self.assertFalse({job.pk for job in first} & {job.pk for job in second})
+        self.assertEqual(jobs.claim_jobs("worker-3"), [])
+
+    def test_failed_jobs_are_retried_then_given_up(self) -> None:
+        jobs.JOBS["explode"] = lambda: 1 / 0
+        self.addCleanup(jobs.JOBS.pop, "explode")
+        job = Job.objects.create(name="explode", max_attempts=2)
+
+        self.assertFalse(jobs.run_job(jobs.claim_jobs("worker")[0]))
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.QUEUED)
+        self.assertIn("ZeroDivisionError", job.last_error)
+
+        Job.objects.filter(pk=job.pk).update(run_at=timezone.now())
+        jobs.run_job(jobs.claim_jobs("worker")[0])
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.FAILED)
+
+    def test_periodic_jobs_are_scheduled_once_per_slot(self) -> None:
+        now = timezone.now()
+        jobs.schedule_periodic(now)
+        jobs.schedule_periodic(now)
+        self.assertEqual(Job.objects.count(), len(jobs.DEFAULT_PERIODIC_JOBS))
+
+
+class OverdueSweepTest(TestCase):
+    def setUp(self) -> None:
+        self.today = timezone.localdate()
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=Position.objects.create(name="ProjectManager"),
+        )
+        self.worker = get_user_model().objects.create_user(
+            username="worker", password="testpass", email="worker@example.com"
+        )
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=self.today,
+            deadline=self.today - datetime.timedelta(days=1),
+        )
+        tag = TaskType.objects.create(name="Bug")
+        for days, completed in ((-2, False), (-2, True), (1, False), (10, False)):
+            task = Task.objects.create(
+                title=f"Due in {days}",
+                description="",
+                deadline=self.today + datetime.timedelta(days=days),
+                is_completed=completed,
+                tag=tag,
+                project=self.project,
+            )
+            task.workers.add(self.worker)
+
+    def test_sweep_notifies_workers_and_managers_once(self) -> None:
+        jobs.sweep_overdue()
+        jobs.sweep_overdue()
+        self.assertCountEqual(
+            Notification.objects.values_list("worker__username", "kind"),
+            [
+                ("worker", Notification.TASK_OVERDUE),
+                ("manager", Notification.PROJECT_OVERDUE),
+            ],
+        )
+
+    def test_reminders_cover_tasks_due_soon(self) -> None:
+        jobs.enqueue("deadline_reminders")
+        self.assertEqual(jobs.run_pending("worker"), 1)
+        notification = Notification.objects.get()
+        self.assertEqual(notification.kind, Notification.DEADLINE_SOON)
+        self.assertEqual(
+            notification.message, f"Due in 1 is due on {notification.task.deadline}"
+        )
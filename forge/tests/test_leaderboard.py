@@ -0,0 +1,152 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from forge import bulk
+from forge.dashboard import rebuild_dashboard_stats
+from forge.leaderboard import recompute_leaderboard, top_teams, top_workers
+from forge.models import (
+    LeaderboardEntry,
+    Position,
+    Project,
+    Task,
+    TaskAssignment,
+    TaskType,
+    Team,
+)
+
+COUNTS = ("tasks_done", "done_7d", "done_30d", "tasks_open", "tasks_overdue")
+
+
+class LeaderboardTest(TestCase):
+    def setUp(self) -> None:
+        today = datetime.date.today()
+        pm = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=pm,
+        )
+        self.team = Team.objects.create(name="Alpha", project_manager=self.manager)
+        self.alice, self.bob = (
+            get_user_model().objects.create_user(
+                username=name,
+                password="testpass",
+                email=f"{name}@example.com",
+                team=self.team,
+            )
+            for name in ("alice", "bob")
+        )
+        tag = TaskType.objects.create(name="Bug")
+        project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=today,
+            deadline=today,
+        )
+        self.tasks = [
+            Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=today + datetime.timedelta(days=-1 if i == 0 else 5),
+                priority="3",
+                tag=tag,
+                project=project,
+            )
+            for i in range(3)
+        ]
+        self.ids = [task.pk for task in self.tasks]
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.assign_workers(self.ids, [self.alice.pk])
+            bulk.assign_workers(self.ids[:2], [self.bob.pk])
+
+    def snapshot(self) -> dict:
+        return {
+            (entry.team_id, entry.worker_id): tuple(
+                getattr(entry, field) for field in COUNTS
+            )
+            for entry in LeaderboardEntry.objects.all()
+        }
+
+    def test_assignments_refresh_rows(self) -> None:
+        alice = LeaderboardEntry.objects.get(worker=self.alice)
+        self.assertEqual((alice.tasks_open, alice.tasks_overdue), (3, 1))
+        # Tasks shared by both members count once for the team
+        team = LeaderboardEntry.objects.get(team=self.team)
+        self.assertEqual((team.tasks_open, team.tasks_overdue), (3, 1))
+
+    def test_completions_match_full_recompute(self) -> None:
+        bulk.complete_tasks(self.ids[:2])
+        incremental = self.snapshot()
+        recompute_leaderboard()
+
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(incremental[(None, self.bob.pk)], (2, 2, 2, 0, 0))
+
+    def test_reopening_a_task_recomputes_its_rows(self) -> None:
+        task = self.tasks[1]
+        task.is_completed = True
+        task.save()
+        task.is_completed = False
+        task.save()
+        self.assertIsNone(Task.objects.get(pk=task.pk).completed_at)
+        self.assertEqual(LeaderboardEntry.objects.get(worker=self.bob).tasks_done, 0)
+
+    def test_assignment_rows_refresh_once_on_commit(self) -> None:
+        task = self.tasks[2]
+        with self.captureOnCommitCallbacks() as callbacks:
+            task.workers.add(self.bob)
+            TaskAssignment.objects.create(task=self.tasks[0], assignee=self.manager)
+        bob = LeaderboardEntry.objects.get(worker=self.bob)
+        self.assertEqual(bob.tasks_open, 2)
+
+        with CaptureQueriesContext(connection) as queries:
+            for callback in callbacks:
+                callback()
+        refreshes = [q for q in queries if "GROUP BY" in q["sql"]]
+        # One worker and one team aggregate for both assignments
+        self.assertEqual(len(refreshes), 2)
+        bob.refresh_from_db()
+        self.assertEqual(bob.tasks_open, 3)
+        self.assertTrue(LeaderboardEntry.objects.filter(worker=self.manager).exists())
+
+    def test_completion_and_new_deadline_in_one_save(self) -> None:
+        task = self.tasks[1]
+        task.is_completed = True
+        task.deadline = datetime.date.today() - datetime.timedelta(days=2)
+        task.save()
+        incremental = self.snapshot()
+        recompute_leaderboard()
+
+        self.assertEqual(incremental, self.snapshot())
+        self.assertEqual(incremental[(None, self.bob.pk)], (1, 1, 1, 1, 1))
+
+    def test_unassigned_workers_drop_out(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk.unassign_workers(self.ids, [self.bob.pk])
+        self.assertFalse(LeaderboardEntry.objects.filter(worker=self.bob).exists())
+
+    def test_top_n_reads_and_best_team(self) -> None:
+        bulk.complete_tasks(self.ids)
+        with self.assertNumQueries(1):
+            workers = top_workers(2, order_by="done_7d")
+        self.assertEqual([entry.worker for entry in workers], [self.alice, self.bob])
+        self.assertEqual(top_teams(1)[0].team, self.team)
+
+        stats = rebuild_dashboard_stats()
+        self.assertEqual((stats.best_team, stats.max_tasks_done), ("Alpha", 3))
+
+    def test_recompute_command_reconciles_drift(self) -> None:
+        expected = self.snapshot()
+        LeaderboardEntry.objects.update(tasks_done=42, tasks_open=0)
+
+        call_command("recompute_leaderboard", stdout=StringIO())
+
+        self.assertEqual(self.snapshot(), expected)
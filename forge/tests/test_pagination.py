@@ -0,0 +1,97 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from forge.models import Position, Project, Task, TaskType
+from forge.pagination import KeysetPaginator
+
+
+class KeysetPaginatorTest(TestCase):
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.position,
+            status=1,
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        for i in range(10):
+            Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=datetime.date.today() + datetime.timedelta(days=i % 3),
+                priority=str(i % 4 + 1),
+                tag=self.tag,
+                project=self.project,
+            )
+
+    def walk(self, paginator: KeysetPaginator) -> list[int]:
+        seen = []
+        page = paginator.page()
+        while True:
+            seen.extend(task.pk for task in page)
+            if not page.has_next():
+                return seen
+            page = paginator.page(page.next_cursor)
+
+    def test_pages_cover_every_row_once_in_order(self) -> None:
+        queryset = Task.objects.order_by("deadline")
+        seen = self.walk(KeysetPaginator(queryset, 3))
+        expected = list(queryset.order_by("deadline", "pk").values_list("pk", flat=True))
+        self.assertEqual(seen, expected)
+
+    def test_descending_sort_on_related_column(self) -> None:
+        queryset = Task.objects.order_by("-tag__name")
+        seen = self.walk(KeysetPaginator(queryset, 4))
+        self.assertEqual(sorted(seen), sorted(queryset.values_list("pk", flat=True)))
+        self.assertEqual(len(seen), 10)
+
+    def test_previous_cursor_returns_the_same_page(self) -> None:
+        paginator = KeysetPaginator(Task.objects.all(), 3)
+        first = paginator.page()
+        second = paginator.page(first.next_cursor)
+        back = paginator.page(second.previous_cursor)
+        self.assertEqual([t.pk for t in back], [t.pk for t in first])
+        self.assertEqual(back.number, 1)
+        self.assertFalse(back.has_previous())
+
+    def test_task_list_uses_cursors(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-list"))
+        page = response.context["page_obj"]
+        self.assertEqual(len(page), 7)
+
+        response = self.client.get(
+            reverse("forge:task-list"), {"cursor": page.next_cursor}
+        )
+        self.assertEqual(len(response.context["tasks"]), 3)
+        self.assertEqual(response.context["page_obj"].number, 2)
+
+    def test_tampered_cursor_is_not_found(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-list"), {"cursor": "bogus"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_task_list_sort_state_lives_in_the_url(self) -> None:
+        self.client.force_login(self.manager)
+        url = reverse("forge:task-list")
+        response = self.client.get(url, {"sort": "-deadline", "title": "task"})
+        deadlines = [task.deadline for task in response.context["tasks"]]
+        self.assertEqual(deadlines, sorted(deadlines, reverse=True))
+        self.assertContains(response, 'href="?sort=deadline&amp;title=task"')
+        self.assertContains(response, 'href="?sort=title&amp;title=task"')
+        self.assertNotIn("last_sort_field", self.client.session)
+
+        response = self.client.get(url, {"sort": "deadline"})
+        self.assertContains(response, 'href="?sort=-deadline"')
@@ -0,0 +1,181 @@
+import datetime
+import json
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from forge.dashboard import get_dashboard_stats
+from forge.middleware import QueryBudgetExceeded
+from forge.models import Position, Project, Task, TaskType, Team
+from forge.views import TaskExportView
+
+
+class QueryBudgetTest(TestCase):
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="ProjectManager")
+        self.developer = Position.objects.create(name="Developer")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.position,
+            status=1,
+        )
+        self.team = Team.objects.create(name="Team", project_manager=self.manager)
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        for i in range(10):
+            worker = get_user_model().objects.create_user(
+                username=f"dev{i}",
+                password="testpass",
+                email=f"dev{i}@example.com",
+                position=self.developer,
+                team=self.team,
+                status=1,
+            )
+            self.team.members.add(worker)
+            task = Task.objects.create(
+                title=f"Task {i}",
+                description="",
+                deadline=datetime.date.today(),
+                priority=str(i % 4 + 1),
+                tag=self.tag,
+                project=self.project,
+                is_completed=i % 2 == 0,
+            )
+            task.workers.add(worker, self.manager)
+        self.task = task
+        # Budgets are for the steady state, the stats row is built once
+        get_dashboard_stats()
+        self.client.force_login(self.manager)
+
+    def test_every_page_stays_within_its_budget(self) -> None:
+        urls = [
+            reverse("forge:index"),
+            reverse("forge:task-list"),
+            reverse("forge:task-list") + "?sort=deadline",
+            reverse("forge:task-list") + "?title=task",
+            reverse("forge:task-detail", args=[self.task.pk]),
+            reverse("forge:worker-list"),
+            reverse("forge:worker-detail", args=[self.manager.pk]),
+            reverse("forge:team-list"),
+            reverse("forge:team-detail", args=[self.team.pk]),
+            reverse("forge:project-list"),
+            reverse("forge:project-detail", args=[self.project.pk]),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("queries", response["Server-Timing"])
+
+    def test_streamed_export_queries_are_recorded(self) -> None:
+        with self.assertLogs("forge.queries", "INFO") as logs:
+            response = self.client.get(reverse("forge:task-export"))
+            self.assertEqual(logs.output, [])
+            b"".join(response.streaming_content)
+        # Logged when the stream closes, with the export query counted
+        entry = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((entry["view"], entry["queries"]), ("forge:task-export", 3))
+        self.assertNotIn("Server-Timing", response)
+
+        with mock.patch.object(TaskExportView, "query_budget", 2):
+            response = self.client.get(reverse("forge:task-export"))
+            with self.assertRaises(QueryBudgetExceeded):
+                b"".join(response.streaming_content)
+
+    def test_list_queries_do_not_grow_with_rows(self) -> None:
+        other = Project.objects.create(
+            name="Other",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+
+        def add_rows(first: int, last: int) -> None:
+            for i in range(first, last):
+                worker = get_user_model().objects.create_user(
+                    username=f"extra{i}",
+                    password="testpass",
+                    email=f"extra{i}@example.com",
+                    position=self.developer,
+                    team=Team.objects.create(
+                        name=f"Extra {i}", project_manager=self.manager
+                    ),
+                    status=1,
+                )
+                task = Task.objects.create(
+                    title=f"Extra {i}",
+                    description="",
+                    deadline=datetime.date.today(),
+                    priority="1",
+                    tag=TaskType.objects.create(name=f"Tag {i}"),
+                    project=other,
+                )
+                task.workers.add(worker)
+
+        urls = [
+            reverse("forge:task-list") + f"?project={other.pk}",
+            reverse("forge:worker-list") + "?name=extra",
+            reverse("forge:team-list"),
+            reverse("forge:project-list"),
+        ]
+        add_rows(0, 1)
+        counts = {}
+        for url in urls:
+            self.client.get(url)  # warms the cached counts and versions
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            counts[url] = len(queries)
+
+        add_rows(1, 4)
+        for url in urls:
+            self.client.get(url)
+            with self.subTest(url=url), self.assertNumQueries(counts[url]):
+                response = self.client.get(url)
+            self.assertGreater(len(response.context["object_list"]), 1)
+
+    @override_settings(QUERY_BUDGET_RAISE=True)
+    def test_exceeding_the_budget_fails_loudly(self) -> None:
+        from forge.views import TeamDetailView
+
+        budget = TeamDetailView.query_budget
+        TeamDetailView.query_budget = 1
+        try:
+            with self.assertRaises(QueryBudgetExceeded):
+                self.client.get(reverse("forge:team-detail", args=[self.team.pk]))
+        finally:
+            TeamDetailView.query_budget = budget
+
+    def test_form_choices_do_not_query_per_worker(self) -> None:
+        urls = [
+            reverse("forge:edit-task", args=[self.task.pk]),
+            reverse("forge:team-update", args=[self.team.pk]),
+        ]
+        counts = {}
+        for url in urls:
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(url)
+            counts[url] = len(queries)
+        for i in range(5):
+            get_user_model().objects.create_user(
+                username=f"extra{i}",
+                password="testpass",
+                email=f"extra{i}@example.com",
+                position=self.developer,
+                status=1,
+            )
+        for url in urls:
+            with self.subTest(url=url), self.assertNumQueries(counts[url]):
+                self.client.get(url)
@@ -0,0 +1,112 @@
+from typing import Iterator
+
+from django.contrib.auth import get_user_model
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.client import RequestFactory
+from django.urls import reverse
+
+from forge.middleware import ReplicaRoutingMiddleware
+from forge.models import Task
+from forge.routers import ReplicaRouter, ReplicaState, replica_state
+from forge.views import TaskListView, edit_task, index
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.router = ReplicaRouter()
+
+    def read_with(self, state: ReplicaState) -> str:
+        token = replica_state.set(state)
+        try:
+            return self.router.db_for_read(Task)
+        finally:
+            replica_state.reset(token)
+
+    def test_reads_go_to_primary_outside_a_request(self) -> None:
+        self.assertEqual(self.router.db_for_read(Task), "default")
+
+    def test_marked_views_read_from_replica(self) -> None:
+        state = ReplicaState()
+        self.assertEqual(self.read_with(state), "default")
+        state.use_replica = True
+        self.assertEqual(self.read_with(state), "replica_1")
+
+    def test_sticky_requests_read_from_primary(self) -> None:
+        state = ReplicaState(sticky=True)
+        state.use_replica = True
+        self.assertEqual(self.read_with(state), "default")
+
+    def test_writes_and_migrations_go_to_primary(self) -> None:
+        self.assertEqual(self.router.db_for_write(Task), "default")
+        self.assertFalse(self.router.allow_migrate("replica_1", "forge"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_configured(self) -> None:
+        state = ReplicaState()
+        state.use_replica = True
+        self.assertEqual(self.read_with(state), "default")
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRoutingMiddlewareTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+        self.read_db = None
+
+        def get_response(request: HttpRequest) -> HttpResponse:
+            self.middleware.process_view(request, self.view, (), {})
+            self.read_db = ReplicaRouter().db_for_read(Task)
+            return HttpResponse()
+
+        self.middleware = ReplicaRoutingMiddleware(get_response)
+
+    def test_list_views_and_dashboard_use_replica(self) -> None:
+        for view in (TaskListView.as_view(), index):
+            self.view = view
+            self.middleware(self.factory.get("/"))
+            self.assertEqual(self.read_db, "replica_1")
+        self.assertIsNone(replica_state.get())
+
+    def test_streamed_bodies_read_from_replica(self) -> None:
+        def rows() -> Iterator[str]:
+            yield ReplicaRouter().db_for_read(Task)
+
+        def get_response(request: HttpRequest) -> StreamingHttpResponse:
+            middleware.process_view(request, TaskListView.as_view(), (), {})
+            return StreamingHttpResponse(rows())
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        response = middleware(self.factory.get("/"))
+        self.assertIsNone(replica_state.get())
+        self.assertEqual(b"".join(response.streaming_content), b"replica_1")
+        self.assertIsNone(replica_state.get())
+
+    def test_other_views_use_primary(self) -> None:
+        self.view = edit_task
+        self.middleware(self.factory.get("/"))
+        self.assertEqual(self.read_db, "default")
+
+    def test_write_makes_later_reads_sticky(self) -> None:
+        self.view = edit_task
+        response = self.middleware(self.factory.post("/"))
+        cookie = response.cookies[ReplicaRoutingMiddleware.cookie_name]
+        self.assertEqual(cookie["max-age"], 10)
+
+        self.view = TaskListView.as_view()
+        request = self.factory.get("/")
+        request.COOKIES[ReplicaRoutingMiddleware.cookie_name] = cookie.value
+        response = self.middleware(request)
+        self.assertEqual(self.read_db, "default")
+        self.assertNotIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
+
+
+class StickyAfterWriteTest(TestCase):
+    def test_complete_task_sets_sticky_cookie(self) -> None:
+        user = get_user_model().objects.create_user(
+            username="worker", password="testpass", email="worker@example.com"
+        )
+        self.client.force_login(user)
+        response = self.client.post(reverse("forge:complete-task", args=[1]))
+        self.assertIn(ReplicaRoutingMiddleware.cookie_name, response.cookies)
@@ -0,0 +1,85 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from forge.models import Position, Project
+from forge.roles import ANONYMOUS_ROLE, resolve_role, user_is_manager_or_admin
+
+
+class RoleResolutionTest(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.pm = Position.objects.create(name="ProjectManager")
+        self.developer = Position.objects.create(name="Developer")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            position=self.pm,
+        )
+        self.worker = get_user_model().objects.create_user(
+            username="worker",
+            password="testpass",
+            email="worker@example.com",
+            position=self.developer,
+        )
+
+    def test_role_flags(self) -> None:
+        self.assertTrue(resolve_role(self.manager).is_manager)
+        self.assertFalse(resolve_role(self.worker).is_manager_or_admin)
+        self.assertIs(resolve_role(AnonymousUser()), ANONYMOUS_ROLE)
+
+    def test_roles_are_resolved_per_request_by_default(self) -> None:
+        self.assertTrue(resolve_role(self.manager).is_manager)
+        # A demotion no signal sees, as in another process
+        get_user_model().objects.filter(pk=self.manager.pk).update(
+            position=self.developer
+        )
+        manager = get_user_model().objects.get(pk=self.manager.pk)
+        self.assertFalse(resolve_role(manager).is_manager)
+
+    @override_settings(ROLE_CACHE_TIMEOUT=300)
+    def test_cached_role_is_invalidated_on_save(self) -> None:
+        worker = get_user_model().objects.get(pk=self.worker.pk)
+        resolve_role(worker)
+        with self.assertNumQueries(0):
+            self.assertFalse(user_is_manager_or_admin(worker))
+
+        self.worker.is_superuser = True
+        self.worker.save()
+        self.assertTrue(user_is_manager_or_admin(self.worker))
+
+        resolve_role(self.manager)
+        self.pm.name = "Lead"
+        self.pm.save()
+        self.assertFalse(resolve_role(self.manager).is_manager)
+
+    def test_session_user_is_loaded_with_its_position(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:project-list"))
+        self.assertTrue(response.context["role"].is_manager)
+        with self.assertNumQueries(0):
+            self.assertEqual(response.context["user"].position, self.pm)
+
+    def test_managers_only_see_their_projects(self) -> None:
+        other = get_user_model().objects.create_user(
+            username="other",
+            password="testpass",
+            email="other@example.com",
+            position=self.pm,
+        )
+        for name, manager in (("Mine", self.manager), ("Theirs", other)):
+            Project.objects.create(
+                name=name,
+                description="",
+                manager=manager,
+                start_date=datetime.date.today(),
+                deadline=datetime.date.today(),
+            )
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:project-list"))
+        self.assertEqual([p.name for p in response.context["project_list"]], ["Mine"])
@@ -0,0 +1,89 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from forge.models import Position, Project, Task, TaskType
+from forge.search import get_search_backend
+
+
+class SearchBackendTest(TestCase):
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="manager",
+            password="testpass",
+            email="manager@example.com",
+            first_name="Olena",
+            last_name="Kovalenko",
+            position=self.position,
+            status=1,
+        )
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+        self.login_task = self.create_task("Fix login form", "Users cannot sign in")
+        self.report_task = self.create_task("Quarterly report", "Mention the login fix")
+
+    def create_task(self, title: str, description: str) -> Task:
+        return Task.objects.create(
+            title=title,
+            description=description,
+            deadline=datetime.date.today(),
+            priority="2",
+            tag=self.tag,
+            project=self.project,
+        )
+
+    def test_prefix_match_ranks_title_hits_first(self) -> None:
+        results = list(get_search_backend().search(Task.objects.all(), "logi"))
+        self.assertEqual(results, [self.login_task, self.report_task])
+
+    def test_description_is_searchable(self) -> None:
+        results = get_search_backend().search(Task.objects.all(), "sign")
+        self.assertEqual(list(results), [self.login_task])
+
+    def test_index_follows_edits_and_deletes(self) -> None:
+        self.report_task.title = "Annual summary"
+        self.report_task.description = ""
+        self.report_task.save()
+        self.login_task.delete()
+
+        results = get_search_backend().search(Task.objects.all(), "login")
+        self.assertFalse(results.exists())
+
+    def test_worker_search_matches_last_name(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:worker-list"), {"name": "koval"})
+        self.assertEqual(response.status_code, 200)
+
+        workers = get_search_backend().search(get_user_model().objects.all(), "koval")
+        self.assertEqual(list(workers), [self.manager])
+
+    def test_task_list_routes_through_search_form(self) -> None:
+        self.client.force_login(self.manager)
+        response = self.client.get(reverse("forge:task-list"), {"title": "quarter"})
+        self.assertEqual(list(response.context["tasks"]), [self.report_task])
+
+    def test_search_runs_the_full_text_match_once(self) -> None:
+        for i in range(10):
+            self.create_task(f"Report {i}", "")
+        self.client.force_login(self.manager)
+        url = reverse("forge:task-list")
+        with CaptureQueriesContext(connection) as queries:
+            first = self.client.get(url, {"title": "report"})
+            cursor = first.context["page_obj"].next_cursor
+            second = self.client.get(url, {"title": "report", "cursor": cursor})
+
+        tasks = [*first.context["tasks"], *second.context["tasks"]]
+        self.assertEqual(len(set(tasks)), 11)
+        for query in queries.captured_queries:
+            self.assertLessEqual(query["sql"].count("MATCH"), 1, query["sql"])
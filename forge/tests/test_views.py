@@ -1,8 +1,12 @@
 # flake8: noqa E501, F401, F821, ANN003, ANN001, ANN002, ANN101, ANN201
+import datetime
+from unittest import mock
+
 from django.contrib.auth import get_user_model
 from django.test import TestCase, Client
 from django.urls import reverse
-from forge.models import Position, Team, Worker
+from forge.dashboard import get_dashboard_stats
+from forge.models import Position, Project, Task, TaskType, Team, Worker
 from forge.views import user_is_manager_or_admin
 
 TEST_REGISTERED_URLS = [
@@ -23,6 +27,7 @@ class WelcomeViewTest(TestCase):
         self.user = get_user_model().objects.create_user(
             username="testuser", password="testpass12345"
         )
+        get_dashboard_stats()
 
     def test_welcome_view_redirects_to_index_if_authenticated(self) -> None:
         self.client.force_login(self.user)
@@ -55,6 +60,100 @@ class TestTeamViews(TestCase):
         response = self.client.get(reverse("forge:team-detail", args=[self.user.id]))
         self.assertEqual(response.status_code, 302)
 
+    def test_team_list_query_count_does_not_grow_with_teams(self) -> None:
+        self.client.force_login(self.user)
+        with self.assertNumQueries(3):
+            self.client.get(reverse("forge:team-list"))
+
+        for i in range(5):
+            manager = get_user_model().objects.create(
+                username=f"pm{i}", email=f"pm{i}@test.com", position=self.position
+            )
+            team = Team.objects.create(name=f"Team {i}", project_manager=manager)
+            team.members.add(self.user, manager)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("forge:team-list"))
+        self.assertContains(response, "<td>2</td>", count=5)
+
+
+class TeamDetailTaskStatsTest(TestCase):
+    def setUp(self) -> None:
+        self.position = Position.objects.create(name="ProjectManager")
+        self.manager = get_user_model().objects.create_user(
+            username="pm", email="pm@test.com", password="testpass12345",
+            position=self.position,
+        )
+        self.team = Team.objects.create(name="Team", project_manager=self.manager)
+        self.tag = TaskType.objects.create(name="Bug")
+        self.project = Project.objects.create(
+            name="Project",
+            description="",
+            manager=self.manager,
+            start_date=datetime.date.today(),
+            deadline=datetime.date.today(),
+        )
+
+    def add_member(self, number: int) -> Worker:
+        worker = get_user_model().objects.create_user(
+            username=f"dev{number}",
+            email=f"dev{number}@test.com",
+            password="testpass12345",
+            position=self.position,
+        )
+        self.team.members.add(worker)
+        yesterday = datetime.date.today() - datetime.timedelta(days=1)
+        for is_completed, deadline in ((True, yesterday), (False, yesterday)):
+            task = Task.objects.create(
+                title="Task",
+                description="",
+                deadline=deadline,
+                priority="1",
+                tag=self.tag,
+                project=self.project,
+                is_completed=is_completed,
+            )
+            task.workers.add(worker)
+        return worker
+
+    def test_with_task_stats_counts_done_open_and_overdue(self) -> None:
+        worker = self.add_member(1)
+        stats = Worker.objects.with_task_stats().get(pk=worker.pk)
+        self.assertEqual(
+            (stats.tasks_done, stats.tasks_open, stats.tasks_overdue), (1, 1, 1)
+        )
+
+    def test_team_detail_counts_overdue_against_the_current_day(self) -> None:
+        worker = self.add_member(1)
+        Task.objects.create(
+            title="Due today",
+            description="",
+            deadline=datetime.date.today(),
+            priority="1",
+            tag=self.tag,
+            project=self.project,
+        ).workers.add(worker)
+        self.client.force_login(self.manager)
+
+        tomorrow = datetime.date.today() + datetime.timedelta(days=1)
+        with mock.patch("forge.models.timezone.localdate", return_value=tomorrow):
+            response = self.client.get(reverse("forge:team-detail", args=[self.team.pk]))
+        member = response.context["team"].members.all()[0]
+        self.assertEqual(member.tasks_overdue, 2)
+
+    def test_team_detail_query_count_does_not_grow_with_members(self) -> None:
+        self.client.force_login(self.manager)
+        self.add_member(1)
+        url = reverse("forge:team-detail", args=[self.team.pk])
+        with self.assertNumQueries(4):
+            self.client.get(url)
+
+        for number in range(2, 6):
+            self.add_member(number)
+        with self.assertNumQueries(4):
+            response = self.client.get(url)
+        self.assertContains(response, "<td>1</td>", count=5)
+
 
 class WorkerHireViewTestCase(TestCase):
     def setUp(self) -> None:
@@ -4,8 +4,10 @@ from forge.views import (
     index,
     welcome,
     complete_project,
+    report,
     edit_task,
     worker_change,
+    worker_autocomplete,
     WorkerRegistrationView,
     WorkerListView,
     WorkerDetailView,
@@ -15,6 +17,7 @@ from forge.views import (
     TaskDetailView,
     TaskListView,
     complete_task,
+    bulk_tasks,
     TeamCreateView,
     TeamListView,
     TeamDetailView,
@@ -22,6 +25,10 @@ from forge.views import (
     ProjectUpdateView,
     ProjectDetailView,
     ProjectListView,
+    TaskExportView,
+    WorkerExportView,
+    ProjectExportView,
+    AssignmentExportView,
 )
 
 urlpatterns = [
@@ -29,10 +36,14 @@ urlpatterns = [
     path("unregistered/", welcome, name="welcome"),
     path("register/", WorkerRegistrationView.as_view(), name="register"),
     path("tasks/", TaskListView.as_view(), name="task-list"),
+    path("tasks/export/", TaskExportView.as_view(), name="task-export"),
+    path("tasks/bulk/", bulk_tasks, name="task-bulk"),
     path("tasks/<int:pk>/", TaskDetailView.as_view(), name="task-detail"),
     path("tasks/<int:pk>/complete/", complete_task, name="complete-task"),
     path("tasks/<int:pk>/edit/", edit_task, name="edit-task"),
     path("workers/", WorkerListView.as_view(), name="worker-list"),
+    path("workers/export/", WorkerExportView.as_view(), name="worker-export"),
+    path("workers/autocomplete/", worker_autocomplete, name="worker-autocomplete"),
     path("workers/<int:pk>/", WorkerDetailView.as_view(), name="worker-detail"),
     path("workers/<int:pk>/change/", worker_change, name="worker-change"),
     path("workers/<int:pk>/hire/", WorkerHireView.as_view(), name="worker-hire"),
@@ -46,6 +57,11 @@ urlpatterns = [
     path("project/<int:pk>/complete/", complete_project, name="complete-project"),
     path("project/task/create/", TaskCreateView.as_view(), name="project-task-create"),
     path("projects/", ProjectListView.as_view(), name="project-list"),
+    path("projects/export/", ProjectExportView.as_view(), name="project-export"),
+    path("reports/", report, name="report"),
+    path(
+        "assignments/export/", AssignmentExportView.as_view(), name="assignment-export"
+    ),
 ]
 
 app_name = "forge"
@@ -1,20 +1,30 @@
-from typing import Tuple, Any
+import asyncio
+import datetime
+from typing import Any
 
 from django.contrib import messages
 from django.core.exceptions import ValidationError
 from django.contrib.auth import get_user_model
-from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.decorators import user_passes_test
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import QuerySet, F, OuterRef, Count, Subquery, Q
-from django.http import HttpResponseRedirect, HttpRequest, HttpResponse
+from django.db.models import Count, Prefetch, QuerySet, Q
+from django.http import HttpResponseRedirect, HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views.decorators.http import require_POST
 from django.views import generic
 
+from forge import analytics, bulk
+from forge.asyncviews import AsyncDetailMixin, AsyncLoginRequiredMixin, alogin_required
+from forge.cache import CachedDetailMixin
+from forge.dashboard import aget_dashboard_stats
+from forge.exports import ExportMixin
 from forge.forms import (
     ProjectForm,
+    TaskBulkActionForm,
     TaskForm,
     TaskSearchForm,
     TeamForm,
@@ -22,13 +32,15 @@ from forge.forms import (
     WorkerRegisterForm,
     WorkerHireForm,
 )
-from forge.models import Worker, Task, Team, Project
+from forge.leaderboard import atop_workers
+from forge.middleware import query_budget, read_from_replica
+from forge.models import Worker, Task, TaskAssignment, Team, Project, Position
+from forge.search import get_search_backend
+from forge.pagination import KeysetPaginationMixin
+from forge.roles import get_role, user_is_manager_or_admin
 
-
-def user_is_manager_or_admin(user: Any) -> bool | Any:
-    return (user.is_authenticated
-            and str(user.position) == "ProjectManager"
-            or user.is_superuser)
+AUTOCOMPLETE_PAGE_SIZE = 20
+REPORT_WEEKS = 12
 
 
 def welcome(request: HttpRequest) -> HttpResponse:
@@ -37,47 +49,67 @@ def welcome(request: HttpRequest) -> HttpResponse:
     return render(request, "forge/unregistered/welcome.html")
 
 
-@login_required
-def index(request: HttpRequest) -> HttpResponse:
+@query_budget(5)
+@read_from_replica
+@alogin_required
+async def index(request: HttpRequest) -> HttpResponse:
     """View function for the home page of the site."""
-    worker_query = Worker.objects.all()
-    tasks_query = Task.objects.all()
-
-    num_users = worker_query.count()
-    num_workers = worker_query.filter(status__gt=0).count()
-    tasks_overall = tasks_query.count()
-    tasks_done = tasks_query.filter(is_completed=True).count()
-
-    teams = Team.objects.prefetch_related("members__tasks")
-
-    max_tasks_done, best_team = get_max_tasks_done(teams)
+    stats, top_workers = await asyncio.gather(
+        aget_dashboard_stats(), atop_workers(5, order_by="done_7d")
+    )
 
     context = {
-        "num_users": num_users,
-        "num_workers": num_workers,
-        "tasks_overall": tasks_overall,
-        "tasks_done": tasks_done,
-        "teams": teams.count(),
-        "best_team": best_team,
-        "max_tasks_done": max_tasks_done,
+        "num_users": stats.num_users,
+        "num_workers": stats.num_workers,
+        "tasks_overall": stats.tasks_overall,
+        "tasks_done": stats.tasks_done,
+        "teams": stats.teams,
+        "best_team": stats.best_team,
+        "max_tasks_done": stats.max_tasks_done,
+        "top_workers": top_workers,
     }
 
-    return render(request, "forge/index.html", context=context)
+    return TemplateResponse(request, "forge/index.html", context=context)
 
 
 @require_POST
 def complete_task(request: HttpRequest, pk: int) -> HttpResponse:
-    task = get_object_or_404(Task, pk=pk)
-    task.is_completed = True
-    task.save()
+    get_object_or_404(Task.objects.only("pk"), pk=pk)
+    bulk.complete_tasks([pk])
     return redirect("forge:task-detail", pk=pk)
 
 
+@require_POST
+@user_passes_test(user_is_manager_or_admin)
+def bulk_tasks(request: HttpRequest) -> HttpResponse:
+    form = TaskBulkActionForm(request.POST)
+    if not form.is_valid():
+        for error in form.errors.values():
+            messages.error(request, error.as_text())
+        return redirect("forge:task-list")
+
+    data = form.cleaned_data
+    task_ids = [task.pk for task in data["tasks"]]
+    worker_ids = [worker.pk for worker in data["workers"]]
+    action = data["action"]
+    if action == TaskBulkActionForm.COMPLETE:
+        count = bulk.complete_tasks(task_ids)
+    elif action == TaskBulkActionForm.PRIORITY:
+        count = bulk.set_priority(task_ids, data["priority"])
+    elif action == TaskBulkActionForm.DEADLINE:
+        count = bulk.set_deadline(task_ids, data["deadline"])
+    elif action == TaskBulkActionForm.ASSIGN:
+        count = bulk.assign_workers(task_ids, worker_ids)
+    else:
+        count = bulk.unassign_workers(task_ids, worker_ids)
+
+    messages.success(request, f"{count} change(s) applied.")
+    return redirect("forge:task-list")
+
+
 def edit_task(request: HttpRequest, pk: int) -> HttpResponse:
     task = get_object_or_404(Task, pk=pk)
-    user = request.user
-
-    if user_is_manager_or_admin(user):
+    if get_role(request).is_manager_or_admin:
         if request.method == "POST":
             form = TaskForm(request.POST, instance=task)
             if form.is_valid():
@@ -94,17 +126,55 @@ def edit_task(request: HttpRequest, pk: int) -> HttpResponse:
 
 @require_POST
 def complete_project(request: HttpRequest, pk: int) -> HttpResponse:
-    project = get_object_or_404(Project, pk=pk)
-    project.is_completed = True
-    project.save()
+    get_object_or_404(Project.objects.only("pk"), pk=pk)
+    bulk.complete_project(pk, cascade=bool(request.POST.get("cascade")))
     return redirect("forge:project-detail", pk=pk)
 
 
+@query_budget(10)
+@read_from_replica
+@user_passes_test(user_is_manager_or_admin)
+def report(request: HttpRequest) -> HttpResponse:
+    """Team velocity and cycle times, plus a project's burndown if requested.
+
+    The figures are cached for the day, see forge.analytics.
+    """
+    today = timezone.localdate()
+    year_ago = today - datetime.timedelta(days=365)
+    velocity = analytics.velocity(REPORT_WEEKS)
+    cycle_times = analytics.team_cycle_times(year_ago, today)
+    teams = [
+        {
+            "team": team,
+            "weeks": velocity.get(team.pk, [0] * REPORT_WEEKS),
+            "cycle_time": cycle_times.get(team.pk, analytics.summarize([])),
+        }
+        for team in Team.objects.only("name").order_by("name")
+    ]
+    context = {
+        "teams": teams,
+        "cycle_time": analytics.cycle_times(year_ago, today),
+        "weeks": REPORT_WEEKS,
+    }
+
+    project_id = request.GET.get("project", "")
+    if project_id.isdigit():
+        project = get_object_or_404(Project.objects.only("name"), pk=project_id)
+        context.update(
+            project=project,
+            burndown=analytics.burndown(project.pk),
+            project_cycle_time=analytics.cycle_times(
+                year_ago, today, project_id=project.pk
+            ),
+        )
+    return render(request, "forge/report.html", context)
+
+
 def worker_change(request, pk) -> Any:
     worker = get_object_or_404(Worker, pk=pk)
 
     if request.method == "POST":
-        if user_is_manager_or_admin(request.user):
+        if get_role(request).is_manager_or_admin:
             form = WorkerHireForm(request.POST, instance=worker)
             if form.is_valid():
                 form.save()
@@ -144,46 +214,44 @@ class TaskCreateView(LoginRequiredMixin, generic.CreateView):
         return reverse_lazy("forge:task-list")
 
 
-class TaskListView(LoginRequiredMixin, generic.ListView):
+class TaskListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
+    SORT_FIELDS = {
+        "id": "pk",
+        "title": "title",
+        "deadline": "deadline",
+        "priority": "priority",
+        "tag": "tag__name",
+        "tag__name": "tag__name",
+    }
     model = Task
     context_object_name = "tasks"
     paginate_by = 7
+    query_budget = 4
+    read_from_replica = True
 
     def get_queryset(self) -> QuerySet:
-        queryset = Task.objects.prefetch_related("project", "workers").filter(
-            project__is_completed=False
+        # Rows show worker_count instead of the prefetched workers
+        queryset = (
+            Task.objects.select_related("tag")
+            .only("title", "deadline", "priority", "worker_count", "tag__name")
+            .filter(project__is_completed=False)
         )
-        title = self.request.GET.get("title", "")
         user = self.request.user
-        sort_by = self.request.GET.get("sort")
-
-        if title:
-            queryset = queryset.filter(
-                title__icontains=title,
-            )
-
-        if sort_by:
-            last_sort_field = self.request.session.get("last_sort_field")
-            last_sort_order = self.request.session.get("last_sort_order")
+        # "field" sorts ascending, "-field" descending; the state lives in the URL
+        sort = self.request.GET.get("sort", "")
+        sort_field = sort.removeprefix("-")
 
-            if sort_by == last_sort_field:
-                sort_order = "-" + last_sort_order if last_sort_order == "" else ""
-            else:
-                sort_order = ""
+        queryset = TaskSearchForm(self.request.GET).search(queryset)
 
-            self.request.session["last_sort_field"] = sort_by
-            self.request.session["last_sort_order"] = sort_order
+        project = self.request.GET.get("project", "")
+        if project.isdigit():
+            queryset = queryset.filter(project_id=project)
 
-            if sort_by == "title":
-                queryset = queryset.order_by(sort_order + "title")
-            elif sort_by == "deadline":
-                queryset = queryset.order_by(sort_order + "deadline")
-            elif sort_by == "priority":
-                queryset = queryset.order_by(sort_order + "priority")
-            elif sort_by == "tag":
-                queryset = queryset.order_by(sort_order + "tag__name")
+        if sort_field in self.SORT_FIELDS:
+            descending = "-" if sort.startswith("-") else ""
+            queryset = queryset.order_by(descending + self.SORT_FIELDS[sort_field])
 
-        if user_is_manager_or_admin(user):
+        if get_role(self.request).is_manager_or_admin:
             return queryset
 
         return queryset.filter(
@@ -196,28 +264,85 @@ class TaskListView(LoginRequiredMixin, generic.ListView):
         title = self.request.GET.get("title", "")
 
         context["search_form"] = TaskSearchForm(initial={"title": title})
+        if get_role(self.request).is_manager_or_admin:
+            context["bulk_form"] = TaskBulkActionForm()
         return context
 
 
-class TaskDetailView(LoginRequiredMixin, generic.DetailView):
+class TaskExportView(ExportMixin, TaskListView):
+    export_filename = "tasks"
+    export_columns = {
+        "id": "pk",
+        "title": "title",
+        "deadline": "deadline",
+        "priority": "priority",
+        "is_completed": "is_completed",
+        "tag": "tag__name",
+        "project": "project__name",
+    }
+
+
+class TaskDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, CachedDetailMixin, generic.DetailView
+):
     model = Task
-    queryset = Task.objects.prefetch_related("workers__teams")
+    query_budget = 5
+    queryset = Task.objects.prefetch_related(
+        Prefetch("workers", queryset=Worker.objects.select_related("position"))
+    )
+    cache_depends_on = (Worker, TaskAssignment, Position)
+
+
+@query_budget(3)
+@read_from_replica
+@alogin_required
+async def worker_autocomplete(request: HttpRequest) -> JsonResponse:
+    """Workers matching ``q`` for the worker pickers, a page at a time.
+
+    Pages are keyed on pk: pass the returned ``next`` back as ``after``.
+    """
+    queryset = Worker.objects.for_labels()
+    if request.GET.get("hired"):
+        queryset = queryset.filter(status__gt=0)
+    after = request.GET.get("after", "")
+    if after.isdigit():
+        queryset = queryset.filter(pk__gt=after)
+    queryset = get_search_backend().search(queryset, request.GET.get("q", ""))
+
+    size = AUTOCOMPLETE_PAGE_SIZE
+    workers = [worker async for worker in queryset.order_by("pk")[: size + 1]]
+    return JsonResponse(
+        {
+            "results": [
+                {"id": worker.pk, "text": str(worker)} for worker in workers[:size]
+            ],
+            "next": workers[size - 1].pk if len(workers) > size else None,
+        }
+    )
 
 
-class WorkerListView(LoginRequiredMixin, generic.ListView):
+class WorkerListView(LoginRequiredMixin, KeysetPaginationMixin, generic.ListView):
     model = get_user_model()
     context_object_name = "workers"
     paginate_by = 5
+    query_budget = 5
+    read_from_replica = True
 
     def get_queryset(self) -> QuerySet:
-        queryset = (get_user_model()
-                    .objects.select_related("position")
-                    .filter(~Q(position__name="ProjectManager"))
-                    )
-        name = self.request.GET.get("name")
-        if name:
-            return queryset.filter(first_name__icontains=name)
-        return queryset
+        queryset = (
+            get_user_model()
+            .objects.select_related("position", "team")
+            .only(
+                "first_name",
+                "last_name",
+                "email",
+                "salary",
+                "position__name",
+                "team__name",
+            )
+            .filter(~Q(position__name="ProjectManager"))
+        )
+        return WorkerSearchForm(self.request.GET).search(queryset)
 
     def get_context_data(
         self, *, object_list: QuerySet = None, **kwargs
@@ -229,17 +354,33 @@ class WorkerListView(LoginRequiredMixin, generic.ListView):
         return context
 
 
-class WorkerDetailView(LoginRequiredMixin, generic.DetailView):
+@method_decorator(user_passes_test(user_is_manager_or_admin), name="dispatch")
+class WorkerExportView(ExportMixin, WorkerListView):
+    export_filename = "workers"
+    export_columns = {
+        "id": "pk",
+        "username": "username",
+        "first_name": "first_name",
+        "last_name": "last_name",
+        "email": "email",
+        "position": "position__name",
+        "team": "team__name",
+        "status": "status",
+        "salary": "salary",
+        "hire_date": "hire_date",
+    }
+
+
+class WorkerDetailView(LoginRequiredMixin, CachedDetailMixin, generic.DetailView):
     model = get_user_model()
+    query_budget = 6
+    cache_depends_on = (Project, Team, Position)
 
     def get_queryset(self) -> QuerySet:
         queryset = super().get_queryset()
-        return queryset.select_related("team", "position")
-
-    def get_object(self, queryset=None) -> Any:
-        pk = self.kwargs.get("pk")
-        worker = get_user_model().objects.get(pk=pk)
-        return worker
+        return queryset.select_related("team", "position").prefetch_related(
+            "projects", "teams"
+        )
 
 
 @method_decorator(user_passes_test(user_is_manager_or_admin), name="dispatch")
@@ -287,14 +428,32 @@ class TeamUpdateView(generic.UpdateView):
 
 class TeamListView(LoginRequiredMixin, generic.ListView):
     model = Team
-    queryset = Team.objects.prefetch_related("members")
+    query_budget = 4
+    read_from_replica = True
+    queryset = (
+        Team.objects.select_related("project_manager")
+        .only("name", "project_manager__first_name", "project_manager__last_name")
+        .annotate(member_count=Count("members"))
+    )
     context_object_name = "teams"
 
 
-class TeamDetailView(LoginRequiredMixin, generic.DetailView):
+class TeamDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, CachedDetailMixin, generic.DetailView
+):
     model = Team
-    queryset = Team.objects.prefetch_related("members")
+    query_budget = 4
     context_object_name = "team"
+    cache_depends_on = (Worker, Task, TaskAssignment, Position)
+
+    def get_queryset(self) -> QuerySet:
+        # Built per request: with_task_stats() compares against today's date
+        return Team.objects.prefetch_related(
+            Prefetch(
+                "members",
+                queryset=Worker.objects.select_related("position").with_task_stats(),
+            )
+        )
 
 
 @method_decorator(user_passes_test(user_is_manager_or_admin), name="dispatch")
@@ -310,10 +469,24 @@ class ProjectCreateView(generic.CreateView):
         return context
 
 
-class ProjectDetailView(LoginRequiredMixin, generic.DetailView):
+class ProjectDetailView(
+    AsyncLoginRequiredMixin, AsyncDetailMixin, CachedDetailMixin, generic.DetailView
+):
     model = Project
+    query_budget = 4
     context_object_name = "project"
-    queryset = Project.objects.prefetch_related("tasks__workers")
+    queryset = Project.objects.select_related("manager__position").prefetch_related(
+        Prefetch("tasks", queryset=Task.objects.only("title", "is_completed", "project"))
+    )
+    cache_depends_on = (Worker, Task, Position)
+
+    def get_context_data(self, **kwargs) -> dict[str, Any]:
+        context = super().get_context_data(**kwargs)
+        # Partitioned from the prefetched tasks rather than queried twice
+        tasks = self.object.tasks.all()
+        context["uncompleted_tasks"] = [task for task in tasks if not task.is_completed]
+        context["completed_tasks"] = [task for task in tasks if task.is_completed]
+        return context
 
 
 @method_decorator(user_passes_test(user_is_manager_or_admin), name="dispatch")
@@ -337,30 +510,52 @@ class ProjectUpdateView(generic.UpdateView):
 
 class ProjectListView(LoginRequiredMixin, generic.ListView):
     model = Project
+    query_budget = 4
+    read_from_replica = True
 
     def get_queryset(self) -> QuerySet:
-        user = get_user_model().objects.get(id=self.request.user.id)
-        if user.position == "ProjectManager":
-            return super().get_queryset().filter(manager=self.request.user)
-        return super().get_queryset()
-
-
-def get_max_tasks_done(teams: QuerySet) -> Tuple[int, str] | Tuple[int, None]:
-    subquery = (
-        Task.objects.filter(workers__team=OuterRef("pk"))
-        .values("workers__teams__id")
-        .annotate(total_tasks_done=Count("pk"))
-        .values("total_tasks_done")[:1]
-    )
+        queryset = super().get_queryset().only(
+            "name", "is_completed", "tasks_total", "tasks_done"
+        )
+        if get_role(self.request).is_manager:
+            return queryset.filter(manager=self.request.user)
+        return queryset
 
-    team_totals = (
-        teams.annotate(total_tasks_done=Subquery(subquery), team_name=F("name"))
-        .values("total_tasks_done", "team_name")
-        .order_by("-total_tasks_done", "team_name")
-    ).distinct()
 
-    if not team_totals:
-        return 0, None
+class ProjectExportView(ExportMixin, ProjectListView):
+    export_filename = "projects"
+    export_columns = {
+        "id": "pk",
+        "name": "name",
+        "manager": "manager__email",
+        "is_completed": "is_completed",
+        "start_date": "start_date",
+        "deadline": "deadline",
+    }
+
 
-    best_team = team_totals.first()
-    return best_team["total_tasks_done"], best_team["team_name"]
+@method_decorator(user_passes_test(user_is_manager_or_admin), name="dispatch")
+class AssignmentExportView(ExportMixin, generic.ListView):
+    model = TaskAssignment
+    export_filename = "assignments"
+    export_columns = {
+        "id": "pk",
+        "task_id": "task_id",
+        "task": "task__title",
+        "project": "task__project__name",
+        "is_completed": "task__is_completed",
+        "assignee": "assignee__email",
+        "assigned_date": "assigned_date",
+    }
+
+    def get_queryset(self) -> QuerySet:
+        queryset = TaskAssignment.objects.order_by("pk")
+        for param, lookup in (
+            ("project", "task__project_id"),
+            ("task", "task_id"),
+            ("worker", "assignee_id"),
+        ):
+            value = self.request.GET.get(param, "")
+            if value.isdigit():
+                queryset = queryset.filter(**{lookup: value})
+        return queryset
@@ -0,0 +1,39 @@
+# Sync (or, with GUNICORN_THREADS > 1, gthread) workers serve core.wsgi. For
+# ASGI gunicorn manages the processes, each running uvicorn's event loop, so
+# requests waiting on the database don't pin a worker:
+#   GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker \
+#       gunicorn -c gunicorn.conf.py core.asgi:application
+import multiprocessing
+import os
+
+
+def env_int(name: str, default: int) -> int:
+    return int(os.environ.get(name, default))
+
+
+bind = os.environ.get("GUNICORN_BIND", f"0.0.0.0:{os.environ.get('PORT', '8000')}")
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+# More than one thread turns sync workers into gthread, each may hold a connection
+threads = env_int("GUNICORN_THREADS", 1)
+workers = env_int("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1)
+
+# Keep workers * threads under what the database (or PgBouncer) accepts, so a
+# restart doesn't open a storm of connections the server refuses
+db_max_connections = env_int("DB_MAX_CONNECTIONS", 0)
+if db_max_connections:
+    workers = max(1, min(workers, db_max_connections // threads))
+
+timeout = env_int("GUNICORN_TIMEOUT", 30)
+graceful_timeout = 30
+keepalive = 5
+# Recycle workers now and then, staggered so they don't restart together
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = max_requests // 10
+accesslog = "-"
+
+# Read by core/settings.py in the workers. A statement outliving the request
+# timeout only holds a connection nobody waits for.
+os.environ.setdefault("DB_STATEMENT_TIMEOUT", str(timeout * 1000))
+if worker_class.startswith("uvicorn"):
+    # Async requests run in per-request threads, persistent connections leak
+    os.environ.setdefault("DB_CONN_MAX_AGE", "0")
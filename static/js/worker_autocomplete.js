@@ -0,0 +1,78 @@
+// Search box for the worker pickers: the select only holds the chosen workers,
+// matches come a page at a time from the worker-autocomplete endpoint.
+(function () {
+  "use strict";
+
+  function setUp(select) {
+    var input = document.createElement("input");
+    var results = document.createElement("ul");
+    var more = document.createElement("button");
+    var query = "";
+    var next = null;
+    var timer = null;
+
+    input.type = "search";
+    input.placeholder = "Search workers…";
+    input.className = "form-control mb-1";
+    results.className = "list-group mb-1";
+    more.type = "button";
+    more.textContent = "More";
+    more.className = "btn btn-sm btn-outline-secondary mb-2";
+    more.hidden = true;
+    select.parentNode.insertBefore(input, select);
+    select.parentNode.insertBefore(results, select);
+    select.parentNode.insertBefore(more, select);
+
+    function choose(worker) {
+      var option = select.querySelector('option[value="' + worker.id + '"]');
+      if (!option) {
+        option = new Option(worker.text, worker.id);
+        select.add(option);
+      }
+      option.selected = true;
+    }
+
+    function load(append) {
+      var url = new URL(select.dataset.autocompleteUrl, window.location.origin);
+      url.searchParams.set("q", query);
+      if (append && next !== null) {
+        url.searchParams.set("after", next);
+      }
+      fetch(url, { credentials: "same-origin" })
+        .then(function (response) { return response.json(); })
+        .then(function (data) {
+          if (!append) {
+            results.innerHTML = "";
+          }
+          data.results.forEach(function (worker) {
+            var item = document.createElement("li");
+            item.className = "list-group-item list-group-item-action";
+            item.textContent = worker.text;
+            item.addEventListener("click", function () { choose(worker); });
+            results.appendChild(item);
+          });
+          next = data.next;
+          more.hidden = next === null;
+        });
+    }
+
+    input.addEventListener("input", function () {
+      clearTimeout(timer);
+      timer = setTimeout(function () {
+        query = input.value.trim();
+        next = null;
+        if (query) {
+          load(false);
+        } else {
+          results.innerHTML = "";
+          more.hidden = true;
+        }
+      }, 250);
+    });
+    more.addEventListener("click", function () { load(true); });
+  }
+
+  document.addEventListener("DOMContentLoaded", function () {
+    document.querySelectorAll("select[data-autocomplete-url]").forEach(setUp);
+  });
+})();